@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Formats of the files written per scraped profile page.
+
+Kept free of heavy imports and logging setup so the scrapers can use it
+without loading the parser.
+"""
+
+import os
+import json
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# Opening tag of the Apollo cache script in pages saved in "apollo" capture mode
+APOLLO_SNAPSHOT_MARKER = '<script id="__APOLLO_STATE__" type="application/json">'
+
+# Assignment of the Apollo cache in the scripts of a full page
+APOLLO_STATE_ASSIGNMENT = 'window.__APOLLO_STATE__'
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def build_apollo_snapshot(state_json: str, header_html: str = "", url: Optional[str] = None) -> str:
+    """
+    Build the minimal page stored instead of the full DOM in "apollo" capture mode.
+    
+    The page holds the profile header, for the HTML fallback, and the
+    serialized Apollo cache in a JSON script tag.
+    
+    Args:
+        state_json: Apollo cache serialized as JSON
+        header_html: Outer HTML of the profile header
+        url: URL the page was scraped from
+        
+    Returns:
+        HTML document
+    """
+    # "</" cannot appear inside a script tag; "<\/" is the same string in JSON
+    state_json = state_json.replace('</', '<\\/')
+    source = f'<link rel="canonical" href="{url}">' if url else ''
+    return (
+        f'<!DOCTYPE html><html><head>{source}</head><body>'
+        f'{header_html}'
+        f'{APOLLO_SNAPSHOT_MARKER}{state_json}</script>'
+        f'</body></html>'
+    )
+
+
+def find_apollo_state(html: str) -> Optional[Tuple[Dict[str, Any], int, int]]:
+    """
+    Find and decode the Apollo state assigned in the scripts of a full page.
+    
+    The assignment is found by plain string search, without parsing the
+    HTML. The JSON decoder then scans the object literal, matching braces
+    outside of strings, and stops at its closing brace; the scan never runs
+    past the end of the script. Assignments that do not decode are skipped.
+    
+    Args:
+        html: HTML of the page, or the text of one of its scripts
+    
+    Returns:
+        Tuple of (state, start, end) where html[start:end] is the assignment
+        including a trailing semicolon, or None if there is none
+    """
+    start = html.find(APOLLO_STATE_ASSIGNMENT)
+    while start != -1:
+        position = _skip_space(html, start + len(APOLLO_STATE_ASSIGNMENT))
+        if html.startswith('=', position):
+            brace = _skip_space(html, position + 1)
+            if html.startswith('{', brace):
+                limit = html.find('</script', brace)
+                try:
+                    state, length = _JSON_DECODER.raw_decode(html[brace:limit if limit != -1 else len(html)])
+                except ValueError:
+                    state = None
+                if state is not None:
+                    end = brace + length
+                    if html.startswith(';', end):
+                        end += 1
+                    return state, start, end
+        start = html.find(APOLLO_STATE_ASSIGNMENT, position)
+    return None
+
+
+def _skip_space(text: str, position: int) -> int:
+    """Get the position of the first non-whitespace character from a position on."""
+    while position < len(text) and text[position].isspace():
+        position += 1
+    return position
+
+
+def get_graphql_filename(html_file: str) -> str:
+    """
+    Get the path of the GraphQL payload file saved next to an HTML file.
+    
+    Args:
+        html_file: Path to the HTML file
+    
+    Returns:
+        Path to the matching .graphql.json file
+    """
+    base, _ = os.path.splitext(html_file)
+    return f"{base}.graphql.json"
+
+
+def page_slug(url: str) -> str:
+    """
+    Get the slug that names a profile page everywhere it is stored.
+    
+    Both /investors/<slug> and /investors-<slug> URLs give <slug>.
+    
+    Args:
+        url: Profile URL, with or without scheme
+    
+    Returns:
+        Slug, empty if the URL has no path
+    """
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    segment = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+    if segment.startswith('investors-'):
+        segment = segment[len('investors-'):]
+    return segment
+
+
+def page_filename(slug: str) -> str:
+    """
+    Get the file name of the page saved for a slug.
+    
+    Args:
+        slug: Page slug, see page_slug()
+    
+    Returns:
+        File name, e.g. "investors-jane-doe.html"
+    """
+    return f"investors-{slug}.html"
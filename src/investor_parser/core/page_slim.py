@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+Slim copies of profile pages that keep only what the parser reads.
+
+A slim page holds the Apollo state assignment and the elements the HTML
+fallback of InvestorProfileParser looks up: the header, the
+line-separated rows, the sector chips, the network rows and the
+investments table. Each is kept whole, inside a bare skeleton of its
+ancestors, and everything else (styles, other scripts, navigation, text
+between the kept elements) is dropped.
+
+The elements are found with the same lookups the parser uses, and
+removing other elements never moves a first match, so the parser gives
+the same output on the slim page as on the full one.
+"""
+
+import logging
+from typing import List
+
+from bs4 import BeautifulSoup, NavigableString, Tag, Doctype
+from bs4.element import Script
+
+from src.investor_parser.core.page_format import APOLLO_SNAPSHOT_MARKER, APOLLO_STATE_ASSIGNMENT, find_apollo_state
+
+logger = logging.getLogger(__name__)
+
+# Texts that open the sections the parser finds by their heading
+SECTION_HEADINGS = (
+    'Sector & Stage Rankings',
+    'Investors who invest with',
+    'Scouts & Angels Affiliated With',
+)
+
+
+def _apollo_assignment(script: str) -> str:
+    """
+    Cut a script down to its assignment of the Apollo state.
+
+    The cut is made where find_apollo_state() finds the assignment, so the
+    parser reads the same state from it.
+
+    Args:
+        script: Text of the script that mentions __APOLLO_STATE__
+
+    Returns:
+        The assignment, or the script from the first mention on if none decodes
+    """
+    found = find_apollo_state(script)
+    if found:
+        return script[found[1]:found[2]]
+    start = script.find(APOLLO_STATE_ASSIGNMENT)
+    return script[start:] if start >= 0 else script
+
+
+def _kept_elements(soup: BeautifulSoup) -> List[Tag]:
+    """
+    Find the elements of a page that the parser reads.
+
+    Args:
+        soup: Parsed page
+
+    Returns:
+        Elements to keep with all their content
+    """
+    kept = []
+
+    def keep(element) -> None:
+        if element is not None:
+            kept.append(element)
+
+    keep(soup.find('link', rel='canonical'))
+    for script in soup.find_all('script'):
+        if script.string and '__APOLLO_STATE__' in script.string:
+            # The rest of the script goes too, unless a section heading occurs in it
+            if not any(heading in script.string for heading in SECTION_HEADINGS):
+                script.string.replace_with(Script(_apollo_assignment(script.string)))
+            keep(script)
+            # The parser stops at the first assignment that decodes
+            if find_apollo_state(script.string):
+                break
+
+    # Header
+    keep(soup.select_one('h1.f3.f1-ns.mv1'))
+    keep(soup.find('div', class_='subheader white-subheader b pb1'))
+    keep(soup.find('div', class_='subheader lower-subheader pb2'))
+    location_span = soup.select_one('span.f6.glyphicon.glyphicon-map-marker + span')
+    if location_span is not None:
+        keep(location_span.find_previous_sibling('span'))
+        keep(location_span)
+
+    # Position, investment range, fund size and investment count
+    for row in soup.select('div.line-separated-row.row'):
+        keep(row)
+
+    # Sector chips and network rows, found from the first occurrence of their heading
+    for heading in SECTION_HEADINGS:
+        section = soup.find(string=lambda text, heading=heading: text and heading in text)
+        if section is None:
+            continue
+        # The text itself stays, so no later occurrence becomes the first
+        keep(section.parent)
+        container = section.find_parent('div')
+        if container is not None:
+            keep(container)
+            keep(container.find_next('div'))
+
+    # Investments
+    keep(soup.find('table'))
+    return kept
+
+
+def slim_page(html_content: str) -> str:
+    """
+    Strip a profile page down to the parts the parser reads.
+
+    Pages saved in "apollo" capture mode are already minimal and are
+    returned unchanged.
+
+    Args:
+        html_content: Full HTML of the page
+
+    Returns:
+        Slim HTML document
+    """
+    if APOLLO_SNAPSHOT_MARKER in html_content:
+        return html_content
+
+    soup = BeautifulSoup(html_content, 'lxml')
+    kept = set()
+    skeleton = set()
+    for element in _kept_elements(soup):
+        kept.add(id(element))
+        skeleton.update(id(parent) for parent in element.parents)
+
+    # Walk down the skeleton, dropping every child that is neither kept nor
+    # an ancestor of a kept element, including the text between them
+    pending = [soup]
+    while pending:
+        node = pending.pop()
+        for child in list(node.children):
+            if id(child) in kept or isinstance(child, Doctype):
+                continue
+            if id(child) in skeleton:
+                pending.append(child)
+            elif isinstance(child, Tag):
+                child.decompose()
+            elif isinstance(child, NavigableString):
+                child.extract()
+
+    slim = str(soup)
+    logger.debug(f"Slimmed page from {len(html_content)} to {len(slim)} characters")
+    return slim
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 import json
+import os
 import re
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from bs4 import BeautifulSoup
 
+from src.investor_parser.core.page_format import APOLLO_SNAPSHOT_MARKER, find_apollo_state, get_graphql_filename
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,41 +23,166 @@ logger = logging.getLogger(__name__)
 class InvestorProfileParser:
     """Parser for investor profile HTML files."""
     
-    def __init__(self, html_content: str, source_file: str):
+    def __init__(self, html_content: str, source_file: str, graphql_payloads: Optional[List[Dict[str, Any]]] = None):
         """
         Initialize the parser with HTML content.
         
         Args:
             html_content: The HTML content of the investor profile page
             source_file: The filename of the source HTML file
+            graphql_payloads: GraphQL response bodies captured while scraping the page
         """
         self.html = html_content
         self.source_file = source_file
-        self.soup = BeautifulSoup(html_content, 'lxml')
+        self._soup = None
         self.apollo_state = None
         self.investor_id = None
         self.person_id = None
         self._extract_apollo_state()
+        if graphql_payloads:
+            self._merge_graphql_payloads(graphql_payloads)
+    
+    @property
+    def soup(self) -> BeautifulSoup:
+        """
+        Parsed HTML tree, built on first use.
+        
+        Pages whose data comes entirely from the Apollo state never need it.
+        """
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, 'lxml')
+        return self._soup
+    
+    def _extract_apollo_snapshot(self) -> bool:
+        """
+        Read the Apollo state from a page saved in "apollo" capture mode.
+        
+        Returns:
+            True if the page is a snapshot and its state was loaded
+        """
+        start = self.html.find(APOLLO_SNAPSHOT_MARKER)
+        if start == -1:
+            return False
+        start += len(APOLLO_SNAPSHOT_MARKER)
+        end = self.html.find('</script>', start)
+        if end == -1:
+            return False
+        
+        self.apollo_state = json.loads(self.html[start:end])
+        self._find_investor_ids()
+        return True
     
     def _extract_apollo_state(self) -> None:
         """Extract Apollo state from the HTML."""
         try:
-            # Find the Apollo state in the script tags
-            for script in self.soup.find_all('script'):
-                if script.string and '__APOLLO_STATE__' in script.string:
-                    match = re.search(r'window\.__APOLLO_STATE__\s*=\s*({.*?});', script.string, re.DOTALL)
-                    if match:
-                        self.apollo_state = json.loads(match.group(1))
-                        # Try to find the investor profile ID
-                        for key, value in self.apollo_state.items():
-                            if key.startswith('PublicInvestorProfile:'):
-                                self.investor_id = key.split(':')[1]
-                                if 'person' in value and value['person'].get('id'):
-                                    self.person_id = value['person']['id']
-                        break
+            # Snapshots carry the state as plain JSON, no HTML parsing needed
+            if self._extract_apollo_snapshot():
+                return
+            
+            # Find the Apollo state assignment in the raw HTML, so the soup is only built for the fallback
+            found = find_apollo_state(self.html)
+            if found:
+                self.apollo_state = found[0]
+                # Try to find the investor profile ID
+                self._find_investor_ids()
         except Exception as e:
             logger.error(f"Failed to extract Apollo state: {e}")
     
+    def _find_investor_ids(self) -> None:
+        """Find the investor profile and person IDs in the Apollo state."""
+        for key, value in self.apollo_state.items():
+            if key.startswith('PublicInvestorProfile:'):
+                self.investor_id = key.split(':')[1]
+                if isinstance(value.get('person'), dict) and value['person'].get('id'):
+                    self.person_id = value['person']['id']
+    
+    def _merge_graphql_payloads(self, payloads: List[Dict[str, Any]]) -> None:
+        """
+        Merge captured GraphQL responses into the Apollo state.
+        
+        Entities are normalized into the same "Typename:id" keys and
+        {"type": "id"} references the Apollo cache uses, so the Apollo
+        state parser reads them like any other cache entry.
+        
+        Args:
+            payloads: GraphQL response bodies
+        """
+        if self.apollo_state is None:
+            self.apollo_state = {}
+        
+        try:
+            for payload in payloads:
+                data = payload.get('data') if isinstance(payload, dict) else None
+                if isinstance(data, dict):
+                    self._normalize_graphql_value(data)
+            
+            if not self.investor_id:
+                self._find_investor_ids()
+        except Exception as e:
+            logger.error(f"Failed to merge GraphQL payloads: {e}")
+    
+    def _normalize_graphql_value(self, value: Any) -> Any:
+        """
+        Store GraphQL entities in the Apollo state and replace them by references.
+        
+        Args:
+            value: Part of a GraphQL response
+            
+        Returns:
+            The value with nested entities replaced by Apollo references
+        """
+        if isinstance(value, list):
+            return [self._normalize_graphql_value(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        
+        fields = {field: self._normalize_graphql_value(item) for field, item in value.items()}
+        typename = value.get('__typename')
+        entity_id = value.get('id')
+        if not typename or entity_id is None:
+            return fields
+        
+        key = f"{typename}:{entity_id}"
+        entry = self.apollo_state.setdefault(key, {})
+        for field, item in fields.items():
+            # Keep the connection that holds the most investments
+            if field.startswith('investments_on_record') and self._edge_count(entry.get(field)) > self._edge_count(item):
+                continue
+            entry[field] = item
+        return {"type": "id", "generated": False, "id": key, "typename": typename}
+    
+    def _resolve(self, ref: Any) -> Optional[Dict[str, Any]]:
+        """
+        Look up an Apollo reference, or return inline objects unchanged.
+        
+        Args:
+            ref: A {"type": "id", "id": ...} reference or an inline object
+            
+        Returns:
+            The referenced object, or None if it cannot be found
+        """
+        if not isinstance(ref, dict):
+            return None
+        if ref.get('type') == 'id' or ('typename' in ref and '__typename' not in ref):
+            ref_id = ref.get('id')
+            return self.apollo_state.get(ref_id) or self.apollo_state.get(f"{ref.get('typename')}:{ref_id}")
+        return ref
+    
+    def _edge_count(self, connection_ref: Any) -> int:
+        """
+        Count the edges of an investments connection.
+        
+        Args:
+            connection_ref: Reference to, or inline, connection object
+            
+        Returns:
+            Number of edges, 0 if the connection cannot be resolved
+        """
+        connection = self._resolve(connection_ref) if self.apollo_state is not None else None
+        if not connection or not isinstance(connection.get('edges'), list):
+            return 0
+        return len(connection['edges'])
+    
     def parse(self) -> Dict[str, Any]:
         """
         Parse the investor profile and extract data.
@@ -141,13 +269,7 @@ class InvestorProfileParser:
                 return data
             
             # Get person data
-            person_id = None
-            if 'person' in investor_profile:
-                person_type_id = investor_profile['person']['id']
-                person_type = investor_profile['person']['typename']
-                person_id = f"{person_type}:{person_type_id}"
-            
-            person = self.apollo_state.get(person_id) if person_id else None
+            person = self._resolve(investor_profile.get('person'))
             
             # Extract basic info
             if person:
@@ -163,20 +285,14 @@ class InvestorProfileParser:
             data["position"] = investor_profile.get("position")
             
             # If the firm is an object reference, look it up
-            firm_ref = investor_profile.get("firm")
-            if firm_ref and isinstance(firm_ref, dict) and 'typename' in firm_ref:
-                firm_id = f"{firm_ref['typename']}:{firm_ref['id']}"
-                firm = self.apollo_state.get(firm_id)
-                if firm:
-                    data["firm"] = firm.get("name")
+            firm = self._resolve(investor_profile.get("firm"))
+            if firm:
+                data["firm"] = firm.get("name")
             
             # Extract location
-            location_ref = investor_profile.get("location")
-            if location_ref and isinstance(location_ref, dict) and 'typename' in location_ref:
-                location_id = f"{location_ref['typename']}:{location_ref['id']}"
-                location = self.apollo_state.get(location_id)
-                if location:
-                    data["location"] = location.get("display_name")
+            location = self._resolve(investor_profile.get("location"))
+            if location:
+                data["location"] = location.get("display_name")
             
             # Extract investment range
             min_investment = investor_profile.get("min_investment")
@@ -209,44 +325,40 @@ class InvestorProfileParser:
             if not_interested_text:
                 data["not_interested_in"] = [area.strip() for area in not_interested_text.split(',')]
             
-            # Extract investments
+            # Extract investments, using the largest connection when the
+            # profile holds both the first page and the expanded list
             investments_ref = None
             for key, value in investor_profile.items():
                 if key.startswith('investments_on_record'):
-                    investments_ref = value
-                    break
+                    if investments_ref is None or self._edge_count(value) > self._edge_count(investments_ref):
+                        investments_ref = value
             
-            if investments_ref and isinstance(investments_ref, dict):
-                data["investment_count"] = investments_ref.get("record_count", 0)
+            investments = self._resolve(investments_ref)
+            if investments:
+                data["investment_count"] = investments.get("record_count", 0)
                 
                 # Get the edges (investments)
-                edges = investments_ref.get("edges", [])
-                for edge in edges:
-                    if edge and "node" in edge:
-                        node = edge["node"]
-                        
+                edges = investments.get("edges", [])
+                for edge_ref in edges:
+                    edge = self._resolve(edge_ref)
+                    node = self._resolve(edge.get("node")) if edge else None
+                    if node:
                         # Look up the referenced company
                         company_name = None
-                        company_ref = node.get("company")
-                        if company_ref and isinstance(company_ref, dict):
-                            company_id = f"{company_ref['typename']}:{company_ref['id']}"
-                            company = self.apollo_state.get(company_id)
-                            if company:
-                                company_name = company.get("name")
+                        company = self._resolve(node.get("company"))
+                        if company:
+                            company_name = company.get("name")
                         
                         # Extract funding round details
                         round_name = None
                         amount = None
-                        funding_round_ref = node.get("funding_round")
-                        if funding_round_ref and isinstance(funding_round_ref, dict):
-                            round_id = f"{funding_round_ref['typename']}:{funding_round_ref['id']}"
-                            funding_round = self.apollo_state.get(round_id)
-                            if funding_round:
-                                round_name = funding_round.get("round_name")
-                                
-                                # Also get the funding amount if available
-                                if funding_round.get("amount"):
-                                    amount = funding_round.get("amount")
+                        funding_round = self._resolve(node.get("funding_round"))
+                        if funding_round:
+                            round_name = funding_round.get("round_name")
+                            
+                            # Also get the funding amount if available
+                            if funding_round.get("amount"):
+                                amount = funding_round.get("amount")
                         
                         # Create the investment entry
                         if company_name:
@@ -593,16 +705,40 @@ class InvestorProfileParser:
             return None
 
 
-def parse_investor_profile(html_content: str, source_file: str) -> Dict[str, Any]:
+def load_graphql_payloads(html_file: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load the GraphQL payloads captured alongside an HTML file, if any.
+    
+    Args:
+        html_file: Path to the HTML file
+    
+    Returns:
+        List of GraphQL response bodies, or None if there are none
+    """
+    payload_file = get_graphql_filename(html_file)
+    if not os.path.exists(payload_file):
+        return None
+    
+    try:
+        with open(payload_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load GraphQL payloads from {payload_file}: {e}")
+        return None
+
+
+def parse_investor_profile(html_content: str, source_file: str,
+                           graphql_payloads: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Parse an investor profile from HTML content.
     
     Args:
         html_content: The HTML content to parse
         source_file: The filename of the source HTML file
+        graphql_payloads: GraphQL response bodies captured while scraping the page
     
     Returns:
         A dictionary of parsed investor data
     """
-    parser = InvestorProfileParser(html_content, source_file)
+    parser = InvestorProfileParser(html_content, source_file, graphql_payloads)
     return parser.parse() 
\ No newline at end of file
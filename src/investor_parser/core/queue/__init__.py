@@ -2,6 +2,6 @@
 Queue management for processing investor URLs.
 """
 
-from src.investor_parser.core.queue.url_queue import URLQueue
+from src.investor_parser.core.queue.url_queue import URLQueue, rewrite_output_paths
 
-__all__ = ['URLQueue'] 
\ No newline at end of file
+__all__ = ['URLQueue', 'rewrite_output_paths'] 
\ No newline at end of file
@@ -1,15 +1,69 @@
 #!/usr/bin/env python
 
 import os
+import re
 import json
 import logging
 import shutil
-from typing import List, Dict, Optional, Tuple
+import tempfile
+import threading
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from src.investor_parser.core.storage import open_page_store, migrate_legacy_pages
 
 logger = logging.getLogger(__name__)
 
+# An output_path field of a state file and its JSON string value
+OUTPUT_PATH_PATTERN = re.compile(r'("output_path"\s*:\s*)("(?:[^"\\]|\\.)*")')
+
+def rewrite_output_paths(state_file: str, rewrite: Callable[[str], Optional[str]],
+                         target_file: Optional[str] = None) -> int:
+    """
+    Rewrite the output paths of a queue state file in one streaming pass.
+
+    The file is read line by line and written to a temporary file that
+    replaces the target, so the queue is never loaded whole and readers
+    never see a half-written state.
+
+    Args:
+        state_file: Queue state file to read
+        rewrite: Called with each output path; returns the new path, or None to keep it
+        target_file: File to write; by default the state file itself
+
+    Returns:
+        Number of paths rewritten
+    """
+    target_file = target_file or state_file
+    updated = 0
+    
+    def replace(match: re.Match) -> str:
+        nonlocal updated
+        old_path = json.loads(match.group(2))
+        new_path = rewrite(old_path)
+        if not new_path or new_path == old_path:
+            return match.group(0)
+        updated += 1
+        return match.group(1) + json.dumps(new_path)
+    
+    directory = os.path.dirname(target_file) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".queue-", suffix=".tmp")
+    try:
+        with open(state_file, "r") as src, os.fdopen(fd, "w") as dst:
+            for line in src:
+                dst.write(OUTPUT_PATH_PATTERN.sub(replace, line))
+        if updated or target_file != state_file:
+            os.replace(tmp_path, target_file)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return updated
+
 @dataclass
 class URLItem:
     """
@@ -22,6 +76,10 @@ class URLItem:
     last_attempt: Optional[str] = None
     error_message: Optional[str] = None
     output_path: Optional[str] = None
+    fetch_route: Optional[str] = None  # static, browser - how the page was last fetched
+    browser_streak: int = 0  # consecutive fetches whose static page lacked the data
+    record_count: Optional[int] = None  # investments on record when last fetched
+    route_checked_at: Optional[str] = None  # last time the static fetch was tried
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -38,16 +96,24 @@ class URLQueue:
     Supports saving/loading state and tracking progress.
     """
     
-    def __init__(self, state_file: str = "data/queue_state.json"):
+    def __init__(self, state_file: str = "data/queue_state.json", browser_after: int = 2,
+                 route_revisit_days: float = 7.0):
         """
         Initialize the URL queue.
         
         Args:
             state_file: Path to file for saving queue state
+            browser_after: Consecutive browser fetches after which a URL skips the static fetch
+            route_revisit_days: Days after which a browser-routed URL tries the static fetch again
         """
         self.state_file = state_file
         self.items: List[URLItem] = []
         self.current_index = 0
+        self.browser_after = browser_after
+        self.route_revisit = timedelta(days=route_revisit_days)
+        
+        # Shared by the scraping lanes, which run in separate threads
+        self._lock = threading.RLock()
         
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
@@ -59,47 +125,36 @@ class URLQueue:
             if os.path.exists(legacy_state_file):
                 logger.info(f"Found legacy state file at {legacy_state_file}")
                 try:
-                    # Copy the legacy state file to the new location
-                    shutil.copy2(legacy_state_file, self.state_file)
+                    # Write the legacy state file to the new location with updated output paths
+                    self._update_output_paths(legacy_state_file)
                     logger.info(f"Migrated state file from {legacy_state_file} to {self.state_file}")
                     
                     # Try loading again
                     self.load_state()
-                    
-                    # Update output paths to new directory structure
-                    self._update_output_paths()
                 except Exception as e:
                     logger.error(f"Error migrating state file: {str(e)}")
     
-    def _update_output_paths(self) -> None:
+    def _update_output_paths(self, legacy_state_file: str) -> None:
         """
-        Update output paths in queue items to use data/ instead of output/.
+        Migrate the legacy pages and write the legacy state with paths in data/ instead of output/.
+        
+        Args:
+            legacy_state_file: Queue state file in the legacy output directory
         """
-        updated = 0
-        for item in self.items:
-            if item.output_path and "output/html" in item.output_path:
-                # Update output path
-                new_path = item.output_path.replace("output/html", "data/html")
-                
-                # Check if the new path exists, or if we need to migrate the file
-                if os.path.exists(new_path):
-                    item.output_path = new_path
-                    updated += 1
-                elif os.path.exists(item.output_path):
-                    # Ensure data/html directory exists
-                    os.makedirs("data/html", exist_ok=True)
-                    
-                    try:
-                        # Copy the file
-                        shutil.copy2(item.output_path, new_path)
-                        item.output_path = new_path
-                        updated += 1
-                    except Exception as e:
-                        logger.error(f"Error migrating file {item.output_path}: {str(e)}")
+        html_store = open_page_store()
+        legacy_root = os.path.join(os.path.dirname(legacy_state_file), "html")
+        if os.path.isdir(legacy_root):
+            # Pages are linked into the store rather than copied
+            migrate_legacy_pages(legacy_root, html_store)
         
+        def rewrite(output_path: str) -> Optional[str]:
+            if "output/html" in output_path and html_store.exists(output_path):
+                return html_store.path(output_path)
+            return None
+        
+        updated = rewrite_output_paths(legacy_state_file, rewrite, self.state_file)
         if updated > 0:
             logger.info(f"Updated {updated} output paths")
-            self.save_state()
     
     def load_state(self) -> bool:
         """
@@ -137,22 +192,23 @@ class URLQueue:
         Returns:
             True if state was saved, False otherwise
         """
-        try:
-            data = {
-                'items': [item.to_dict() for item in self.items],
-                'current_index': self.current_index,
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
+        with self._lock:
+            try:
+                data = {
+                    'items': [item.to_dict() for item in self.items],
+                    'current_index': self.current_index,
+                    'last_updated': datetime.now().isoformat()
+                }
                 
-            logger.info(f"Saved queue state to {self.state_file}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error saving state: {str(e)}")
-            return False
+                with open(self.state_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+                    
+                logger.info(f"Saved queue state to {self.state_file}")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error saving state: {str(e)}")
+                return False
     
     def add_url(self, url: str, name: str) -> None:
         """
@@ -162,17 +218,18 @@ class URLQueue:
             url: URL to add
             name: Investor name or identifier
         """
-        # Check if URL already exists
-        if any(item.url == url for item in self.items):
-            logger.info(f"URL already in queue: {url}")
-            return
+        with self._lock:
+            # Check if URL already exists
+            if any(item.url == url for item in self.items):
+                logger.info(f"URL already in queue: {url}")
+                return
+                
+            # Add new URL
+            self.items.append(URLItem(url=url, name=name))
+            logger.info(f"Added URL to queue: {url} - Total items in queue: {len(self.items)}")
             
-        # Add new URL
-        self.items.append(URLItem(url=url, name=name))
-        logger.info(f"Added URL to queue: {url} - Total items in queue: {len(self.items)}")
-        
-        # Save state
-        self.save_state()
+            # Save state
+            self.save_state()
     
     def add_urls_from_file(self, file_path: str) -> int:
         """
@@ -239,28 +296,29 @@ class URLQueue:
         Returns:
             Tuple of (URLItem, index) or None if no more URLs
         """
-        if not self.items:
-            logger.info("Queue is empty")
-            return None
-            
-        # Find the next pending item
-        start_index = self.current_index
-        
-        while True:
-            item = self.items[self.current_index]
-            
-            # Move to the next index for next time
-            next_index = self.current_index
-            self.current_index = (self.current_index + 1) % len(self.items)
+        with self._lock:
+            if not self.items:
+                logger.info("Queue is empty")
+                return None
+                
+            # Find the next pending item
+            start_index = self.current_index
             
-            # If item is pending or failed (but not max retries), return it
-            if item.status == "pending" or (item.status == "failed" and item.retry_count < 3):
-                return item, next_index
+            while True:
+                item = self.items[self.current_index]
                 
-            # If we've checked all items, stop
-            if self.current_index == start_index:
-                logger.info("No more URLs to process")
-                return None
+                # Move to the next index for next time
+                next_index = self.current_index
+                self.current_index = (self.current_index + 1) % len(self.items)
+                
+                # If item is pending or failed (but not max retries), return it
+                if item.status == "pending" or (item.status == "failed" and item.retry_count < 3):
+                    return item, next_index
+                    
+                # If we've checked all items, stop
+                if self.current_index == start_index:
+                    logger.info("No more URLs to process")
+                    return None
     
     def update_status(self, index: int, status: str, 
                       error_message: Optional[str] = None,
@@ -274,32 +332,94 @@ class URLQueue:
             error_message: Error message if failed
             output_path: Path to saved output file if completed
         """
-        if index < 0 or index >= len(self.items):
-            logger.error(f"Invalid index: {index}")
-            return
+        with self._lock:
+            if index < 0 or index >= len(self.items):
+                logger.error(f"Invalid index: {index}")
+                return
+                
+            item = self.items[index]
             
-        item = self.items[index]
+            # Update status
+            item.status = status
+            item.last_attempt = datetime.now().isoformat()
+            
+            # Update error message if provided
+            if error_message:
+                item.error_message = error_message
+                
+            # Update output path if provided
+            if output_path:
+                item.output_path = output_path
+                
+            # Increment retry count if failed
+            if status == "failed":
+                item.retry_count += 1
+                
+            # Save state
+            self.save_state()
+            
+            logger.info(f"Updated status of {item.url} to {status}")
+    
+    def preferred_route(self, index: int) -> str:
+        """
+        Decide how a URL should be fetched, based on how it was fetched before.
         
-        # Update status
-        item.status = status
-        item.last_attempt = datetime.now().isoformat()
+        URLs that needed the browser the last browser_after times go straight
+        to the browser. The static fetch is still tried once route_revisit_days
+        have passed since it was last tried, in case the page changed.
         
-        # Update error message if provided
-        if error_message:
-            item.error_message = error_message
-            
-        # Update output path if provided
-        if output_path:
-            item.output_path = output_path
+        Args:
+            index: Index of the URL in the queue
             
-        # Increment retry count if failed
-        if status == "failed":
-            item.retry_count += 1
+        Returns:
+            "browser" or "static"
+        """
+        with self._lock:
+            item = self.items[index]
+            if item.browser_streak < self.browser_after or not item.route_checked_at:
+                return "static"
             
-        # Save state
-        self.save_state()
+            try:
+                checked_at = datetime.fromisoformat(item.route_checked_at)
+            except ValueError:
+                return "static"
+            if datetime.now() - checked_at >= self.route_revisit:
+                logger.info(f"Revisiting the static route for {item.url}")
+                return "static"
+            return "browser"
+    
+    def record_route(self, index: int, route: str, record_count: Optional[int] = None,
+                     static_checked: bool = False, static_failed: bool = False) -> None:
+        """
+        Remember how a URL was fetched. Saved with the next status update.
+        
+        A browser fetch only extends the browser streak if the static fetch
+        returned a page that lacked the data, or was skipped. A static fetch
+        that failed outright, e.g. on a network error, says nothing about
+        the page, so it leaves the streak and the last check time alone.
         
-        logger.info(f"Updated status of {item.url} to {status}")
+        Args:
+            index: Index of the URL in the queue
+            route: "static" or "browser"
+            record_count: Investments on record reported by the page, if known
+            static_checked: True if the static fetch was tried for this fetch
+            static_failed: True if the static fetch was tried but returned no page
+        """
+        with self._lock:
+            if index < 0 or index >= len(self.items):
+                logger.error(f"Invalid index: {index}")
+                return
+            
+            item = self.items[index]
+            item.fetch_route = route
+            if route != "browser":
+                item.browser_streak = 0
+            elif not static_failed:
+                item.browser_streak += 1
+            if record_count is not None:
+                item.record_count = record_count
+            if static_checked and not static_failed:
+                item.route_checked_at = datetime.now().isoformat()
     
     def get_statistics(self) -> Dict:
         """
@@ -308,26 +428,29 @@ class URLQueue:
         Returns:
             Dictionary with statistics
         """
-        if not self.items:
-            return {
-                'total': 0,
-                'pending': 0,
-                'in_progress': 0,
-                'completed': 0,
-                'failed': 0
+        with self._lock:
+            if not self.items:
+                return {
+                    'total': 0,
+                    'pending': 0,
+                    'in_progress': 0,
+                    'completed': 0,
+                    'failed': 0,
+                    'browser_routed': 0
+                }
+                
+            stats = {
+                'total': len(self.items),
+                'pending': sum(1 for item in self.items if item.status == "pending"),
+                'in_progress': sum(1 for item in self.items if item.status == "in_progress"),
+                'completed': sum(1 for item in self.items if item.status == "completed"),
+                'failed': sum(1 for item in self.items if item.status == "failed"),
+                'browser_routed': sum(1 for item in self.items if item.browser_streak >= self.browser_after)
             }
             
-        stats = {
-            'total': len(self.items),
-            'pending': sum(1 for item in self.items if item.status == "pending"),
-            'in_progress': sum(1 for item in self.items if item.status == "in_progress"),
-            'completed': sum(1 for item in self.items if item.status == "completed"),
-            'failed': sum(1 for item in self.items if item.status == "failed")
-        }
-        
-        # Calculate percentages
-        if stats['total'] > 0:
-            stats['completed_pct'] = round(stats['completed'] / stats['total'] * 100, 1)
-            stats['failed_pct'] = round(stats['failed'] / stats['total'] * 100, 1)
-            
-        return stats 
\ No newline at end of file
+            # Calculate percentages
+            if stats['total'] > 0:
+                stats['completed_pct'] = round(stats['completed'] / stats['total'] * 100, 1)
+                stats['failed_pct'] = round(stats['failed'] / stats['total'] * 100, 1)
+                
+            return stats 
\ No newline at end of file
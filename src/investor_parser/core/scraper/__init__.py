@@ -3,7 +3,16 @@ Scraping components for investor profile data extraction.
 """
 
 from src.investor_parser.core.scraper.proxy_manager import ProxyManager
+from src.investor_parser.core.scraper.pacing import PacingPolicy
+from src.investor_parser.core.scraper.resource_policy import ResourcePolicy, RESOURCE_POLICIES
+from src.investor_parser.core.scraper.screenshot_policy import ScreenshotPolicy, SCREENSHOT_MODES
+from src.investor_parser.core.scraper.circuit_breaker import CircuitBreaker, CircuitOpenError, OutcomeRecorder
 from src.investor_parser.core.scraper.basic_scraper import BasicScraper
-from src.investor_parser.core.scraper.browser_scraper import BrowserScraper
+from src.investor_parser.core.scraper.browser_pool import BrowserPool
+from src.investor_parser.core.scraper.browser_watchdog import BrowserWatchdog
+from src.investor_parser.core.scraper.context_pool import ContextPool
+from src.investor_parser.core.scraper.browser_cache import AssetCache, StorageStateStore
+from src.investor_parser.core.scraper.har_archive import HarArchive, HAR_MODES
+from src.investor_parser.core.scraper.browser_scraper import BrowserScraper, ScrapeResult
 
-__all__ = ['ProxyManager', 'BasicScraper', 'BrowserScraper'] 
\ No newline at end of file
+__all__ = ['ProxyManager', 'PacingPolicy', 'ResourcePolicy', 'RESOURCE_POLICIES', 'ScreenshotPolicy', 'SCREENSHOT_MODES', 'CircuitBreaker', 'CircuitOpenError', 'OutcomeRecorder', 'BasicScraper', 'BrowserPool', 'BrowserWatchdog', 'ContextPool', 'AssetCache', 'StorageStateStore', 'HarArchive', 'HAR_MODES', 'BrowserScraper', 'ScrapeResult'] 
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import Dict, Optional, Tuple, List
 from bs4 import BeautifulSoup
 
 from src.investor_parser.core.scraper.proxy_manager import ProxyManager
+from src.investor_parser.core.scraper.circuit_breaker import CircuitBreaker, is_upstream_status
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,8 @@ class BasicScraper:
         retry_count: int = 3,
         timeout: int = 30,
         min_delay: float = 3.0,
-        max_delay: float = 8.0
+        max_delay: float = 8.0,
+        circuit_breaker: Optional[CircuitBreaker] = None
     ):
         """
         Initialize the basic scraper.
@@ -35,6 +37,7 @@ class BasicScraper:
             timeout: Request timeout in seconds
             min_delay: Minimum delay between requests in seconds
             max_delay: Maximum delay between requests in seconds
+            circuit_breaker: Optional circuit breaker shared with other scrapers
         """
         self.proxy_manager = proxy_manager or ProxyManager(use_proxies=False)
         self.user_agents = user_agents or [
@@ -47,6 +50,7 @@ class BasicScraper:
         self.timeout = timeout
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.circuit_breaker = circuit_breaker
         
     def get_random_user_agent(self) -> str:
         """
@@ -89,6 +93,23 @@ class BasicScraper:
         
         return see_all_button is not None
         
+    @staticmethod
+    def is_upstream_failure(error: requests.exceptions.RequestException) -> bool:
+        """
+        Check if a request error points at the site or proxy being unavailable,
+        as opposed to a problem with the individual URL.
+        
+        Args:
+            error: Exception raised by requests
+            
+        Returns:
+            True for connection errors, timeouts, 429 and 5xx responses
+        """
+        response = getattr(error, 'response', None)
+        if response is None:
+            return True
+        return is_upstream_status(response.status_code)
+        
     def fetch(self, url: str) -> Tuple[Optional[str], bool]:
         """
         Fetch HTML content from a URL.
@@ -98,8 +119,15 @@ class BasicScraper:
             
         Returns:
             Tuple of (HTML content or None if failed, needs_browser_automation flag)
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
         """
         for attempt in range(self.retry_count):
+            # Stop retrying as soon as the upstream is considered down
+            if self.circuit_breaker:
+                self.circuit_breaker.check()
+                
             try:
                 # Random delay between requests
                 if attempt > 0:
@@ -125,8 +153,13 @@ class BasicScraper:
                 html_content = response.text
                 if not html_content or len(html_content) < 1000:
                     logger.warning(f"Received suspiciously small HTML ({len(html_content)} bytes)")
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_failure()
                     continue
                     
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success()
+                    
                 # Check if we need browser automation
                 needs_automation = self.needs_browser_automation(html_content)
                 if needs_automation:
@@ -136,6 +169,12 @@ class BasicScraper:
                 
             except requests.exceptions.RequestException as e:
                 logger.error(f"Request failed: {str(e)}")
+                if self.circuit_breaker:
+                    if self.is_upstream_failure(e):
+                        self.circuit_breaker.record_failure()
+                    else:
+                        # The site answered, only this URL is bad (e.g. 404)
+                        self.circuit_breaker.record_success()
                 if attempt == self.retry_count - 1:
                     logger.error(f"Max retries reached for {url}")
                     return None, False
@@ -0,0 +1,492 @@
+#!/usr/bin/env python
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Pattern, Tuple
+
+from src.investor_parser.core.scraper.resource_policy import FIRST_PARTY_DOMAINS
+
+logger = logging.getLogger(__name__)
+
+# Static bundles worth keeping between profiles; images and media are left
+# to the resource policy
+CACHEABLE_EXTENSIONS = ("js", "mjs", "css", "woff", "woff2", "ttf", "otf")
+
+# Hosts serving the site's own bundles and the libraries and fonts it loads;
+# assets from anywhere else stay on the browser's network stack
+STATIC_ASSET_DOMAINS = FIRST_PARTY_DOMAINS + ("typekit.net", "cdnjs.cloudflare.com", "unpkg.com")
+
+# Response headers never replayed from the cache
+UNCACHED_HEADERS = ("set-cookie", "content-encoding", "content-length", "transfer-encoding", "connection")
+
+EMPTY_STORAGE_STATE = {"cookies": [], "origins": []}
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON to a file so readers never see a partial file.
+
+    Args:
+        path: Destination path
+        data: JSON-serializable data
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class StorageStateStore:
+    """
+    Browser storage state (cookies and local storage) shared by all contexts.
+
+    New contexts start from the saved state instead of an empty one, so
+    consent banners, first-visit cookies and their round-trips are only
+    paid once. The state is refreshed from a successfully scraped context
+    every refresh_every pages or refresh_interval seconds and ignored once
+    it is older than max_age.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/browser/storage_state.json",
+        max_age: Optional[float] = 6 * 3600.0,
+        refresh_every: int = 25,
+        refresh_interval: Optional[float] = 1800.0
+    ):
+        """
+        Initialize the storage state store.
+
+        Args:
+            path: JSON file the state is saved to
+            max_age: Seconds after which a saved state is no longer used, None to keep it forever
+            refresh_every: Save the state again after this many successful pages
+            refresh_interval: Save the state again after this many seconds, None to only count pages
+        """
+        self.path = path
+        self.max_age = max_age
+        self.refresh_every = max(1, refresh_every)
+        self.refresh_interval = refresh_interval
+
+        self._state: Optional[Dict[str, Any]] = None
+        self._saved_at: Optional[float] = None
+        self._loaded = False
+        self._pages_since_save = 0
+
+        # Counters exposed through get_statistics()
+        self.loads = 0
+        self.saves = 0
+        self.expired = 0
+
+    def _is_expired(self, saved_at: float) -> bool:
+        """
+        Check if a state saved at the given time is too old to use.
+
+        Args:
+            saved_at: Unix time the state was saved
+
+        Returns:
+            True if the state has expired
+        """
+        return self.max_age is not None and time.time() - saved_at > self.max_age
+
+    def _load(self) -> None:
+        """Read the saved state from disk."""
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read browser storage state {self.path}: {str(e)}")
+            return
+
+        saved_at = data.get("saved_at", 0.0)
+        if self._is_expired(saved_at):
+            self.expired += 1
+            logger.info(f"Browser storage state in {self.path} has expired, starting fresh")
+            return
+
+        self._state = data.get("state")
+        self._saved_at = saved_at
+        self.loads += 1
+        logger.info(f"Loaded browser storage state with {len(self._state.get('cookies', []))} cookies")
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the storage state new contexts should start from.
+
+        Returns:
+            Playwright storage state, empty if there is none or it has expired
+        """
+        if not self._loaded:
+            self._load()
+        if self._state is not None and self._is_expired(self._saved_at):
+            self.expired += 1
+            self._state = None
+            self._saved_at = None
+        return self._state or EMPTY_STORAGE_STATE
+
+    def record_page(self) -> None:
+        """Count a successfully scraped page towards the next refresh."""
+        self._pages_since_save += 1
+
+    def should_refresh(self) -> bool:
+        """
+        Check if the state should be saved again.
+
+        Returns:
+            True if there is no state yet or the refresh limits were reached
+        """
+        if not self._loaded:
+            self._load()
+        if self._state is None:
+            return True
+        if self._pages_since_save >= self.refresh_every:
+            return True
+        return self.refresh_interval is not None and time.time() - self._saved_at > self.refresh_interval
+
+    async def save_from(self, context: Any) -> bool:
+        """
+        Save the storage state of a context.
+
+        Session cookies and cookies that already expired are left out.
+
+        Args:
+            context: Playwright browser context after a successful page
+
+        Returns:
+            True if the state was saved
+        """
+        try:
+            state = await context.storage_state()
+        except Exception as e:
+            logger.debug(f"Could not read the context's storage state: {str(e)}")
+            return False
+
+        now = time.time()
+        state["cookies"] = [
+            cookie for cookie in state.get("cookies", [])
+            if cookie.get("expires", -1) > now
+        ]
+        saved_at = now
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _write_json_atomic, self.path, {"saved_at": saved_at, "state": state}
+            )
+        except OSError as e:
+            logger.warning(f"Could not save browser storage state to {self.path}: {str(e)}")
+            return False
+
+        self._state = state
+        self._saved_at = saved_at
+        self._loaded = True
+        self._pages_since_save = 0
+        self.saves += 1
+        logger.info(f"Saved browser storage state with {len(state['cookies'])} cookies to {self.path}")
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the storage state.
+
+        Returns:
+            Dictionary with load, save and expiry counters
+        """
+        return {
+            'loads': self.loads,
+            'saves': self.saves,
+            'expired': self.expired,
+            'cookies': len(self._state.get("cookies", [])) if self._state else 0,
+            'age_seconds': round(time.time() - self._saved_at) if self._saved_at else None
+        }
+
+class AssetCache:
+    """
+    Disk cache for static bundles shared by all contexts and processes.
+
+    Contexts are fresh for every profile, so the browser's own HTTP cache
+    starts empty each time. Scripts, stylesheets and fonts of the site's
+    static hosts are routed through this cache instead: a hit is fulfilled
+    from disk, a miss is fetched once and stored. Entries expire after
+    max_age seconds, or earlier if the response's Cache-Control says so,
+    and the oldest entries are deleted once the cache grows past
+    max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/browser/http_cache",
+        max_age: Optional[float] = 24 * 3600.0,
+        max_bytes: Optional[int] = 200 * 1024 * 1024,
+        domains: Tuple[str, ...] = STATIC_ASSET_DOMAINS
+    ):
+        """
+        Initialize the asset cache.
+
+        Args:
+            directory: Directory the cached responses are stored in
+            max_age: Seconds a cached response is served, None to honour only Cache-Control
+            max_bytes: Maximum total size of the cached bodies, None for no limit
+            domains: Domains whose static assets are cached, subdomains included
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.domains = domains
+
+        # Counters exposed through get_statistics()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.expired = 0
+        self.bytes_served = 0
+        self.pruned = 0
+
+        # Entries are read and written on executor threads
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def url_pattern(self) -> Pattern:
+        """
+        Get a regex matching the static assets of the cached domains.
+
+        The pattern is handed to Playwright, which matches it in the browser
+        driver, so only these requests are sent to Python. It only uses
+        syntax shared by Python and JavaScript.
+
+        Returns:
+            Compiled pattern
+        """
+        domains = "|".join(re.escape(domain) for domain in self.domains)
+        extensions = "|".join(CACHEABLE_EXTENSIONS)
+        return re.compile(
+            r"^https?://(?:[^/?#]*\.)?(?:%s)(?::\d+)?/[^?#]*\.(?:%s)(?:[?#]|$)" % (domains, extensions),
+            re.IGNORECASE
+        )
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        """
+        Get the metadata and body file of a URL.
+
+        Args:
+            url: Asset URL
+
+        Returns:
+            Tuple of (metadata path, body path)
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.body")
+
+    def _lifetime(self, headers: Dict[str, str]) -> Optional[float]:
+        """
+        Get how long a response may be cached.
+
+        Args:
+            headers: Response headers with lower-case names
+
+        Returns:
+            Lifetime in seconds, 0 if the response must not be stored, None for no limit
+        """
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-store" in cache_control or "private" in cache_control:
+            return 0.0
+
+        lifetime = self.max_age
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if match:
+            header_age = float(match.group(1))
+            lifetime = header_age if lifetime is None else min(lifetime, header_age)
+        return lifetime
+
+    def _read(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        Read a fresh cache entry. Runs on a worker thread.
+
+        Args:
+            url: Asset URL
+
+        Returns:
+            Tuple of (metadata, body), or None on a miss or expired entry
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("url") != url:
+                return None
+            if meta.get("expires_at") is not None and time.time() > meta["expires_at"]:
+                with self._lock:
+                    self.expired += 1
+                return None
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url: str, status: int, headers: Dict[str, str], body: bytes, lifetime: Optional[float]) -> None:
+        """
+        Store a response. Runs on a worker thread.
+
+        The body is written before its metadata, so an entry is only visible once complete.
+
+        Args:
+            url: Asset URL
+            status: HTTP status code
+            headers: Response headers with lower-case names
+            body: Response body
+            lifetime: Seconds the entry may be served, None for no limit
+        """
+        meta_path, body_path = self._paths(url)
+        now = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        _write_json_atomic(meta_path, {
+            "url": url,
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name not in UNCACHED_HEADERS},
+            "stored_at": now,
+            "expires_at": now + lifetime if lifetime is not None else None,
+            "size": len(body)
+        })
+        with self._lock:
+            self.stored += 1
+            due = self.max_bytes is not None and self.stored % 50 == 0
+
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete expired entries, then the oldest ones until the cache fits in max_bytes.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                entries.append((meta.get("stored_at", 0.0), meta.get("expires_at"), meta.get("size", 0), entry.path))
+            except (OSError, ValueError):
+                continue
+
+        entries.sort()
+        total = sum(size for _, _, size, _ in entries)
+        deleted = 0
+        for stored_at, expires_at, size, meta_path in entries:
+            expired = expires_at is not None and now > expires_at
+            if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                continue
+            for path in (meta_path, meta_path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            deleted += 1
+
+        with self._lock:
+            self.pruned += deleted
+        return deleted
+
+    async def handle(self, route: Any) -> None:
+        """
+        Serve a static asset from the cache, or fetch and store it.
+
+        Args:
+            route: Playwright route
+        """
+        request = route.request
+        if request.method != "GET":
+            await route.fallback()
+            return
+
+        loop = asyncio.get_running_loop()
+        url = request.url
+        cached = await loop.run_in_executor(None, self._read, url)
+        if cached is not None:
+            meta, body = cached
+            self.hits += 1
+            self.bytes_served += len(body)
+            await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+            return
+
+        self.misses += 1
+        try:
+            response = await route.fetch()
+        except Exception as e:
+            # Let the browser try the request itself
+            logger.debug(f"Could not fetch {url} for the asset cache: {str(e)}")
+            await route.fallback()
+            return
+
+        body = await response.body()
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        lifetime = self._lifetime(headers)
+        if response.status == 200 and lifetime != 0:
+            try:
+                await loop.run_in_executor(None, self._write, url, response.status, headers, body, lifetime)
+            except OSError as e:
+                logger.debug(f"Could not store {url} in the asset cache: {str(e)}")
+
+        await route.fulfill(response=response, body=body)
+
+    async def attach(self, context: Any) -> None:
+        """
+        Route a context's static assets through the cache.
+
+        Only scripts, stylesheets and fonts of the cached domains are
+        routed; everything else never reaches Python. Must be registered
+        before the other routes, so blocking and bot-check handlers run
+        first and fall back to the cache.
+
+        Args:
+            context: Playwright browser context
+        """
+        await context.route(self.url_pattern(), self.handle)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the asset cache.
+
+        Returns:
+            Dictionary with hit, miss and storage counters
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 2) if requests else None,
+            'stored': self.stored,
+            'expired': self.expired,
+            'pruned': self.pruned,
+            'bytes_served': self.bytes_served
+        }
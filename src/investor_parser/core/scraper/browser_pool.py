@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, AsyncIterator, Set
+
+# Import Playwright - we'll handle the import errors gracefully
+try:
+    from playwright.async_api import async_playwright, Browser, BrowserContext
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+from src.investor_parser.core.scraper.browser_watchdog import driver_child_pids
+
+logger = logging.getLogger(__name__)
+
+class BrowserSlot:
+    """
+    A launched browser together with its usage counters.
+    """
+
+    def __init__(self, browser: "Browser", pid: Optional[int] = None):
+        """
+        Initialize the slot.
+
+        Args:
+            browser: Playwright browser instance
+            pid: Process id of the browser's main process, if known
+        """
+        self.browser = browser
+        self.pid = pid
+        self.started_at = time.monotonic()
+        self.pages_served = 0
+        self.active_contexts = 0
+        self.retiring = False
+        self.crashed = False
+
+    def is_usable(self) -> bool:
+        """
+        Check if new contexts can be opened on this browser.
+
+        Returns:
+            True if the browser is connected and not being retired
+        """
+        return not self.retiring and not self.crashed and self.browser.is_connected()
+
+class BrowserPool:
+    """
+    Long-lived Playwright browser shared across many profile scrapes.
+
+    Playwright and the browser are started once. Each profile gets a fresh
+    BrowserContext, so cookies and storage never leak between profiles. The
+    browser is replaced after it crashes or after it has served a configurable
+    number of pages; the old one is closed once its in-flight contexts finish.
+    """
+
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        launch_options: Optional[Dict[str, Any]] = None,
+        max_pages_per_browser: int = 50
+    ):
+        """
+        Initialize the browser pool.
+
+        Args:
+            browser_type: Browser to use (chromium, firefox, webkit)
+            launch_options: Keyword arguments passed to the browser launch call
+            max_pages_per_browser: Number of contexts handed out before the browser is restarted
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            raise ImportError(
+                "Playwright is required for browser automation. "
+                "Install it with: pip install playwright && playwright install"
+            )
+
+        self.browser_type = browser_type
+        self.launch_options = launch_options or {}
+        self.max_pages_per_browser = max_pages_per_browser
+
+        self._playwright = None
+        self._current: Optional[BrowserSlot] = None
+        self._retired: List[BrowserSlot] = []
+        self._leases: Dict[Any, BrowserSlot] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Counters exposed through get_statistics()
+        self.browsers_launched = 0
+        self.contexts_created = 0
+        self.crashes = 0
+        self.recycled = 0
+        self.unknown_pids = 0
+
+    @property
+    def current_slot(self) -> Optional[BrowserSlot]:
+        """
+        Get the slot of the browser new contexts are opened on.
+
+        Returns:
+            The current slot, or None before the first launch
+        """
+        return self._current
+
+    async def start(self) -> None:
+        """Start Playwright and launch the first browser."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def _launch(self) -> BrowserSlot:
+        """
+        Launch a new browser.
+
+        Returns:
+            Slot wrapping the launched browser
+        """
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        if self.browser_type == "firefox":
+            launcher = self._playwright.firefox
+        elif self.browser_type == "webkit":
+            launcher = self._playwright.webkit
+        else:
+            launcher = self._playwright.chromium
+
+        known_pids = driver_child_pids()
+        browser = await launcher.launch(**self.launch_options)
+        pid = await self._browser_pid(browser, known_pids)
+        if pid is None:
+            self.unknown_pids += 1
+            logger.warning(
+                f"Could not find the process of {self.browser_type} browser #{self.browsers_launched + 1}, "
+                f"its memory is not watched; it is only recycled by age and crash rate"
+            )
+
+        slot = BrowserSlot(browser, pid)
+        browser.on("disconnected", lambda _: self._on_disconnected(slot))
+
+        self.browsers_launched += 1
+        logger.info(f"Launched {self.browser_type} browser #{self.browsers_launched}")
+        return slot
+
+    async def _browser_pid(self, browser: "Browser", known_pids: Set[int]) -> Optional[int]:
+        """
+        Find the process id of a browser that was just launched.
+
+        Chromium reports it over the DevTools protocol. For other browsers,
+        or if that fails, it is the one new process the driver started
+        during the launch; with several new processes, e.g. when another
+        browser was launched at the same time, it cannot be told apart.
+
+        Args:
+            browser: Browser that was just launched
+            known_pids: Processes the driver had started before the launch
+
+        Returns:
+            Process id of the browser's main process, or None if unknown
+        """
+        if self.browser_type not in ("firefox", "webkit"):
+            try:
+                session = await browser.new_browser_cdp_session()
+                try:
+                    info = await session.send("SystemInfo.getProcessInfo")
+                finally:
+                    await session.detach()
+                for process in info.get("processInfo", []):
+                    if process.get("type") == "browser":
+                        return int(process["id"])
+            except Exception as e:
+                logger.debug(f"Could not get the browser process from DevTools: {str(e)}")
+
+        new_pids = driver_child_pids() - known_pids
+        return new_pids.pop() if len(new_pids) == 1 else None
+
+    def _on_disconnected(self, slot: BrowserSlot) -> None:
+        """
+        Mark a browser as crashed when it disconnects unexpectedly.
+
+        Args:
+            slot: Slot of the browser that disconnected
+        """
+        if not slot.retiring and not slot.crashed:
+            slot.crashed = True
+            self.crashes += 1
+            logger.warning("Browser disconnected unexpectedly, it will be relaunched")
+
+    async def _ensure_browser(self) -> BrowserSlot:
+        """
+        Get a usable browser, relaunching it if it crashed or was retired.
+        The caller must hold the lock.
+
+        Returns:
+            Slot of the current browser
+        """
+        if self._current is not None and not self._current.is_usable():
+            self._retire(self._current)
+            self._current = None
+
+        if self._current is None:
+            self._current = await self._launch()
+
+        return self._current
+
+    def _retire(self, slot: BrowserSlot) -> None:
+        """
+        Stop handing out contexts from a browser. It is closed once idle.
+
+        Args:
+            slot: Slot to retire
+        """
+        slot.retiring = True
+        if slot not in self._retired:
+            self._retired.append(slot)
+
+    async def _close_idle_retired(self) -> None:
+        """Close retired browsers that have no contexts in flight."""
+        for slot in list(self._retired):
+            if slot.active_contexts == 0:
+                self._retired.remove(slot)
+                try:
+                    await slot.browser.close()
+                except Exception as e:
+                    logger.debug(f"Error closing retired browser: {str(e)}")
+
+    async def recycle(self, reason: str = "requested") -> bool:
+        """
+        Replace the current browser without failing pages already running on it.
+
+        New contexts get a fresh browser; the old one is closed once its
+        in-flight contexts have been released.
+
+        Args:
+            reason: Why the browser is recycled, for the log
+
+        Returns:
+            True if a browser was retired, False if there was none
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            slot = self._current
+            if slot is None:
+                return False
+
+            logger.info(
+                f"Recycling browser ({reason}) after {slot.pages_served} pages, "
+                f"{slot.active_contexts} still in flight"
+            )
+            self._retire(slot)
+            self._current = None
+            self.recycled += 1
+            await self._close_idle_retired()
+        return True
+
+    async def new_context(self, **context_options) -> "BrowserContext":
+        """
+        Open a fresh browser context for one profile.
+
+        Contexts must be handed back with release_context.
+
+        Args:
+            **context_options: Keyword arguments passed to browser.new_context
+
+        Returns:
+            A new BrowserContext
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            slot = await self._ensure_browser()
+            slot.active_contexts += 1
+            slot.pages_served += 1
+
+            # Retire early so the next caller gets a fresh browser
+            if slot.pages_served >= self.max_pages_per_browser:
+                logger.info(f"Browser served {slot.pages_served} pages, scheduling restart")
+                self._retire(slot)
+                self._current = None
+
+        try:
+            context = await slot.browser.new_context(**context_options)
+        except Exception:
+            slot.active_contexts -= 1
+            raise
+
+        self._leases[context] = slot
+        self.contexts_created += 1
+        return context
+
+    def is_context_usable(self, context: "BrowserContext") -> bool:
+        """
+        Check if a context handed out by new_context is on a browser that still takes new work.
+
+        Args:
+            context: Context to check
+
+        Returns:
+            True if the context's browser is connected and not being retired
+        """
+        slot = self._leases.get(context)
+        return slot is not None and slot.is_usable()
+
+    async def release_context(self, context: "BrowserContext") -> None:
+        """
+        Close a context handed out by new_context.
+
+        Args:
+            context: Context to close
+        """
+        slot = self._leases.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing context: {str(e)}")
+        finally:
+            if slot is not None:
+                slot.active_contexts -= 1
+
+        async with self._lock:
+            await self._close_idle_retired()
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator["BrowserContext"]:
+        """
+        Async context manager around new_context and release_context.
+
+        Args:
+            **context_options: Keyword arguments passed to browser.new_context
+
+        Yields:
+            A new BrowserContext
+        """
+        context = await self.new_context(**context_options)
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        slots = list(self._retired)
+        if self._current is not None:
+            slots.append(self._current)
+        self._current = None
+        self._retired = []
+
+        for slot in slots:
+            try:
+                await slot.browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {str(e)}")
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the pool.
+
+        Returns:
+            Dictionary with launch, context and crash counters
+        """
+        return {
+            'browsers_launched': self.browsers_launched,
+            'browsers_without_pid': self.unknown_pids,
+            'contexts_created': self.contexts_created,
+            'crashes': self.crashes,
+            'recycled': self.recycled,
+            'pages_on_current_browser': self._current.pages_served if self._current else 0,
+            'retiring_browsers': len(self._retired)
+        }
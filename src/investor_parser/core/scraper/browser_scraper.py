@@ -1,26 +1,237 @@
 #!/usr/bin/env python
 
-import time
+import re
 import random
 import logging
 import asyncio
 import json
-from typing import Optional, Dict, Any, List, Tuple
-import os
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, AsyncIterator, Union
 import platform
 from pathlib import Path
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 # Import Playwright - we'll handle the import errors gracefully
 try:
-    from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Route, Request
+    from playwright.async_api import Page, BrowserContext, Route, Request
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 from src.investor_parser.core.scraper.proxy_manager import ProxyManager
+from src.investor_parser.core.scraper.circuit_breaker import CircuitBreaker, is_upstream_status
+from src.investor_parser.core.scraper.browser_pool import BrowserPool
+from src.investor_parser.core.scraper.browser_watchdog import BrowserWatchdog
+from src.investor_parser.core.scraper.context_pool import ContextPool
+from src.investor_parser.core.scraper.browser_cache import AssetCache, StorageStateStore
+from src.investor_parser.core.scraper.har_archive import HAR_MODES, HarArchive
+from src.investor_parser.core.scraper.pacing import PacingPolicy
+from src.investor_parser.core.scraper.timing import PhaseTimer
+from src.investor_parser.core.scraper.resource_policy import ResourcePolicy, ResourceStats, get_resource_policy
+from src.investor_parser.core.scraper.screenshot_policy import ScreenshotPolicy
+from src.investor_parser.core.page_format import build_apollo_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Counts company rows in the investments table, skipping co-investor rows
+INVESTMENT_ROW_COUNT_JS = """() => Array.from(document.querySelectorAll('table tbody tr')).filter(
+    row => !row.querySelector('td[colspan="3"]') && !/coinvestor/.test(row.className)
+).length"""
+
+# What the scraper keeps from a page: the full DOM, or only the Apollo cache and the header
+CAPTURE_MODES = ("dom", "apollo")
+
+# Serializes the live Apollo cache, falling back to the state the page was rendered with
+APOLLO_CACHE_JS = """() => {
+    let state = null;
+    const client = window.__APOLLO_CLIENT__;
+    try {
+        if (client && client.cache && typeof client.cache.extract === 'function') {
+            state = client.cache.extract();
+        }
+    } catch (e) {
+        console.error('Could not extract Apollo cache:', e);
+    }
+    if (!state || Object.keys(state).length === 0) {
+        state = window.__APOLLO_STATE__ || null;
+    }
+    if (!state) return null;
+    
+    const header = document.querySelector('.identity-block');
+    return {state: JSON.stringify(state), header: header ? header.outerHTML : ''};
+}"""
+
+# Requests for common bot detection scripts, matched in the browser driver
+DETECTION_SCRIPT_PATTERN = re.compile(
+    r"datadome|botdetect|cloudflare|captcha|recaptcha|fingerprint|distil|imperva|perimeterx",
+    re.IGNORECASE
+)
+
+# Headers regular browsers send on the top-level document request
+DOCUMENT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'same-origin',
+    'Sec-Fetch-User': '?1',
+    'Pragma': 'no-cache',
+    'Cache-Control': 'no-cache',
+}
+
+# Headers that are safe on every request, set once per context
+CONTEXT_HEADERS = {
+    'DNT': '1',
+}
+
+# Placeholder for the per-context fingerprint in the stealth bundle
+STEALTH_FINGERPRINT_PLACEHOLDER = "__STEALTH_FINGERPRINT__"
+
+# Overrides JavaScript properties commonly used for fingerprinting
+FINGERPRINT_PATCH_JS = """(fingerprint) => {
+    // Override navigator properties
+    const navigatorProps = {
+        userAgent: fingerprint.userAgent,
+        platform: fingerprint.platform,
+        hardwareConcurrency: fingerprint.hardwareConcurrency,
+        deviceMemory: fingerprint.deviceMemory,
+        language: fingerprint.language,
+        languages: [fingerprint.language],
+    };
+
+    for (const [key, value] of Object.entries(navigatorProps)) {
+        if (value !== undefined) {
+            Object.defineProperty(navigator, key, {
+                get: () => value,
+                configurable: true
+            });
+        }
+    }
+
+    // Override screen properties
+    if (fingerprint.screenResolution) {
+        Object.defineProperty(screen, 'width', { get: () => fingerprint.screenResolution[0] });
+        Object.defineProperty(screen, 'height', { get: () => fingerprint.screenResolution[1] });
+        Object.defineProperty(screen, 'availWidth', { get: () => fingerprint.screenResolution[0] });
+        Object.defineProperty(screen, 'availHeight', { get: () => fingerprint.screenResolution[1] });
+    }
+
+    // Override timezone
+    if (fingerprint.timezone) {
+        Intl.DateTimeFormat = new Proxy(Intl.DateTimeFormat, {
+            construct(target, args) {
+                const options = args[1] || {};
+                if (!options.timeZone) {
+                    options.timeZone = fingerprint.timezone;
+                    args[1] = options;
+                }
+                return Reflect.construct(target, args);
+            }
+        });
+    }
+
+    // Block known fingerprinting methods
+    const block = () => { return { id: 1, random: () => 0.1234 }; };
+    window.RTCPeerConnection = block;
+    window.RTCSessionDescription = block;
+    window.AudioContext = block;
+    window.OfflineAudioContext = block;
+}"""
+
+# Masks WebDriver and Playwright-specific properties
+STEALTH_PATCH_JS = """(fingerprint) => {
+    // Remove webdriver property
+    delete Object.getPrototypeOf(navigator).webdriver;
+
+    // Patch Chrome's permissions API
+    if (navigator.permissions) {
+        const originalQuery = navigator.permissions.query;
+        navigator.permissions.query = function(parameters) {
+            if (parameters.name === 'notifications' || parameters.name === 'clipboard-read') {
+                return Promise.resolve({ state: "prompt", onchange: null });
+            }
+            return originalQuery.call(this, parameters);
+        };
+    }
+
+    // Add plugins array (empty arrays are suspicious)
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => {
+            const plugins = [
+                { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
+                { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
+                { name: 'Native Client', filename: 'internal-nacl-plugin' }
+            ];
+            plugins.item = idx => plugins[idx];
+            plugins.namedItem = name => plugins.find(p => p.name === name);
+            plugins.refresh = () => {};
+            plugins.length = plugins.length;
+            return plugins;
+        }
+    });
+
+    // Fix dimensions (0x0 iframes are suspicious)
+    const contentWindow = Object.getOwnPropertyDescriptor(HTMLIFrameElement.prototype, 'contentWindow');
+    Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {
+        get: function() {
+            // Cross-origin frames have no document, keep the native behaviour
+            const doc = this.contentDocument;
+            if (!doc) return contentWindow.get.call(this);
+            const win = doc.defaultView;
+            try {
+                win.self = win;
+                win.frameElement = this;
+            } catch (e) {}
+            return win;
+        }
+    });
+}"""
+
+@lru_cache(maxsize=1)
+def get_stealth_bundle() -> str:
+    """
+    Combine the stealth patches into one init script template.
+    
+    Built once per process; each patch runs in its own try block so one
+    failing patch does not stop the others.
+    
+    Returns:
+        JavaScript source with a placeholder for the fingerprint JSON
+    """
+    patches = "\n".join(
+        f"try {{ ({patch})(fingerprint); }} catch (e) {{}}"
+        for patch in (FINGERPRINT_PATCH_JS, STEALTH_PATCH_JS)
+    )
+    return f"(() => {{\nconst fingerprint = {STEALTH_FINGERPRINT_PLACEHOLDER};\n{patches}\n}})();"
+
+def build_stealth_script(fingerprint: Dict[str, Any]) -> str:
+    """
+    Fill a fingerprint into the stealth bundle.
+    
+    Args:
+        fingerprint: Fingerprint from BrowserScraper.get_browser_fingerprint
+        
+    Returns:
+        JavaScript source for add_init_script
+    """
+    return get_stealth_bundle().replace(STEALTH_FINGERPRINT_PLACEHOLDER, json.dumps(fingerprint), 1)
+
+@dataclass
+class ScrapeResult:
+    """
+    Everything captured from one profile page.
+    """
+    url: str
+    html: str
+    graphql_payloads: List[Dict[str, Any]] = field(default_factory=list)
+    record_count: Optional[int] = None
+    expanded: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
 class BrowserScraper:
     """
     A browser automation scraper using Playwright to handle JavaScript-rendered content.
@@ -38,7 +249,21 @@ class BrowserScraper:
         max_delay: float = 5.0,
         timeout: int = 60000,  # milliseconds
         stealth_mode: bool = True,
-        random_mouse_movements: bool = True
+        random_mouse_movements: bool = True,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        max_pages_per_browser: int = 50,
+        pacing: Optional[PacingPolicy] = None,
+        resource_policy: Union[str, ResourcePolicy, None] = "no-media",
+        ready_timeout: int = 15000,  # milliseconds
+        capture_mode: str = "dom",
+        screenshot_policy: Union[str, ScreenshotPolicy, None] = "on_failure",
+        watchdog: Union[bool, BrowserWatchdog] = True,
+        warm_contexts: int = 2,
+        storage_state: Union[str, StorageStateStore, None] = "data/browser/storage_state.json",
+        asset_cache: Union[str, AssetCache, None] = "data/browser/http_cache",
+        har_mode: str = "off",
+        har_dir: str = "data/har"
     ):
         """
         Initialize the browser scraper with anti-detection features.
@@ -54,12 +279,30 @@ class BrowserScraper:
             timeout: Page navigation timeout in milliseconds
             stealth_mode: Enable stealth mode to avoid detection
             random_mouse_movements: Enable random mouse movements
+            circuit_breaker: Optional circuit breaker shared with other scrapers
+            browser_pool: Optional browser pool to share; one is created on first use otherwise
+            max_pages_per_browser: Number of pages before the pool restarts the browser
+            pacing: Optional pacing policy to share; one is built from min_delay/max_delay otherwise
+            resource_policy: Which sub-resources to block (full, no-media, minimal or a ResourcePolicy)
+            ready_timeout: Upper bound in milliseconds for each data readiness wait
+            capture_mode: "dom" to keep the full page, "apollo" to keep only the Apollo cache and header
+            screenshot_policy: Screenshot mode (off, on_failure, sampled, always) or a ScreenshotPolicy
+            watchdog: True to recycle browsers that grow too large or old, or a BrowserWatchdog to use
+            warm_contexts: Maximum number of prepared contexts kept ready for the next URL (0 disables)
+            storage_state: File or StorageStateStore new contexts start from and save to, None for empty contexts
+            asset_cache: Directory or AssetCache for static bundles shared by all contexts, None to disable
+            har_mode: "off", "record" to save a HAR per profile, or "replay" to serve the saved HARs offline
+            har_dir: Directory of the HAR recordings
         """
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
                 "Playwright is required for browser automation. "
                 "Install it with: pip install playwright && playwright install"
             )
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode: {capture_mode} (choose from {', '.join(CAPTURE_MODES)})")
+        if har_mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode: {har_mode} (choose from {', '.join(HAR_MODES)})")
             
         self.proxy_manager = proxy_manager or ProxyManager(use_proxies=False)
         
@@ -88,14 +331,66 @@ class BrowserScraper:
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.timeout = timeout
+        self.ready_timeout = ready_timeout
+        self.phase_totals: Dict[str, float] = {}
+        
+        # All waits on the browser path come from this policy
+        self.pacing = pacing or PacingPolicy(min_delay=min_delay, max_delay=max_delay)
+        
+        # Sub-resources aborted before they reach the network
+        self.resource_policy = get_resource_policy(resource_policy)
+        self.resource_totals = ResourceStats()
+        
+        # Keep the full DOM or only the serialized Apollo cache
+        self.capture_mode = capture_mode
         
         # Anti-detection features
         self.stealth_mode = stealth_mode
         self.random_mouse_movements = random_mouse_movements
         
-        # Initialize screenshot directory
-        if self.screenshot_dir:
-            os.makedirs(self.screenshot_dir, exist_ok=True)
+        # Shared with the basic scraper so both stop during upstream outages
+        self.circuit_breaker = circuit_breaker
+        
+        # Long-lived browser, started lazily and reused across URLs
+        self.browser_pool = browser_pool
+        self.max_pages_per_browser = max_pages_per_browser
+        self._owns_pool = browser_pool is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Health checks on the pool's browsers, created with the pool
+        self.watchdog: Optional[BrowserWatchdog] = watchdog if isinstance(watchdog, BrowserWatchdog) else None
+        self._use_watchdog = bool(watchdog)
+        
+        # Contexts prepared in the background, created on first use
+        self.warm_contexts = warm_contexts
+        self.context_pool: Optional[ContextPool] = None
+        self._context_stats: Dict[BrowserContext, ResourceStats] = {}
+        
+        # Cookies, consent and static bundles carried over between profiles
+        if isinstance(storage_state, str):
+            storage_state = StorageStateStore(path=storage_state)
+        self.storage_state = storage_state
+        if isinstance(asset_cache, str):
+            asset_cache = AssetCache(directory=asset_cache)
+        self.asset_cache = asset_cache
+        
+        # Record every profile to a HAR, or replay the recordings with no network
+        self.har_mode = har_mode
+        self.har_archive = HarArchive(directory=har_dir) if har_mode != "off" else None
+        self._har_recordings: Dict[BrowserContext, str] = {}
+        if har_mode == "replay" and self.asset_cache is not None:
+            # The cache fetches misses itself, which would bypass the replay
+            logger.info("Asset cache disabled while replaying HAR recordings")
+            self.asset_cache = None
+        
+        # Which screenshots to take; a mode name uses screenshot_dir with the default limits
+        if isinstance(screenshot_policy, ScreenshotPolicy):
+            self.screenshot_policy = screenshot_policy
+        else:
+            self.screenshot_policy = ScreenshotPolicy(
+                mode=screenshot_policy or "off",
+                directory=self.screenshot_dir
+            )
     
     def get_random_user_agent(self) -> str:
         """
@@ -106,21 +401,17 @@ class BrowserScraper:
         """
         return random.choice(self.user_agents)
     
-    def random_delay(self, multiplier: float = 1.0) -> None:
+    async def random_delay(self, multiplier: float = 1.0) -> None:
         """
-        Sleep for a random amount of time with natural variation.
+        Wait for a random amount of time with natural variation.
+        
+        Uses the pacing policy's non-blocking wait, so other pages on the
+        event loop keep working in the meantime.
         
         Args:
             multiplier: Multiplier for the delay range
         """
-        # Add small random component for more natural timing
-        base_delay = random.uniform(self.min_delay * multiplier, self.max_delay * multiplier)
-        # Add small variation (0-300ms) to make delays look more human
-        natural_variation = random.uniform(0, 0.3)
-        delay = base_delay + natural_variation
-        
-        logger.info(f"Waiting for {delay:.2f} seconds...")
-        time.sleep(delay)
+        await self.pacing.wait(multiplier)
     
     def get_browser_fingerprint(self) -> Dict[str, Any]:
         """
@@ -163,121 +454,27 @@ class BrowserScraper:
             'screenResolution': random.choice([[1920, 1080], [2560, 1440], [1366, 768], [1440, 900], [3840, 2160]]),
         }
     
-    async def bypass_fingerprinting(self, page: Page) -> None:
+    def get_stealth_script(self, context_options: Dict[str, Any]) -> str:
         """
-        Apply anti-fingerprinting techniques to the page.
+        Build the init script for one browser context.
         
-        Args:
-            page: Playwright page instance
-        """
-        fingerprint = self.get_browser_fingerprint()
-        
-        # Override JavaScript properties commonly used for fingerprinting
-        await page.evaluate("""
-            (fingerprint) => {
-                // Override navigator properties
-                const navigatorProps = {
-                    userAgent: fingerprint.userAgent,
-                    platform: fingerprint.platform,
-                    hardwareConcurrency: fingerprint.hardwareConcurrency,
-                    deviceMemory: fingerprint.deviceMemory,
-                    language: fingerprint.language,
-                    languages: [fingerprint.language],
-                };
-                
-                for (const [key, value] of Object.entries(navigatorProps)) {
-                    if (value !== undefined) {
-                        Object.defineProperty(navigator, key, {
-                            get: () => value,
-                            configurable: true
-                        });
-                    }
-                }
-                
-                // Override screen properties
-                if (fingerprint.screenResolution) {
-                    Object.defineProperty(screen, 'width', { get: () => fingerprint.screenResolution[0] });
-                    Object.defineProperty(screen, 'height', { get: () => fingerprint.screenResolution[1] });
-                    Object.defineProperty(screen, 'availWidth', { get: () => fingerprint.screenResolution[0] });
-                    Object.defineProperty(screen, 'availHeight', { get: () => fingerprint.screenResolution[1] });
-                }
-                
-                // Override timezone
-                if (fingerprint.timezone) {
-                    Intl.DateTimeFormat = new Proxy(Intl.DateTimeFormat, {
-                        construct(target, args) {
-                            const options = args[1] || {};
-                            if (!options.timeZone) {
-                                options.timeZone = fingerprint.timezone;
-                                args[1] = options;
-                            }
-                            return Reflect.construct(target, args);
-                        }
-                    });
-                }
-                
-                // Block known fingerprinting methods
-                const block = () => { return { id: 1, random: () => 0.1234 }; };
-                window.RTCPeerConnection = block;
-                window.RTCSessionDescription = block;
-                window.AudioContext = block;
-                window.OfflineAudioContext = block;
-            }
-        """, fingerprint)
-    
-    async def apply_stealth_patches(self, page: Page) -> None:
-        """
-        Apply stealth patches to avoid common detection methods.
+        The fingerprint follows the context's user agent, locale and time zone
+        so the JavaScript properties agree with the HTTP headers.
         
         Args:
-            page: Playwright page instance
+            context_options: Options the context is created with
+            
+        Returns:
+            JavaScript source for context.add_init_script
         """
-        # Mask WebDriver and Playwright-specific properties
-        await page.evaluate("""
-            () => {
-                // Remove webdriver property
-                delete Object.getPrototypeOf(navigator).webdriver;
-                
-                // Patch Chrome's permissions API
-                if (navigator.permissions) {
-                    const originalQuery = navigator.permissions.query;
-                    navigator.permissions.query = function(parameters) {
-                        if (parameters.name === 'notifications' || parameters.name === 'clipboard-read') {
-                            return Promise.resolve({ state: "prompt", onchange: null });
-                        }
-                        return originalQuery.call(this, parameters);
-                    };
-                }
-                
-                // Add plugins array (empty arrays are suspicious)
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => {
-                        const plugins = [
-                            { name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer' },
-                            { name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
-                            { name: 'Native Client', filename: 'internal-nacl-plugin' }
-                        ];
-                        plugins.item = idx => plugins[idx];
-                        plugins.namedItem = name => plugins.find(p => p.name === name);
-                        plugins.refresh = () => {};
-                        plugins.length = plugins.length;
-                        return plugins;
-                    }
-                });
-                
-                // Fix dimensions (0x0 iframes are suspicious)
-                Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {
-                    get: function() {
-                        const win = this.contentDocument.defaultView;
-                        try {
-                            win.self = win;
-                            win.frameElement = this;
-                        } catch (e) {}
-                        return win;
-                    }
-                });
-            }
-        """)
+        fingerprint = self.get_browser_fingerprint()
+        if context_options.get("user_agent"):
+            fingerprint["userAgent"] = context_options["user_agent"]
+        if context_options.get("locale"):
+            fingerprint["language"] = context_options["locale"]
+        if context_options.get("timezone_id"):
+            fingerprint["timezone"] = context_options["timezone_id"]
+        return build_stealth_script(fingerprint)
     
     async def simulate_human_behavior(self, page: Page) -> None:
         """
@@ -297,7 +494,7 @@ class BrowserScraper:
                 delta_y=scroll_distance // scroll_steps * random.uniform(0.8, 1.2)
             )
             # Small pause between scrolls
-            await asyncio.sleep(random.uniform(0.1, 0.5))
+            await self.pacing.pause("scroll")
         
         if self.random_mouse_movements:
             # Perform some random mouse movements
@@ -315,62 +512,109 @@ class BrowserScraper:
                 y = random.randint(100, height - 200)
                 # Move mouse with variable speed
                 await page.mouse.move(x, y, steps=random.randint(5, 15))
-                await asyncio.sleep(random.uniform(0.1, 0.3))
+                await self.pacing.pause("mouse_move")
     
-    async def intercept_bot_checks(self, page: Page) -> None:
+    async def intercept_bot_checks(self, page: Page, url: str) -> None:
         """
-        Set up request interception to modify headers and responses for bypassing bot checks.
+        Set up request interception to add realistic headers to the profile document.
+        
+        Only the profile document is routed here; bot detection scripts are
+        routed once per context by intercept_detection_scripts. The patterns
+        are regexes matched in the browser driver, so every other request
+        stays on the browser's own network stack and never reaches Python.
         
         Args:
             page: Playwright page instance
+            url: URL of the profile page about to be loaded
         """
-        # Add headers that regular browsers typically include
-        await page.route("**/*", lambda route: self._add_realistic_headers(route))
-        
-        # Intercept requests for common bot detection scripts
-        detection_patterns = [
-            "*datadome*", 
-            "*botdetect*", 
-            "*cloudflare*", 
-            "*captcha*", 
-            "*recaptcha*",
-            "*fingerprint*", 
-            "*distil*", 
-            "*imperva*",
-            "*perimeterx*"
-        ]
+        # Add headers that regular browsers send with the document itself
+        document_pattern = re.compile("^" + re.escape(url) + r"(?:[?#].*)?$")
+        await page.route(document_pattern, self._add_realistic_headers)
+    
+    async def intercept_detection_scripts(self, target: Union[Page, BrowserContext]) -> None:
+        """
+        Intercept requests for common bot detection scripts.
+        
+        Args:
+            target: Playwright page or browser context to route
+        """
+        await target.route(DETECTION_SCRIPT_PATTERN, self._handle_detection_script)
+    
+    async def apply_resource_policy(self, target: Union[Page, BrowserContext], stats: ResourceStats) -> None:
+        """
+        Abort sub-resource requests blocked by the resource policy.
+        
+        Only URLs matching the policy's pattern are routed. The route is
+        registered after the other routes so it runs first; allowed requests
+        fall back to the header and bot-check handlers.
+        
+        Args:
+            target: Playwright page or browser context to route; a context
+                holds a single page, so its counters are still per page
+            stats: Per-page counters to update
+        """
+        pattern = self.resource_policy.url_pattern()
+        if pattern is None:
+            return
+        
+        async def handle(route: Route) -> None:
+            request = route.request
+            if self.resource_policy.should_block(request.resource_type, request.url):
+                stats.record_blocked(request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+        
+        await target.route(pattern, handle)
+        
+        # Count what still reaches the network
+        target.on("response", lambda response: stats.record_loaded(response.headers.get("content-length")))
+    
+    def record_timings(self, timer: PhaseTimer) -> None:
+        """
+        Log a page's phase timings and add them to the running totals.
+        
+        Args:
+            timer: Timer used while scraping the page
+        """
+        timer.log()
+        for phase, elapsed in timer.phases.items():
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + elapsed
+    
+    def log_resource_stats(self, url: str, stats: ResourceStats) -> None:
+        """
+        Report the requests and bytes saved by the resource policy for a page.
+        
+        Args:
+            url: URL of the page
+            stats: Counters collected for the page
+        """
+        self.resource_totals.merge(stats)
+        if not self.resource_policy.blocks_anything():
+            return
         
-        for pattern in detection_patterns:
-            await page.route(pattern, lambda route: self._handle_detection_script(route))
+        blocked_types = ", ".join(f"{kind}={count}" for kind, count in stats.blocked_by_type.most_common())
+        logger.info(
+            f"Resource policy '{self.resource_policy.name}' for {url}: "
+            f"blocked {stats.blocked_requests} requests (~{stats.estimated_bytes_saved / 1024:.0f} KB saved"
+            f"{'; ' + blocked_types if blocked_types else ''}), "
+            f"loaded {stats.loaded_requests} requests ({stats.loaded_bytes / 1024:.0f} KB)"
+        )
     
     async def _add_realistic_headers(self, route: Route) -> None:
         """
-        Add realistic headers to requests.
+        Add realistic headers to the profile document request.
         
         Args:
             route: Playwright route
         """
         request = route.request
-        headers = {**request.headers}
-        
-        # Add common browser headers
-        headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-User': '?1',
-            'Pragma': 'no-cache',
-            'Cache-Control': 'no-cache',
-        })
-        
-        # Continue with modified headers
-        await route.continue_(headers=headers)
+        if request.resource_type != "document":
+            await route.fallback()
+            return
+        
+        # Continue with the common browser headers added
+        await route.fallback(headers={**request.headers, **DOCUMENT_HEADERS})
     
     async def _handle_detection_script(self, route: Route) -> None:
         """
@@ -384,28 +628,26 @@ class BrowserScraper:
         
         if 'captcha' in request_url or 'recaptcha' in request_url:
             # For captcha requests, it's often better to let them load but modify behavior
-            await route.continue_()
+            await route.fallback()
         elif any(detector in request_url for detector in ['datadome', 'distil', 'imperva', 'perimeterx']):
             # For known bot detectors, we can either:
             if random.random() > 0.3:  # 70% of the time let it load with delays
-                await asyncio.sleep(random.uniform(0.5, 1.5))
-                await route.continue_()
+                await self.pacing.pause("detection_script")
+                await route.fallback()
             else:  # 30% of the time abort or modify
                 # Abort with a realistic error
                 await route.abort("internetdisconnected")
         else:
             # Default to continuing for unknown patterns
-            await route.continue_()
+            await route.fallback()
             
-    async def setup_browser(self) -> Tuple[Any, Browser, BrowserContext]:
+    def get_launch_options(self) -> Dict[str, Any]:
         """
-        Set up a browser instance with the appropriate configuration.
+        Get the browser launch options.
         
         Returns:
-            Tuple of (playwright instance, browser instance, browser context)
+            Dictionary of keyword arguments for the browser launch call
         """
-        playwright = await async_playwright().start()
-        
         # Set up advanced browser launch options
         launch_options = {
             "headless": self.headless,
@@ -436,7 +678,16 @@ class BrowserScraper:
                 '--no-first-run',
                 '--disable-default-apps'
             ])
+            
+        return launch_options
+        
+    def get_context_options(self) -> Dict[str, Any]:
+        """
+        Get randomized browser context options with a realistic profile.
         
+        Returns:
+            Dictionary of keyword arguments for browser.new_context
+        """
         # Set up browser context options with realistic profile
         context_options = {
             "user_agent": self.get_random_user_agent(),
@@ -455,8 +706,8 @@ class BrowserScraper:
             "timezone_id": random.choice(["America/New_York", "America/Los_Angeles", "Europe/London"]),
             "ignore_https_errors": True,
             "java_script_enabled": True,
-            # Emulate real storage
-            "storage_state": {
+            # Start from the state saved by earlier profiles
+            "storage_state": self.storage_state.get_state() if self.storage_state else {
                 "cookies": [],
                 "origins": []
             },
@@ -464,57 +715,382 @@ class BrowserScraper:
             "permissions": ["geolocation"],
         }
         
-        # Add proxy if enabled
-        if self.proxy_manager.is_enabled():
+        # Add proxy if enabled, a replay never reaches the network
+        if self.proxy_manager.is_enabled() and self.har_mode != "replay":
             context_options["proxy"] = self.proxy_manager.get_playwright_proxy()
+        
+        # Service workers would fetch around the routes
+        if self.har_mode == "replay":
+            context_options["service_workers"] = "block"
             
-        # Launch browser
-        if self.browser_type == "firefox":
-            browser = await playwright.firefox.launch(**launch_options)
-        elif self.browser_type == "webkit":
-            browser = await playwright.webkit.launch(**launch_options)
-        else:
-            browser = await playwright.chromium.launch(**launch_options)
+        return context_options
+        
+    def get_browser_pool(self) -> BrowserPool:
+        """
+        Get the browser pool, creating it on first use.
+        
+        Returns:
+            The BrowserPool used by this scraper
+        """
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool(
+                browser_type=self.browser_type,
+                launch_options=self.get_launch_options(),
+                max_pages_per_browser=self.max_pages_per_browser
+            )
+        if self.watchdog is None and self._use_watchdog:
+            self.watchdog = BrowserWatchdog(self.browser_pool)
+        return self.browser_pool
+        
+    def get_context_pool(self) -> Optional[ContextPool]:
+        """
+        Get the pool of prepared contexts, creating it on first use.
+        
+        Returns:
+            The ContextPool used by this scraper, or None if warm_contexts is 0
+        """
+        if self.context_pool is None and self.warm_contexts > 0:
+            browser_pool = self.get_browser_pool()
+            self.context_pool = ContextPool(
+                factory=self.prepare_context,
+                release=self.release_context,
+                is_usable=browser_pool.is_context_usable,
+                max_size=self.warm_contexts
+            )
+        return self.context_pool
+    
+    async def apply_stealth(self, context: BrowserContext, context_options: Dict[str, Any]) -> None:
+        """
+        Install the stealth scripts and headers on a context.
+        
+        One init script per context covers every page and frame opened in it;
+        headers that are safe everywhere are set without routing any request.
+        
+        Args:
+            context: Browser context to patch
+            context_options: Options the context was created with
+        """
+        await context.add_init_script(script=self.get_stealth_script(context_options))
+        await context.set_extra_http_headers(CONTEXT_HEADERS)
+        await self.intercept_detection_scripts(context)
+    
+    async def prepare_context(self) -> BrowserContext:
+        """
+        Open a browser context with everything that does not depend on the URL.
+        
+        Proxy, fingerprint, saved storage state, stealth scripts, headers and
+        the asset cache, resource and bot-check routes are all set up here,
+        so the context can be prepared ahead of time by the context pool.
+        
+        Returns:
+            Browser context, to be handed back with release_context
+        """
+        context_options = self.get_context_options()
+        recording_options = self.har_archive.recording_options() if self.har_mode == "record" else {}
+        context = await self.get_browser_pool().new_context(**context_options, **recording_options)
+        if recording_options:
+            self._har_recordings[context] = recording_options["record_har_path"]
+        
+        try:
+            # Set default timeout
+            context.set_default_timeout(self.timeout)
+            
+            # Registered first so every other route can fall back to them
+            if self.har_mode == "replay":
+                await self.har_archive.attach(context)
+            if self.asset_cache is not None:
+                await self.asset_cache.attach(context)
+            
+            if self.stealth_mode:
+                await self.apply_stealth(context, context_options)
+            
+            # Block images, fonts, trackers etc. according to the resource policy
+            stats = ResourceStats()
+            await self.apply_resource_policy(context, stats)
+            self._context_stats[context] = stats
+        except Exception:
+            await self.release_context(context)
+            raise
+        
+        return context
+    
+    async def new_context(self) -> BrowserContext:
+        """
+        Get a fresh, prepared browser context for one profile.
+        
+        A context from the context pool is used when one is ready, otherwise
+        one is prepared on the spot.
+        
+        Returns:
+            Browser context, to be handed back with release_context
+        """
+        self.get_browser_pool()
+        context_pool = self.get_context_pool()
+        
+        # Swap out an unhealthy browser before handing out another context
+        if self.watchdog is not None:
+            recycled = await self.watchdog.maybe_check()
+            if recycled and context_pool is not None:
+                await context_pool.discard_stale()
+        
+        if context_pool is not None:
+            return await context_pool.acquire()
+        return await self.prepare_context()
+        
+    def get_resource_stats(self, context: BrowserContext) -> ResourceStats:
+        """
+        Get the resource counters of a context opened with new_context.
+        
+        Args:
+            context: Browser context
             
-        # Create context
-        context = await browser.new_context(**context_options)
+        Returns:
+            The context's resource counters
+        """
+        return self._context_stats.setdefault(context, ResourceStats())
+    
+    async def release_context(self, context: BrowserContext, recorded_url: Optional[str] = None) -> None:
+        """
+        Close a context opened with new_context.
         
-        # Set default timeout
-        context.set_default_timeout(self.timeout)
+        Args:
+            context: Browser context to close
+            recorded_url: In record mode, the URL the context scraped successfully;
+                the HAR of a context closed without one is dropped
+        """
+        self._context_stats.pop(context, None)
+        recording = self._har_recordings.pop(context, None)
+        await self.get_browser_pool().release_context(context)
         
-        return playwright, browser, context
+        # The HAR is written when the context closes
+        if recording is not None:
+            try:
+                self.har_archive.finish_recording(recording, recorded_url)
+            except OSError as e:
+                logger.warning(f"Could not keep the HAR recording of {recorded_url}: {str(e)}")
         
-    async def take_screenshot(self, page: Page, name: str) -> Optional[str]:
+    async def take_screenshot(self, page: Page, name: str, failure: bool = False) -> Optional[str]:
         """
-        Take a screenshot of the current page.
+        Take a screenshot of the current page if the screenshot policy wants one.
+        The file is written in the background.
         
         Args:
             page: Playwright page instance
             name: Name for the screenshot file
+            failure: True if the screenshot documents a failure
+            
+        Returns:
+            Path to the screenshot or None if none was taken
+        """
+        return await self.screenshot_policy.capture(page, name, failure)
+        
+    async def wait_for_profile_ready(self, page: Page) -> bool:
+        """
+        Wait until the profile data is on the page.
+        
+        Args:
+            page: Playwright page instance
+            
+        Returns:
+            True if the profile rendered before the timeout, False otherwise
+        """
+        try:
+            await page.wait_for_function(
+                "() => !!window.__APOLLO_STATE__ || !!document.querySelector('h1')",
+                timeout=self.ready_timeout
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Profile not ready after {self.ready_timeout}ms: {str(e)}")
+            return False
+    
+    async def get_record_count(self, page: Page) -> Optional[int]:
+        """
+        Read the number of investments on record from the page.
+        
+        Args:
+            page: Playwright page instance
+            
+        Returns:
+            Number of investments on record, or None if not found
+        """
+        try:
+            return await page.evaluate("""() => {
+                // Prefer the Apollo state, it is there before the table renders
+                const state = window.__APOLLO_STATE__ || {};
+                for (const [key, profile] of Object.entries(state)) {
+                    if (!key.startsWith('PublicInvestorProfile:')) continue;
+                    for (const [field, ref] of Object.entries(profile)) {
+                        if (!field.startsWith('investments_on_record')) continue;
+                        const connection = ref && ref.type === 'id' ? state[ref.id] : ref;
+                        if (connection && typeof connection.record_count === 'number' && connection.record_count > 0) {
+                            return connection.record_count;
+                        }
+                    }
+                }
+                
+                // Fall back to the "Investments on record" row
+                for (const row of document.querySelectorAll('div.line-separated-row')) {
+                    if (row.textContent.toUpperCase().includes('INVESTMENTS ON RECORD')) {
+                        const match = row.textContent.match(/(\\d+)\\s*$/);
+                        if (match) return parseInt(match[1], 10);
+                    }
+                }
+                return null;
+            }""")
+        except Exception as e:
+            logger.debug(f"Could not read record count: {str(e)}")
+            return None
+    
+    async def extract_apollo_snapshot(self, page: Page, url: str) -> Optional[str]:
+        """
+        Serialize the page's Apollo cache into a minimal HTML document.
+        
+        Args:
+            page: Playwright page instance
+            url: URL of the page
             
         Returns:
-            Path to the screenshot or None if screenshot_dir is not set
+            Snapshot HTML, or None if the page has no Apollo cache
         """
-        if not self.screenshot_dir:
+        try:
+            extracted = await page.evaluate(APOLLO_CACHE_JS)
+        except Exception as e:
+            logger.warning(f"Could not extract Apollo cache: {str(e)}")
+            return None
+        
+        if not extracted or not extracted.get("state"):
             return None
+        return build_apollo_snapshot(extracted["state"], extracted.get("header", ""), url)
+    
+    async def count_investment_rows(self, page: Page) -> int:
+        """
+        Count the company rows in the investments table.
+        
+        Args:
+            page: Playwright page instance
+            
+        Returns:
+            Number of company rows, not counting co-investor rows
+        """
+        try:
+            return await page.evaluate(INVESTMENT_ROW_COUNT_JS)
+        except Exception:
+            return 0
+    
+    @staticmethod
+    def is_investments_response(response: Any) -> bool:
+        """
+        Check if a network response is the GraphQL call that loads investments.
+        
+        Args:
+            response: Playwright response
+            
+        Returns:
+            True for GraphQL responses
+        """
+        return "graphql" in response.url.lower() and response.request.method == "POST"
+    
+    def capture_graphql_responses(self, page: Page, payloads: List[Dict[str, Any]]) -> List["asyncio.Task"]:
+        """
+        Collect the JSON bodies of the page's GraphQL responses.
+        
+        Args:
+            page: Playwright page instance
+            payloads: List the response bodies are appended to
+            
+        Returns:
+            List of pending read tasks, to be awaited before the page closes
+        """
+        pending: List[asyncio.Task] = []
+        
+        async def read_body(response: Any) -> None:
+            try:
+                payload = await response.json()
+                if isinstance(payload, dict) and payload.get("data"):
+                    payloads.append(payload)
+            except Exception as e:
+                logger.debug(f"Could not read GraphQL response from {response.url}: {str(e)}")
+        
+        def on_response(response: Any) -> None:
+            if self.is_investments_response(response):
+                pending.append(asyncio.ensure_future(read_body(response)))
+        
+        page.on("response", on_response)
+        return pending
+    
+    async def wait_for_investments(self, page: Page, record_count: Optional[int], rows_before: int,
+                                   response_task: "asyncio.Future") -> None:
+        """
+        Wait until the expanded investments are on the page.
+        
+        Finishes as soon as the table holds record_count rows, or once the
+        investments GraphQL response has arrived and the table has grown.
+        Never waits longer than ready_timeout.
+        
+        Args:
+            page: Playwright page instance
+            record_count: Expected number of investments, if known
+            rows_before: Number of table rows before expanding
+            response_task: Task waiting for the investments GraphQL response
+        """
+        expected = record_count if record_count else 10 ** 9
+        rows_task = asyncio.ensure_future(page.wait_for_function(
+            f"(expected) => ({INVESTMENT_ROW_COUNT_JS})() >= expected",
+            arg=expected,
+            timeout=self.ready_timeout
+        ))
+        
+        try:
+            done, _ = await asyncio.wait(
+                {rows_task, response_task},
+                timeout=self.ready_timeout / 1000,
+                return_when=asyncio.FIRST_COMPLETED
+            )
             
-        filepath = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.png")
-        await page.screenshot(path=filepath, full_page=True)
-        logger.info(f"Screenshot saved to {filepath}")
-        return filepath
+            if rows_task in done and not rows_task.exception():
+                logger.info(f"Investments table reached {expected} rows")
+            elif response_task in done and not response_task.exception():
+                # The data has arrived, give the table a moment to render it
+                try:
+                    await page.wait_for_function(
+                        f"(before) => ({INVESTMENT_ROW_COUNT_JS})() > before",
+                        arg=rows_before,
+                        timeout=min(self.ready_timeout, 3000)
+                    )
+                except Exception:
+                    logger.debug("Investments table did not grow after GraphQL response")
+                logger.info("Investments GraphQL response received")
+            else:
+                logger.warning(f"Investments not confirmed loaded after {self.ready_timeout}ms")
+        finally:
+            if not rows_task.done():
+                rows_task.cancel()
+            await asyncio.gather(rows_task, return_exceptions=True)
         
-    async def expand_investments(self, page: Page) -> bool:
+    async def expand_investments(self, page: Page, record_count: Optional[int] = None) -> bool:
         """
         Find and click the "See all investments" button if present.
         Uses multiple approaches including direct JavaScript for reliability.
         
         Args:
             page: Playwright page instance
+            record_count: Number of investments on record, used to detect when expansion is done
             
         Returns:
             True if button was found and clicked, False otherwise
         """
+        # Listen for the investments response before anything is clicked
+        response_task = asyncio.ensure_future(
+            page.wait_for_event("response", predicate=self.is_investments_response, timeout=self.ready_timeout)
+        )
+        rows_before = await self.count_investment_rows(page)
+        
         try:
+            if record_count and rows_before >= record_count:
+                logger.info(f"All {record_count} investments already on the page, no expansion needed")
+                return False
+                
             # First take a screenshot before trying to find the button
             await self.take_screenshot(page, "before_expand")
             
@@ -619,11 +1195,8 @@ class BrowserScraper:
             if button_clicked:
                 logger.info("Found and clicked 'See all investments' button using JavaScript")
                 
-                # Wait for network activity after JavaScript click
-                await page.wait_for_load_state("networkidle")
-                
-                # Extra wait for dynamic content
-                await asyncio.sleep(random.uniform(2.0, 3.5))
+                # Wait for the investments data rather than for the network to go quiet
+                await self.wait_for_investments(page, record_count, rows_before, response_task)
                 
                 # Take another screenshot after expansion
                 await self.take_screenshot(page, "after_expand")
@@ -682,13 +1255,13 @@ class BrowserScraper:
                 logger.info("Found 'See all investments' button, clicking...")
                 
                 # Random delay before clicking to look human
-                self.random_delay()
+                await self.random_delay()
                 
                 # Try to get button position for natural click
                 try:
                     # First scroll to make sure it's in view
                     await button.scroll_into_view_if_needed()
-                    await asyncio.sleep(random.uniform(0.5, 1.0))
+                    await self.pacing.pause("scroll_into_view")
                     
                     button_box = await button.bounding_box()
                     if button_box:
@@ -700,11 +1273,11 @@ class BrowserScraper:
                         await page.mouse.move(x, y, steps=random.randint(5, 10))
                         
                         # Tiny pause before clicking
-                        await asyncio.sleep(random.uniform(0.1, 0.3))
+                        await self.pacing.pause("pre_click")
                         
                         # Click with slight randomization
                         await page.mouse.down()
-                        await asyncio.sleep(random.uniform(0.05, 0.15))
+                        await self.pacing.pause("click_hold")
                         await page.mouse.up()
                     else:
                         # Fallback to standard click if can't get position
@@ -722,11 +1295,8 @@ class BrowserScraper:
                 # Wait for the investments to load with patience
                 logger.info("Waiting for investments to load...")
                 
-                # Wait for network activity to settle
-                await page.wait_for_load_state("networkidle")
-                
-                # Extra wait for dynamic content
-                await asyncio.sleep(random.uniform(2.0, 3.5))
+                # Wait for the investments data rather than for the network to go quiet
+                await self.wait_for_investments(page, record_count, rows_before, response_task)
                 
                 # Take another screenshot after expansion
                 await self.take_screenshot(page, "after_expand")
@@ -744,9 +1314,14 @@ class BrowserScraper:
                 
         except Exception as e:
             logger.error(f"Error expanding investments: {str(e)}")
-            await self.take_screenshot(page, "expand_error")
+            await self.take_screenshot(page, "expand_error", failure=True)
             return False
             
+        finally:
+            if not response_task.done():
+                response_task.cancel()
+            await asyncio.gather(response_task, return_exceptions=True)
+            
     async def scrape(self, url: str) -> Optional[str]:
         """
         Perform browser automation to scrape a URL with anti-detection measures.
@@ -756,22 +1331,56 @@ class BrowserScraper:
             
         Returns:
             HTML content if successful, None otherwise
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        result = await self.scrape_page(url)
+        return result.html if result else None
+    
+    async def scrape_page(self, url: str) -> Optional[ScrapeResult]:
+        """
+        Scrape a URL and return the HTML together with the captured GraphQL data.
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            ScrapeResult if successful, None otherwise
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
         """
-        playwright = None
-        browser = None
+        if self.circuit_breaker:
+            self.circuit_breaker.check()
+            
+        context = None
+        page = None
+        succeeded = False
+        upstream_failure = False  # the site or proxy failed, not this page
+        crashes: List[str] = []
+        resource_stats = ResourceStats()
+        timer = PhaseTimer(url)
         
         try:
-            # Set up browser
-            playwright, browser, context = await self.setup_browser()
+            # Get a prepared context from the long-lived browser
+            context = await self.new_context()
+            resource_stats = self.get_resource_stats(context)
             
             # Create a new page
             page = await context.new_page()
+            page.on("crash", lambda _: crashes.append(url))
+            self.screenshot_policy.start_page(page)
+            timer.mark("context")
+            
+            # Keep the GraphQL responses, they hold the exact investment list
+            graphql_payloads: List[Dict[str, Any]] = []
+            pending_reads = self.capture_graphql_responses(page, graphql_payloads)
             
-            # Apply anti-detection measures if stealth mode is enabled
+            # Stealth scripts and resource routes are on the context already;
+            # only the document route depends on the URL
             if self.stealth_mode:
-                await self.bypass_fingerprinting(page)
-                await self.apply_stealth_patches(page)
-                await self.intercept_bot_checks(page)
+                await self.intercept_bot_checks(page, url)
             
             # Add a reasonable referer to look legitimate
             referer = random.choice([
@@ -781,12 +1390,27 @@ class BrowserScraper:
                 "https://www.crunchbase.com/"
             ])
             
-            # Navigate to the URL with referer
+            # Navigate to the URL with referer; scripts have run once "load" fires
             logger.info(f"Navigating to {url}")
-            await page.goto(url, referer=referer)
+            try:
+                response = await page.goto(url, referer=referer, wait_until="load")
+            except Exception:
+                # Connection errors and navigation timeouts, like BasicScraper.is_upstream_failure()
+                upstream_failure = True
+                raise
+            if response is not None and is_upstream_status(response.status):
+                upstream_failure = True
+                raise RuntimeError(f"Navigation to {url} returned HTTP {response.status}")
+            timer.mark("navigate")
             
-            # Wait for the page to load
-            await page.wait_for_load_state("networkidle")
+            # The site answered; what goes wrong on the page from here on is the page's problem
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success()
+            
+            # Wait for the profile data itself instead of network idle
+            await self.wait_for_profile_ready(page)
+            record_count = await self.get_record_count(page)
+            timer.mark("ready")
             
             # Simulate human-like interaction with the page
             await self.simulate_human_behavior(page)
@@ -795,35 +1419,170 @@ class BrowserScraper:
             await self.take_screenshot(page, "initial")
             
             # Random delay before proceeding - more natural pattern
-            self.random_delay()
+            await self.random_delay()
+            timer.mark("interact")
             
             # Try to expand investments with human-like behavior
-            expanded = await self.expand_investments(page)
+            expanded = await self.expand_investments(page, record_count)
+            timer.mark("expand")
             if expanded:
                 # Additional wait after expansion
-                self.random_delay(1.5)
+                await self.random_delay(1.5)
                 
                 # More human-like interactions after expansion
                 await self.simulate_human_behavior(page)
+                timer.mark("interact")
                 
-            # Get the final HTML content
-            html_content = await page.content()
+            # Get the final content, the Apollo cache alone if that is all we keep
+            html_content = None
+            if self.capture_mode == "apollo":
+                html_content = await self.extract_apollo_snapshot(page, url)
+                if html_content is None:
+                    logger.warning(f"No Apollo cache on {url}, keeping the full page")
+            if html_content is None:
+                html_content = await page.content()
+            if pending_reads:
+                await asyncio.gather(*pending_reads, return_exceptions=True)
+            timer.mark("content")
             
             # Take final screenshot
             await self.take_screenshot(page, "final")
             
-            return html_content
+            # Keep the cookies of a page that worked for the next contexts
+            if self.storage_state is not None:
+                self.storage_state.record_page()
+                if self.storage_state.should_refresh():
+                    await self.storage_state.save_from(context)
+            
+            self.log_resource_stats(url, resource_stats)
+            self.record_timings(timer)
+            
+            if graphql_payloads:
+                logger.info(f"Captured {len(graphql_payloads)} GraphQL responses for {url}")
+            
+            succeeded = True
+            return ScrapeResult(
+                url=url,
+                html=html_content,
+                graphql_payloads=graphql_payloads,
+                record_count=record_count,
+                expanded=expanded,
+                timings=dict(timer.phases)
+            )
             
         except Exception as e:
             logger.error(f"Browser automation error: {str(e)}")
+            if page is not None:
+                await self.take_screenshot(page, "error", failure=True)
+            # Selector misses, expansion timeouts and the like stay out of the shared breaker
+            if self.circuit_breaker and upstream_failure:
+                self.circuit_breaker.record_failure()
             return None
             
         finally:
-            # Cleanup
-            if browser:
-                await browser.close()
-            if playwright:
-                await playwright.stop()
+            # Cleanup the context, the browser stays up for the next URL
+            if page is not None and self.watchdog is not None:
+                self.watchdog.record_page(crashed=bool(crashes))
+            if context:
+                await self.release_context(context, url if succeeded else None)
+    
+    async def scrape_many(self, urls: Iterable[str], concurrency: int = 4) -> AsyncIterator[Tuple[str, Optional[ScrapeResult]]]:
+        """
+        Scrape several URLs concurrently in the same browser.
+        
+        Up to `concurrency` pages, each in its own context, are driven at once
+        on the current event loop. Results are yielded as soon as each page
+        finishes, not in input order.
+        
+        Args:
+            urls: URLs to scrape
+            concurrency: Maximum number of pages open at the same time
+            
+        Yields:
+            Tuples of (url, ScrapeResult or None if failed)
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker opens; unfinished pages are cancelled
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def scrape_one(url: str) -> Tuple[str, Optional[ScrapeResult]]:
+            async with semaphore:
+                return url, await self.scrape_page(url)
+        
+        tasks = [asyncio.ensure_future(scrape_one(url)) for url in urls]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Cancel whatever is still queued or running if the caller stops early
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    def get_browser_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the browsers used so far.
+        
+        Returns:
+            Dictionary with the pool counters, the watchdog's health statistics,
+            the context pool's acquire latencies and the cache counters
+        """
+        stats = self.browser_pool.get_statistics() if self.browser_pool is not None else {}
+        if self.watchdog is not None:
+            stats.update(self.watchdog.get_statistics())
+        if self.context_pool is not None:
+            stats['context_pool'] = self.context_pool.get_statistics()
+        if self.storage_state is not None:
+            stats['storage_state'] = self.storage_state.get_statistics()
+        if self.asset_cache is not None:
+            stats['asset_cache'] = self.asset_cache.get_statistics()
+        if self.har_archive is not None:
+            stats['har'] = self.har_archive.get_statistics()
+        return stats
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop used by the synchronous wrappers.
+        
+        Playwright objects are bound to the loop they were created on, so the
+        same loop is reused for every call to keep the browser pool alive.
+        
+        Returns:
+            The scraper's event loop
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+    
+    async def shutdown(self) -> None:
+        """
+        Close the prepared contexts and the browser pool, and stop Playwright.
+        """
+        self.screenshot_policy.flush()
+        if self.context_pool is not None:
+            await self.context_pool.close()
+            self.context_pool = None
+        if self.browser_pool is not None and self._owns_pool:
+            await self.browser_pool.close()
+            self.browser_pool = None
+    
+    def close(self) -> None:
+        """
+        Synchronous wrapper for shutdown that also closes the event loop.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.shutdown())
+            self._loop.close()
+        self._loop = None
+    
+    def __enter__(self) -> 'BrowserScraper':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def fetch(self, url: str) -> Optional[str]:
         """
@@ -834,5 +1593,51 @@ class BrowserScraper:
             
         Returns:
             HTML content if successful, None otherwise
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
         """
-        return asyncio.run(self.scrape(url)) 
\ No newline at end of file
+        return self._get_loop().run_until_complete(self.scrape(url))
+    
+    def fetch_page(self, url: str) -> Optional[ScrapeResult]:
+        """
+        Synchronous wrapper for the async scrape_page method.
+        
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            ScrapeResult if successful, None otherwise
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        return self._get_loop().run_until_complete(self.scrape_page(url))
+    
+    def fetch_many(self, urls: Iterable[str], concurrency: int = 4) -> Iterator[Tuple[str, Optional[ScrapeResult]]]:
+        """
+        Synchronous wrapper for the async scrape_many method.
+        
+        Results are streamed back as they finish. Pages only make progress
+        while the caller is waiting for the next result.
+        
+        Args:
+            urls: URLs to scrape
+            concurrency: Maximum number of pages open at the same time
+            
+        Yields:
+            Tuples of (url, ScrapeResult or None if failed)
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker opens
+        """
+        loop = self._get_loop()
+        results = self.scrape_many(urls, concurrency)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose()) 
\ No newline at end of file
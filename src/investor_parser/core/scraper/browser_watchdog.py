@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+
+import os
+import time
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Set
+
+# Import psutil - we'll fall back to /proc if it is not installed
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Memory can be sampled through psutil or, on Linux, straight from /proc
+MEMORY_SAMPLING_AVAILABLE = PSUTIL_AVAILABLE or os.path.isdir("/proc")
+
+def _read_parent_pids() -> Dict[int, int]:
+    """
+    Map every process id to its parent id using /proc.
+
+    Returns:
+        Dictionary of pid to parent pid
+    """
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+            # The command name may contain spaces, the fields after it do not
+            fields = stat[stat.rindex(b")") + 2:].split()
+            parents[int(name)] = int(fields[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    return parents
+
+def _descendants(pid: int, parents: Dict[int, int]) -> List[int]:
+    """
+    Collect all descendants of a process from a pid to parent map.
+
+    Args:
+        pid: Root process id
+        parents: Dictionary of pid to parent pid
+
+    Returns:
+        List of descendant process ids
+    """
+    children: Dict[int, List[int]] = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(children.get(current, []))
+    return found
+
+def child_pids(pid: int) -> List[int]:
+    """
+    Get the direct children of a process.
+
+    Args:
+        pid: Parent process id
+
+    Returns:
+        List of child process ids, empty if they cannot be listed
+    """
+    try:
+        if PSUTIL_AVAILABLE:
+            return [child.pid for child in psutil.Process(pid).children()]
+        if os.path.isdir("/proc"):
+            return [child for child, parent in _read_parent_pids().items() if parent == pid]
+    except Exception as e:
+        logger.debug(f"Could not list children of process {pid}: {str(e)}")
+    return []
+
+def driver_child_pids() -> Set[int]:
+    """
+    Get the processes started by the Playwright drivers of this process.
+
+    Browsers are launched by the driver, which is a child of this process.
+
+    Returns:
+        Set of process ids one level below this process's children
+    """
+    pids = set()
+    for driver in child_pids(os.getpid()):
+        pids.update(child_pids(driver))
+    return pids
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Get the resident memory of a process and all its descendants.
+
+    Args:
+        pid: Root process id
+
+    Returns:
+        Resident set size in bytes, or None if the process is gone or memory cannot be read
+    """
+    try:
+        if PSUTIL_AVAILABLE:
+            root = psutil.Process(pid)
+            total = root.memory_info().rss
+            for child in root.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+
+        if os.path.isdir("/proc"):
+            page_size = os.sysconf("SC_PAGE_SIZE")
+            total = 0
+            for member in [pid] + _descendants(pid, _read_parent_pids()):
+                try:
+                    with open(f"/proc/{member}/statm", "r") as f:
+                        total += int(f.read().split()[1]) * page_size
+                except (OSError, ValueError, IndexError):
+                    if member == pid:
+                        return None
+            return total
+    except Exception as e:
+        logger.debug(f"Could not read memory of process {pid}: {str(e)}")
+    return None
+
+class BrowserWatchdog:
+    """
+    Keeps an eye on the health of the browsers in a BrowserPool.
+
+    At most once per interval it samples the resident memory of the current
+    browser's process tree and its age. When either crosses its limit, or
+    too many recent pages crashed, the browser is recycled: new contexts go
+    to a fresh browser while pages already running on the old one finish
+    before it is closed.
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        max_rss_mb: Optional[float] = 1500,
+        max_age: Optional[float] = 1800.0,
+        max_crash_rate: Optional[float] = 0.2,
+        crash_window: int = 50,
+        min_pages: int = 10,
+        interval: float = 30.0
+    ):
+        """
+        Initialize the watchdog.
+
+        Args:
+            pool: BrowserPool to supervise
+            max_rss_mb: Memory of a browser process tree, in MB, that triggers a recycle
+            max_age: Seconds a browser may run before it is recycled
+            max_crash_rate: Share (0-1) of crashed pages in the window that triggers a recycle
+            crash_window: Number of recent pages the crash rate is computed over
+            min_pages: Minimum number of pages in the window before the crash rate is used
+            interval: Minimum seconds between two memory samples
+        """
+        self.pool = pool
+        self.max_rss_mb = max_rss_mb
+        self.max_age = max_age
+        self.max_crash_rate = max_crash_rate
+        self.min_pages = min_pages
+        self.interval = interval
+
+        self._outcomes = deque(maxlen=crash_window)
+        self._last_check = 0.0
+        self._checking = False
+
+        # Counters exposed through get_statistics()
+        self.samples = 0
+        self.last_rss_mb: Optional[float] = None
+        self.peak_rss_mb: Optional[float] = None
+        self.page_crashes = 0
+        self.recycles: Counter = Counter()
+
+        if max_rss_mb is not None and not MEMORY_SAMPLING_AVAILABLE:
+            logger.warning("Browser memory cannot be sampled on this system, only age and crashes are watched")
+
+    def record_page(self, crashed: bool = False) -> None:
+        """
+        Record the outcome of a finished page.
+
+        Args:
+            crashed: True if the page crashed
+        """
+        self._outcomes.append(crashed)
+        if crashed:
+            self.page_crashes += 1
+
+    def crash_rate(self) -> float:
+        """
+        Get the share of crashed pages over the recent window.
+
+        Returns:
+            Crash rate between 0 and 1
+        """
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for crashed in self._outcomes if crashed) / len(self._outcomes)
+
+    async def maybe_check(self) -> Optional[str]:
+        """
+        Run check() if the interval has passed since the last one.
+
+        Cheap enough to call before every new context.
+
+        Returns:
+            Reason the browser was recycled, or None
+        """
+        if self._checking or time.monotonic() - self._last_check < self.interval:
+            return None
+        return await self.check()
+
+    async def check(self) -> Optional[str]:
+        """
+        Sample the current browser and recycle it if it is unhealthy.
+
+        Returns:
+            Reason the browser was recycled ("memory", "age" or "crashes"), or None
+        """
+        self._checking = True
+        self._last_check = time.monotonic()
+        try:
+            slot = self.pool.current_slot
+            if slot is None or not slot.is_usable():
+                return None
+
+            reason = None
+            if self.max_rss_mb is not None and slot.pid is not None:
+                # Reading /proc walks every process, keep it off the event loop
+                rss = await asyncio.get_running_loop().run_in_executor(None, process_tree_rss, slot.pid)
+                if rss is not None:
+                    self.samples += 1
+                    self.last_rss_mb = rss / (1024 * 1024)
+                    self.peak_rss_mb = max(self.peak_rss_mb or 0.0, self.last_rss_mb)
+                    if self.last_rss_mb > self.max_rss_mb:
+                        reason = "memory"
+                        logger.warning(
+                            f"Browser uses {self.last_rss_mb:.0f} MB (limit {self.max_rss_mb:.0f} MB)"
+                        )
+
+            age = time.monotonic() - slot.started_at
+            if reason is None and self.max_age is not None and age > self.max_age:
+                reason = "age"
+                logger.info(f"Browser has been running for {age / 60:.0f} minutes")
+
+            if (reason is None and self.max_crash_rate is not None and
+                    len(self._outcomes) >= self.min_pages and self.crash_rate() >= self.max_crash_rate):
+                reason = "crashes"
+                logger.warning(f"{self.crash_rate():.0%} of the last {len(self._outcomes)} pages crashed")
+
+            if reason is None:
+                return None
+
+            if await self.pool.recycle(reason):
+                self.recycles[reason] += 1
+                self._outcomes.clear()
+                return reason
+            return None
+        finally:
+            self._checking = False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the browsers' health.
+
+        Returns:
+            Dictionary with memory samples, crash counts and recycles by reason
+        """
+        return {
+            'memory_samples': self.samples,
+            'last_rss_mb': round(self.last_rss_mb, 1) if self.last_rss_mb is not None else None,
+            'peak_rss_mb': round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+            'page_crashes': self.page_crashes,
+            'crash_rate': round(self.crash_rate(), 2),
+            'recycles': dict(self.recycles)
+        }
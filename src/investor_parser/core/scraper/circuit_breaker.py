@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a fetch is attempted while the circuit breaker is open.
+    """
+    pass
+
+def is_upstream_status(status_code: int) -> bool:
+    """
+    Check if an HTTP status points at the site or proxy being unavailable,
+    as opposed to a problem with the individual URL.
+
+    Args:
+        status_code: HTTP status of the response
+
+    Returns:
+        True for 429 and 5xx responses
+    """
+    return status_code == 429 or status_code >= 500
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker shared by the scrapers.
+
+    The breaker tracks the outcome of the most recent fetch attempts. When the
+    failure rate over that window crosses the threshold it opens and refuses
+    further attempts until the reset timeout has passed. After that a single
+    probe is let through (half-open); a success closes the breaker again, a
+    failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 60.0
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Failure rate (0-1) over the window that opens the breaker
+            window_size: Number of recent attempts used to compute the failure rate
+            min_calls: Minimum number of attempts in the window before the breaker can open
+            reset_timeout: Seconds to wait in the open state before allowing a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Get the current breaker state, moving from open to half-open once the
+        reset timeout has passed.
+
+        Returns:
+            One of "closed", "open" or "half_open"
+        """
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Compute the state; the caller must hold the lock."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info("Circuit breaker half-open, allowing a probe request")
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a new URL may be dispatched.
+
+        In the half-open state only one probe is allowed until its outcome
+        has been recorded. A probe that never reports back is given up on
+        after the reset timeout.
+
+        Returns:
+            True if the caller may dispatch a URL, False otherwise
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN:
+                now = time.monotonic()
+                if not self._probe_in_flight or now - self._probe_started_at >= self.reset_timeout:
+                    self._probe_in_flight = True
+                    self._probe_started_at = now
+                    return True
+            return False
+
+    def check(self) -> None:
+        """
+        Raise if the breaker is open. Called by the scrapers before each attempt.
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        if self.state == self.OPEN:
+            raise CircuitOpenError(
+                f"Circuit breaker open, retry in {self.time_until_retry():.1f} seconds"
+            )
+
+    def record_success(self) -> None:
+        """Record a successful fetch attempt."""
+        with self._lock:
+            self._outcomes.append(True)
+            if self._current_state() == self.HALF_OPEN:
+                logger.info("Probe request succeeded, closing circuit breaker")
+                self._state = self.CLOSED
+                self._probe_in_flight = False
+                self._outcomes.clear()
+
+    def record_failure(self) -> None:
+        """Record a failed fetch attempt, opening the breaker if needed."""
+        with self._lock:
+            self._outcomes.append(False)
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                logger.warning("Probe request failed, re-opening circuit breaker")
+                self._open()
+            elif state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for ok in self._outcomes if not ok)
+                failure_rate = failures / len(self._outcomes)
+                if failure_rate >= self.failure_threshold:
+                    logger.warning(
+                        f"Failure rate {failure_rate:.0%} over last {len(self._outcomes)} attempts, "
+                        f"opening circuit breaker for {self.reset_timeout:.0f} seconds"
+                    )
+                    self._open()
+
+    def release_probe(self) -> None:
+        """
+        Give up on the probe in flight without recording an outcome.
+
+        Used when the probe ended without reaching the site, so the next
+        request can probe instead of waiting for the reset timeout.
+        """
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Move to the open state; the caller must hold the lock."""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def time_until_retry(self) -> float:
+        """
+        Get the number of seconds until the breaker allows a probe.
+
+        Returns:
+            Seconds remaining in the open state, 0 if not open
+        """
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the breaker.
+
+        Returns:
+            Dictionary with the state and the recent failure rate
+        """
+        with self._lock:
+            total = len(self._outcomes)
+            failures = sum(1 for ok in self._outcomes if not ok)
+            return {
+                'state': self._current_state(),
+                'window': total,
+                'failures': failures,
+                'failure_rate': round(failures / total, 2) if total else 0.0
+            }
+
+class OutcomeRecorder:
+    """
+    Stand-in for the circuit breaker in a worker process.
+
+    The coordinator owns the only CircuitBreaker and decides when URLs are
+    dispatched. Workers hand this recorder to their scrapers instead; it
+    never refuses an attempt and only collects the outcomes, which the
+    worker sends back with each result for the coordinator to record.
+    """
+
+    def __init__(self):
+        """Initialize the recorder."""
+        self._outcomes: List[bool] = []
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        """Never raises; the coordinator stops dispatching instead."""
+
+    def record_success(self) -> None:
+        """Record a successful fetch attempt."""
+        with self._lock:
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed fetch attempt."""
+        with self._lock:
+            self._outcomes.append(False)
+
+    def drain(self) -> List[bool]:
+        """
+        Take the outcomes recorded since the last call.
+
+        Returns:
+            Outcomes in the order they happened, True for a success
+        """
+        with self._lock:
+            outcomes, self._outcomes = self._outcomes, []
+            return outcomes
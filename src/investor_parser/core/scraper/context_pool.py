@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+
+import math
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LatencyStats:
+    """
+    Running count, mean and maximum of a latency.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one measurement.
+
+        Args:
+            seconds: Measured latency in seconds
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the counters to a dictionary in milliseconds.
+
+        Returns:
+            Dictionary with count, mean_ms and max_ms
+        """
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 1) if self.count else None,
+            'max_ms': round(self.max * 1000, 1) if self.count else None
+        }
+
+class ContextPool:
+    """
+    Keeps a few fully prepared browser contexts ready for the next URL.
+
+    Contexts are still used once and closed afterwards; the pool only moves
+    their creation (options, init scripts, headers, routes) off the critical
+    path. Background tasks refill the pool, one per missing context, while
+    the handed-out contexts are busy navigating.
+
+    The target size follows demand: it is the number of contexts requested
+    during the time it takes to prepare one (acquire rate times prepare
+    time, both smoothed), clamped to [min_size, max_size].
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        release: Callable[[Any], Awaitable[None]],
+        is_usable: Optional[Callable[[Any], bool]] = None,
+        min_size: int = 1,
+        max_size: int = 4,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize the context pool.
+
+        Args:
+            factory: Coroutine function returning a prepared context
+            release: Coroutine function closing a context
+            is_usable: Optional check that a waiting context can still be handed out
+            min_size: Minimum number of contexts kept ready
+            max_size: Maximum number of contexts kept ready
+            smoothing: Weight (0-1) of the newest sample in the rate and prepare time averages
+        """
+        if max_size < max(min_size, 0):
+            raise ValueError(f"max_size ({max_size}) must be at least min_size ({min_size})")
+
+        self.factory = factory
+        self.release = release
+        self.is_usable = is_usable
+        self.min_size = max(0, min_size)
+        self.max_size = max_size
+        self.smoothing = smoothing
+
+        # Prepared contexts with the time they became ready, oldest first
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._refills: Set[asyncio.Task] = set()
+        self._closed = False
+
+        # Smoothed demand and preparation cost
+        self._last_acquire: Optional[float] = None
+        self._interval: Optional[float] = None
+        self._prepare_time: Optional[float] = None
+        self.target_size = self.min_size
+
+        # Counters exposed through get_statistics()
+        self.warm = LatencyStats()
+        self.cold = LatencyStats()
+        self.prepare = LatencyStats()
+        self.idle_time = LatencyStats()
+        self.discarded = 0
+        self.failures = 0
+
+    def _smooth(self, current: Optional[float], sample: float) -> float:
+        """
+        Fold a sample into an exponentially weighted moving average.
+
+        Args:
+            current: Current average, None if there is none yet
+            sample: New sample
+
+        Returns:
+            Updated average
+        """
+        if current is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * current
+
+    def demand_rate(self) -> float:
+        """
+        Get the smoothed number of contexts requested per second.
+
+        Returns:
+            Acquire rate, 0 before two acquires were seen
+        """
+        if not self._interval:
+            return 0.0
+        return 1.0 / self._interval
+
+    def _update_target(self) -> None:
+        """Resize the pool to the contexts needed while one is being prepared."""
+        needed = 0
+        if self._prepare_time is not None:
+            needed = math.ceil(self.demand_rate() * self._prepare_time)
+        self.target_size = min(self.max_size, max(self.min_size, needed))
+
+    async def _prepare(self) -> Any:
+        """
+        Create one context through the factory and time it.
+
+        Returns:
+            Prepared context
+        """
+        started = time.perf_counter()
+        context = await self.factory()
+        elapsed = time.perf_counter() - started
+        self.prepare.record(elapsed)
+        self._prepare_time = self._smooth(self._prepare_time, elapsed)
+        return context
+
+    async def acquire(self) -> Any:
+        """
+        Get a prepared context, from the pool if one is ready.
+
+        The context belongs to the caller and must be closed with the
+        release function. A refill is started in the background.
+
+        Returns:
+            Prepared context
+        """
+        started = time.perf_counter()
+        if self._last_acquire is not None:
+            self._interval = self._smooth(self._interval, started - self._last_acquire)
+        self._last_acquire = started
+
+        context = None
+        while self._idle:
+            candidate, ready_at = self._idle.popleft()
+            if self.is_usable is None or self.is_usable(candidate):
+                self.idle_time.record(started - ready_at)
+                context = candidate
+                break
+            await self._discard(candidate)
+
+        if context is not None:
+            self.warm.record(time.perf_counter() - started)
+        else:
+            context = await self._prepare()
+            self.cold.record(time.perf_counter() - started)
+
+        self._update_target()
+        self._schedule_refill()
+        return context
+
+    async def _discard(self, context: Any) -> None:
+        """
+        Close a prepared context that will not be handed out.
+
+        Args:
+            context: Context to close
+        """
+        self.discarded += 1
+        try:
+            await self.release(context)
+        except Exception as e:
+            logger.debug(f"Error closing discarded context: {str(e)}")
+
+    async def discard_stale(self) -> int:
+        """
+        Close waiting contexts that are no longer usable, e.g. after their browser was recycled.
+
+        Returns:
+            Number of contexts closed
+        """
+        if self.is_usable is None:
+            return 0
+        stale = [entry for entry in self._idle if not self.is_usable(entry[0])]
+        for entry in stale:
+            self._idle.remove(entry)
+            await self._discard(entry[0])
+        return len(stale)
+
+    def _schedule_refill(self) -> None:
+        """Start a background preparation for every context the pool is short of."""
+        if self._closed:
+            return
+        loop = asyncio.get_running_loop()
+        for _ in range(self.target_size - len(self._idle) - len(self._refills)):
+            task = loop.create_task(self._refill())
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _refill(self) -> None:
+        """Prepare one context and add it to the pool."""
+        try:
+            context = await self._prepare()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Leave it to the next acquire, which surfaces the error itself
+            self.failures += 1
+            logger.warning(f"Could not prepare a browser context: {str(e)}")
+            return
+
+        if self._closed:
+            await self._discard(context)
+        else:
+            self._idle.append((context, time.perf_counter()))
+
+    async def fill(self) -> None:
+        """Prepare contexts up to the target size and wait until they are ready."""
+        self._schedule_refill()
+        if self._refills:
+            await asyncio.gather(*self._refills, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stop refilling and close every waiting context."""
+        self._closed = True
+        refills = list(self._refills)
+        for task in refills:
+            task.cancel()
+        if refills:
+            await asyncio.gather(*refills, return_exceptions=True)
+
+        while self._idle:
+            context, _ = self._idle.popleft()
+            await self._discard(context)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the pool.
+
+        Returns:
+            Dictionary with warm and cold acquire latencies, sizing and counters
+        """
+        acquired = self.warm.count + self.cold.count
+        return {
+            'warm_acquires': self.warm.to_dict(),
+            'cold_acquires': self.cold.to_dict(),
+            'warm_hit_rate': round(self.warm.count / acquired, 2) if acquired else None,
+            'prepare': self.prepare.to_dict(),
+            'idle_before_use': self.idle_time.to_dict(),
+            'demand_per_second': round(self.demand_rate(), 3),
+            'target_size': self.target_size,
+            'ready': len(self._idle),
+            'discarded': self.discarded,
+            'failures': self.failures
+        }
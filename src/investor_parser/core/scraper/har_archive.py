@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+
+import os
+import re
+import json
+import base64
+import hashlib
+import logging
+import itertools
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# off: live network; record: save one HAR per scraped profile; replay: serve
+# the saved HARs and never touch the network
+HAR_MODES = ("off", "record", "replay")
+
+# Maps each recorded profile URL to its HAR file
+INDEX_FILENAME = "index.json"
+
+# Response headers that do not describe the replayed body
+REPLAY_SKIPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+def har_filename(url: str) -> str:
+    """
+    Get the HAR file name for a profile URL.
+
+    Args:
+        url: Profile URL
+
+    Returns:
+        File name made of the URL's host and path plus a short hash
+    """
+    parsed = urlparse(url)
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{parsed.netloc}{parsed.path}").strip("_")[:120]
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+    return f"{readable}-{digest}.har"
+
+def _request_key(method: str, url: str, post_data: Optional[str]) -> Tuple[str, str, str]:
+    """
+    Build the lookup key of a request.
+
+    GraphQL requests share one URL, so POST bodies are part of the key.
+
+    Args:
+        method: HTTP method
+        url: Request URL without fragment
+        post_data: Request body, if any
+
+    Returns:
+        Tuple of (method, url, body)
+    """
+    return method.upper(), url.split("#", 1)[0], post_data or ""
+
+class HarArchive:
+    """
+    Directory of HAR recordings used to run the browser path offline.
+
+    In record mode every context writes a HAR (Playwright's record_har_path)
+    under a temporary name; once its profile is scraped successfully the
+    file is renamed after the profile URL. In replay mode all recordings are
+    indexed and a single catch-all route serves every request from them;
+    requests that were never recorded are aborted, so nothing reaches the
+    network and runs are repeatable.
+    """
+
+    def __init__(self, directory: str = "data/har"):
+        """
+        Initialize the archive.
+
+        Args:
+            directory: Directory the HAR files are written to and read from
+        """
+        self.directory = directory
+        self._counter = itertools.count()
+
+        # Replay index: request key to recorded responses, served in turn
+        self._entries: Optional[Dict[Tuple[str, str, str], List[Dict[str, Any]]]] = None
+        self._by_url: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._served: Counter = Counter()
+
+        # Counters exposed through get_statistics()
+        self.recorded = 0
+        self.discarded = 0
+        self.replayed = 0
+        self.missing = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def recording_options(self) -> Dict[str, Any]:
+        """
+        Get the context options that record a new HAR.
+
+        Returns:
+            Keyword arguments for browser.new_context
+        """
+        path = os.path.join(self.directory, f".recording-{os.getpid()}-{next(self._counter)}.har")
+        return {"record_har_path": path, "record_har_content": "embed", "record_har_mode": "full"}
+
+    def finish_recording(self, recording_path: str, url: Optional[str]) -> Optional[str]:
+        """
+        Keep or drop a HAR written when its context was closed.
+
+        Args:
+            recording_path: Temporary path the context recorded to
+            url: Profile URL the context scraped successfully, None to drop the recording
+
+        Returns:
+            Final path of the kept HAR, or None
+        """
+        if not os.path.exists(recording_path):
+            return None
+        if url is None:
+            os.remove(recording_path)
+            self.discarded += 1
+            return None
+
+        filename = har_filename(url)
+        final_path = os.path.join(self.directory, filename)
+        os.replace(recording_path, final_path)
+
+        index = self._read_index()
+        index[url] = filename
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(index_path + ".tmp", index_path)
+
+        self.recorded += 1
+        logger.info(f"Recorded {url} to {final_path}")
+        return final_path
+
+    def _read_index(self) -> Dict[str, str]:
+        """
+        Read the URL to HAR file index.
+
+        Returns:
+            Dictionary of profile URL to file name, empty if there is none
+        """
+        try:
+            with open(os.path.join(self.directory, INDEX_FILENAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def recorded_urls(self) -> List[str]:
+        """
+        Get the profile URLs that have a recording.
+
+        Returns:
+            List of URLs in the order they were recorded
+        """
+        return [
+            url for url, filename in self._read_index().items()
+            if os.path.exists(os.path.join(self.directory, filename))
+        ]
+
+    def load(self) -> int:
+        """
+        Index every recorded request for replay.
+
+        Returns:
+            Number of recorded responses
+        """
+        self._entries = {}
+        self._by_url = {}
+        count = 0
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".har") or name.startswith(".recording-"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    har = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read HAR file {path}: {str(e)}")
+                continue
+
+            for entry in har.get("log", {}).get("entries", []):
+                request, response = entry.get("request", {}), entry.get("response", {})
+                # Requests that failed while recording have no status
+                if not response.get("status"):
+                    continue
+                method, url = request.get("method", "GET"), request.get("url", "")
+                post_data = (request.get("postData") or {}).get("text")
+                self._entries.setdefault(_request_key(method, url, post_data), []).append(response)
+                self._by_url.setdefault(_request_key(method, url, None)[:2], []).append(response)
+                count += 1
+
+        logger.info(f"Loaded {count} recorded responses from {self.directory}")
+        return count
+
+    def _lookup(self, method: str, url: str, post_data: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Find the recorded response for a request.
+
+        Identical requests get their recorded responses in order; the last
+        one is repeated once they run out.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            post_data: Request body, if any
+
+        Returns:
+            HAR response entry, or None if the request was never recorded
+        """
+        if self._entries is None:
+            self.load()
+
+        key = _request_key(method, url, post_data)
+        responses = self._entries.get(key)
+        if not responses:
+            # Same URL with a different body, e.g. a query with a fresh nonce
+            key = key[:2]
+            responses = self._by_url.get(key)
+        if not responses:
+            return None
+
+        index = self._served[key]
+        self._served[key] += 1
+        return responses[min(index, len(responses) - 1)]
+
+    def _read_body(self, content: Dict[str, Any]) -> bytes:
+        """
+        Decode the body of a HAR response.
+
+        Args:
+            content: HAR content object
+
+        Returns:
+            Response body
+        """
+        if "_file" in content:
+            with open(os.path.join(self.directory, content["_file"]), "rb") as f:
+                return f.read()
+        text = content.get("text") or ""
+        if content.get("encoding") == "base64":
+            return base64.b64decode(text)
+        return text.encode("utf-8")
+
+    async def handle(self, route: Any) -> None:
+        """
+        Fulfill a request from the recordings or abort it.
+
+        Args:
+            route: Playwright route
+        """
+        request = route.request
+        response = self._lookup(request.method, request.url, request.post_data)
+        if response is None:
+            self.missing += 1
+            logger.debug(f"No recording for {request.method} {request.url}")
+            await route.abort("internetdisconnected")
+            return
+
+        headers: Dict[str, str] = {}
+        for header in response.get("headers", []):
+            name = header.get("name", "").lower()
+            if name in REPLAY_SKIPPED_HEADERS:
+                continue
+            headers[name] = f"{headers[name]}\n{header['value']}" if name in headers else header.get("value", "")
+
+        self.replayed += 1
+        await route.fulfill(status=response["status"], headers=headers, body=self._read_body(response.get("content", {})))
+
+    async def attach(self, context: Any) -> None:
+        """
+        Serve every request of a context from the recordings.
+
+        Must be registered before the other routes, which then fall back to it.
+
+        Args:
+            context: Playwright browser context
+        """
+        if self._entries is None:
+            self.load()
+        await context.route("**/*", self.handle)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about recording and replay.
+
+        Returns:
+            Dictionary with recorded, replayed and missing counters
+        """
+        return {
+            'recorded': self.recorded,
+            'discarded': self.discarded,
+            'replayed': self.replayed,
+            'missing': self.missing
+        }
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import random
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class PacingPolicy:
+    """
+    Source of all human-like delays on the browser path.
+
+    Every wait goes through one policy object so the timing can be tuned (or
+    switched off for benchmarks) in one place. The async helpers use
+    asyncio.sleep so other pages on the same event loop keep running while
+    one page waits.
+    """
+
+    # Short pauses between individual interactions, in seconds
+    DEFAULT_PAUSES: Dict[str, Tuple[float, float]] = {
+        "scroll": (0.1, 0.5),
+        "mouse_move": (0.1, 0.3),
+        "scroll_into_view": (0.5, 1.0),
+        "pre_click": (0.1, 0.3),
+        "click_hold": (0.05, 0.15),
+        "detection_script": (0.5, 1.5),
+    }
+
+    def __init__(
+        self,
+        min_delay: float = 2.0,
+        max_delay: float = 5.0,
+        jitter: float = 0.3,
+        pauses: Optional[Dict[str, Tuple[float, float]]] = None,
+        scale: float = 1.0
+    ):
+        """
+        Initialize the pacing policy.
+
+        Args:
+            min_delay: Minimum delay between actions in seconds
+            max_delay: Maximum delay between actions in seconds
+            jitter: Maximum extra random variation added to action delays in seconds
+            pauses: Overrides for the named interaction pauses
+            scale: Factor applied to every delay (0 disables all waits)
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.pauses = {**self.DEFAULT_PAUSES, **(pauses or {})}
+        self.scale = scale
+
+    def get_delay(self, multiplier: float = 1.0) -> float:
+        """
+        Get a random delay between actions with natural variation.
+
+        Args:
+            multiplier: Multiplier for the delay range
+
+        Returns:
+            Delay in seconds
+        """
+        base_delay = random.uniform(self.min_delay * multiplier, self.max_delay * multiplier)
+        natural_variation = random.uniform(0, self.jitter)
+        return (base_delay + natural_variation) * self.scale
+
+    def get_pause(self, kind: str) -> float:
+        """
+        Get a random pause for a named interaction.
+
+        Args:
+            kind: Name of the interaction, a key of the pauses table
+
+        Returns:
+            Pause in seconds
+        """
+        low, high = self.pauses[kind]
+        return random.uniform(low, high) * self.scale
+
+    async def wait(self, multiplier: float = 1.0) -> None:
+        """
+        Wait between actions without blocking the event loop.
+
+        Args:
+            multiplier: Multiplier for the delay range
+        """
+        delay = self.get_delay(multiplier)
+        logger.info(f"Waiting for {delay:.2f} seconds...")
+        await asyncio.sleep(delay)
+
+    async def pause(self, kind: str) -> None:
+        """
+        Pause for a named interaction without blocking the event loop.
+
+        Args:
+            kind: Name of the interaction, a key of the pauses table
+        """
+        await asyncio.sleep(self.get_pause(kind))
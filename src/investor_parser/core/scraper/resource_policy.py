@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+
+import re
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Pattern, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Domains that serve the profile pages and their API
+FIRST_PARTY_DOMAINS = ("nfx.com",)
+
+# Analytics and tracking hosts that never carry profile data
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "mixpanel.com",
+    "fullstory.com",
+    "sentry.io",
+    "hubspot.com",
+    "hs-scripts.com",
+    "linkedin.com",
+    "ads-twitter.com",
+)
+
+# Rough transfer size per blocked request, used to estimate bytes saved
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+# File extensions that identify a resource type from its URL alone
+RESOURCE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "mov"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+    "texttrack": ("vtt", "srt"),
+    "manifest": ("webmanifest",),
+}
+
+def _domain_matches(host: str, domains: Tuple[str, ...]) -> bool:
+    """
+    Check if a host is one of the domains or a subdomain of one.
+
+    Args:
+        host: Host name of the request
+        domains: Registered domains to match against
+
+    Returns:
+        True if the host belongs to one of the domains
+    """
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """
+    Rules for which sub-resources the browser may load.
+    """
+    name: str
+    blocked_types: FrozenSet[str] = frozenset()
+    block_third_party: bool = False
+    blocked_domains: Tuple[str, ...] = ()
+    first_party_domains: Tuple[str, ...] = FIRST_PARTY_DOMAINS
+
+    def blocks_anything(self) -> bool:
+        """
+        Check if the policy can block any request at all.
+
+        Returns:
+            True if the policy has any blocking rule
+        """
+        return bool(self.blocked_types or self.block_third_party or self.blocked_domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        Decide whether a request should be aborted.
+
+        Top-level documents are never blocked.
+
+        Args:
+            resource_type: Playwright resource type of the request
+            url: Request URL
+
+        Returns:
+            True if the request should be aborted
+        """
+        if resource_type == "document":
+            return False
+        if resource_type in self.blocked_types:
+            return True
+
+        host = (urlparse(url).hostname or "").lower()
+        if not host:
+            return False
+        if self.blocked_domains and _domain_matches(host, self.blocked_domains):
+            return True
+        if self.block_third_party and not _domain_matches(host, self.first_party_domains):
+            return True
+        return False
+
+    def url_pattern(self) -> Optional[Pattern]:
+        """
+        Get a regex matching the URLs this policy may block.
+
+        The pattern is handed to Playwright, which matches it in the browser
+        driver; only matching requests are sent to Python, where
+        should_block makes the final decision. Resource types that cannot be
+        told from the URL are not matched.
+
+        Returns:
+            Compiled pattern, or None if the policy blocks nothing
+        """
+        return _compile_url_pattern(self)
+
+@lru_cache(maxsize=None)
+def _compile_url_pattern(policy: ResourcePolicy) -> Optional[Pattern]:
+    """
+    Build the URL pattern for a policy. Cached per policy.
+
+    The regex only uses syntax shared by Python and JavaScript, since
+    Playwright evaluates it in the driver.
+
+    Args:
+        policy: Policy to build the pattern for
+
+    Returns:
+        Compiled pattern, or None if the policy blocks nothing
+    """
+    def domains(names: Tuple[str, ...]) -> str:
+        return "|".join(re.escape(name) for name in names)
+
+    alternatives = []
+    extensions = [ext for kind in sorted(policy.blocked_types) for ext in RESOURCE_EXTENSIONS.get(kind, ())]
+    if extensions:
+        alternatives.append(r"^[^?#]*\.(?:%s)(?:[?#]|$)" % "|".join(extensions))
+    if policy.blocked_domains:
+        alternatives.append(r"^[a-z]+://(?:[^/?#]*\.)?(?:%s)(?::\d+)?(?:[/?#]|$)" % domains(policy.blocked_domains))
+    if policy.block_third_party:
+        alternatives.append(
+            r"^https?://(?!(?:[^/?#]*\.)?(?:%s)(?::\d+)?(?:[/?#]|$))" % domains(policy.first_party_domains)
+        )
+
+    if not alternatives:
+        return None
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+RESOURCE_POLICIES: Dict[str, ResourcePolicy] = {
+    # Load everything, as a regular browser would
+    "full": ResourcePolicy(name="full"),
+    # Skip heavy assets and trackers but keep the page styled
+    "no-media": ResourcePolicy(
+        name="no-media",
+        blocked_types=frozenset({"image", "media", "font"}),
+        blocked_domains=TRACKER_DOMAINS,
+    ),
+    # Only what is needed to render the profile data
+    "minimal": ResourcePolicy(
+        name="minimal",
+        blocked_types=frozenset({"image", "media", "font", "stylesheet", "texttrack", "eventsource", "manifest"}),
+        block_third_party=True,
+        blocked_domains=TRACKER_DOMAINS,
+    ),
+}
+
+def get_resource_policy(policy: Union[str, ResourcePolicy, None]) -> ResourcePolicy:
+    """
+    Resolve a policy name to a ResourcePolicy.
+
+    Args:
+        policy: Policy name, policy instance, or None for "full"
+
+    Returns:
+        The matching ResourcePolicy
+    """
+    if policy is None:
+        return RESOURCE_POLICIES["full"]
+    if isinstance(policy, ResourcePolicy):
+        return policy
+    if policy not in RESOURCE_POLICIES:
+        raise ValueError(
+            f"Unknown resource policy: {policy} (choose from {', '.join(RESOURCE_POLICIES)})"
+        )
+    return RESOURCE_POLICIES[policy]
+
+@dataclass
+class ResourceStats:
+    """
+    Per-page counters of blocked and loaded requests.
+    """
+    blocked_requests: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+    estimated_bytes_saved: int = 0
+    loaded_requests: int = 0
+    loaded_bytes: int = 0
+
+    def record_blocked(self, resource_type: str) -> None:
+        """
+        Count an aborted request.
+
+        Args:
+            resource_type: Playwright resource type of the request
+        """
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] += 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_RESOURCE_BYTES["other"])
+
+    def record_loaded(self, content_length: Optional[str]) -> None:
+        """
+        Count a request that reached the network.
+
+        Args:
+            content_length: Value of the response Content-Length header, if any
+        """
+        self.loaded_requests += 1
+        if content_length and content_length.isdigit():
+            self.loaded_bytes += int(content_length)
+
+    def merge(self, other: "ResourceStats") -> None:
+        """
+        Add another page's counters to these.
+
+        Args:
+            other: Stats to add
+        """
+        self.blocked_requests += other.blocked_requests
+        self.blocked_by_type.update(other.blocked_by_type)
+        self.estimated_bytes_saved += other.estimated_bytes_saved
+        self.loaded_requests += other.loaded_requests
+        self.loaded_bytes += other.loaded_bytes
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return {
+            'blocked_requests': self.blocked_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'estimated_bytes_saved': self.estimated_bytes_saved,
+            'loaded_requests': self.loaded_requests,
+            'loaded_bytes': self.loaded_bytes
+        }
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+
+import os
+import time
+import logging
+import itertools
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# off: never; on_failure: only when a scrape fails; sampled: every phase of
+# 1 in N pages plus failures; always: every phase of every page
+SCREENSHOT_MODES = ("off", "on_failure", "sampled", "always")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+class ScreenshotPolicy:
+    """
+    Decides which screenshots are taken and stores them off the hot path.
+
+    The browser still has to encode each image, so the policy keeps that to
+    the pages that need it and defaults to viewport-only JPEGs. Files are
+    written by a single background thread, which also enforces the
+    retention limits by deleting the oldest screenshots.
+    """
+
+    def __init__(
+        self,
+        mode: str = "on_failure",
+        directory: Optional[str] = "data/screenshots",
+        sample_every: int = 20,
+        full_page: bool = False,
+        image_format: str = "jpeg",
+        quality: int = 60,
+        max_files: Optional[int] = 500,
+        max_bytes: Optional[int] = 200 * 1024 * 1024
+    ):
+        """
+        Initialize the screenshot policy.
+
+        Args:
+            mode: One of "off", "on_failure", "sampled" or "always"
+            directory: Directory to save screenshots in, None disables screenshots
+            sample_every: In "sampled" mode, capture 1 in this many pages
+            full_page: Capture the whole scrollable page instead of the viewport
+            image_format: "jpeg" or "png"
+            quality: JPEG quality (0-100), ignored for PNG
+            max_files: Maximum number of screenshots kept on disk, None for no limit
+            max_bytes: Maximum total size of the screenshots on disk, None for no limit
+        """
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"Unknown screenshot mode: {mode} (choose from {', '.join(SCREENSHOT_MODES)})")
+        if image_format not in ("jpeg", "png"):
+            raise ValueError(f"Unknown image format: {image_format} (choose from jpeg, png)")
+
+        self.mode = mode if directory else "off"
+        self.directory = directory
+        self.sample_every = max(1, sample_every)
+        self.full_page = full_page
+        self.image_format = image_format
+        self.quality = quality
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+        # Pages picked for sampling; entries go away with the page
+        self._sampled_pages = weakref.WeakSet()
+        self._page_counter = itertools.count()
+        self._file_counter = itertools.count()
+        self._lock = threading.Lock()
+
+        # Background writer and the files it knows about, oldest first
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._files: Optional[Deque[Tuple[str, int]]] = None
+        self._total_bytes = 0
+
+        # Counters exposed through get_statistics()
+        self.captured = 0
+        self.failed = 0
+        self.deleted = 0
+        self.bytes_written = 0
+
+        if self.mode != "off":
+            os.makedirs(self.directory, exist_ok=True)
+
+    def start_page(self, page: Any) -> None:
+        """
+        Register a new page and decide whether it is sampled.
+
+        Args:
+            page: Playwright page instance
+        """
+        if self.mode == "always":
+            self._sampled_pages.add(page)
+        elif self.mode == "sampled":
+            with self._lock:
+                index = next(self._page_counter)
+            if index % self.sample_every == 0:
+                self._sampled_pages.add(page)
+
+    def wants(self, page: Any, failure: bool = False) -> bool:
+        """
+        Check whether a screenshot should be taken.
+
+        Args:
+            page: Playwright page instance
+            failure: True if the screenshot documents a failure
+
+        Returns:
+            True if a screenshot should be taken
+        """
+        if self.mode == "off":
+            return False
+        if failure:
+            return True
+        return page in self._sampled_pages
+
+    async def capture(self, page: Any, name: str, failure: bool = False) -> Optional[str]:
+        """
+        Take a screenshot if the policy wants one and queue it for writing.
+
+        Screenshot errors are logged and never fail the scrape.
+
+        Args:
+            page: Playwright page instance
+            name: Name for the screenshot file
+            failure: True if the screenshot documents a failure
+
+        Returns:
+            Path the screenshot will be written to, or None if none was taken
+        """
+        if not self.wants(page, failure):
+            return None
+
+        options: Dict[str, Any] = {"full_page": self.full_page, "type": self.image_format}
+        if self.image_format == "jpeg":
+            options["quality"] = self.quality
+
+        try:
+            data = await page.screenshot(**options)
+        except Exception as e:
+            self.failed += 1
+            logger.debug(f"Could not take screenshot {name}: {str(e)}")
+            return None
+
+        extension = "jpg" if self.image_format == "jpeg" else "png"
+        filename = f"{name}_{int(time.time() * 1000)}_{next(self._file_counter)}.{extension}"
+        filepath = os.path.join(self.directory, filename)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshots")
+            self._pending = [future for future in self._pending if not future.done()]
+            self._pending.append(self._executor.submit(self._write, filepath, data))
+
+        self.captured += 1
+        logger.info(f"Screenshot queued for {filepath}")
+        return filepath
+
+    def _load_existing(self) -> None:
+        """Index screenshots already on disk, oldest first. Runs on the writer thread."""
+        existing = []
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    existing.append((stat.st_mtime, entry.path, stat.st_size))
+        except OSError as e:
+            logger.debug(f"Could not list screenshots: {str(e)}")
+
+        existing.sort()
+        self._files = deque((path, size) for _, path, size in existing)
+        self._total_bytes = sum(size for _, size in self._files)
+
+    def _write(self, filepath: str, data: bytes) -> None:
+        """
+        Write a screenshot and apply the retention limits. Runs on the writer thread.
+
+        Args:
+            filepath: Destination path
+            data: Encoded image
+        """
+        if self._files is None:
+            self._load_existing()
+
+        try:
+            with open(filepath, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            self.failed += 1
+            logger.warning(f"Could not write screenshot {filepath}: {str(e)}")
+            return
+
+        self._files.append((filepath, len(data)))
+        self._total_bytes += len(data)
+        self.bytes_written += len(data)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest screenshots until the retention limits hold."""
+        while self._files and (
+            (self.max_files is not None and len(self._files) > self.max_files) or
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            path, size = self._files.popleft()
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+                self.deleted += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Could not delete screenshot {path}: {str(e)}")
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for queued screenshots to be written.
+
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait for all
+        """
+        with self._lock:
+            pending = list(self._pending)
+            self._pending = []
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the screenshots taken.
+
+        Returns:
+            Dictionary with capture, failure and retention counters
+        """
+        return {
+            'mode': self.mode,
+            'captured': self.captured,
+            'failed': self.failed,
+            'deleted': self.deleted,
+            'bytes_written': self.bytes_written,
+            'files_kept': len(self._files) if self._files is not None else None,
+            'bytes_kept': self._total_bytes if self._files is not None else None
+        }
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import time
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+class PhaseTimer:
+    """
+    Records how long each phase of a page scrape takes.
+    """
+
+    def __init__(self, label: str):
+        """
+        Initialize the timer and start the clock.
+
+        Args:
+            label: Label used when logging, usually the URL
+        """
+        self.label = label
+        self.phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    def mark(self, phase: str) -> float:
+        """
+        End the current phase and start the next one.
+
+        Args:
+            phase: Name of the phase that just finished
+
+        Returns:
+            Duration of the phase in seconds
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    def total(self) -> float:
+        """
+        Get the time since the timer was started.
+
+        Returns:
+            Elapsed time in seconds
+        """
+        return time.perf_counter() - self._started
+
+    def summary(self) -> str:
+        """
+        Format the phase durations on one line.
+
+        Returns:
+            Summary string, e.g. "navigate=1.20s ready=0.31s total=1.51s"
+        """
+        parts = [f"{phase}={elapsed:.2f}s" for phase, elapsed in self.phases.items()]
+        parts.append(f"total={self.total():.2f}s")
+        return " ".join(parts)
+
+    def log(self) -> None:
+        """Log the phase durations."""
+        logger.info(f"Timings for {self.label}: {self.summary()}")
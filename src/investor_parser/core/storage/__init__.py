@@ -0,0 +1,12 @@
+"""
+Storage of scraped profile pages.
+"""
+
+from src.investor_parser.core.storage.layout import page_name, resolve_page_path, store_root, iter_shard_files, migrate_flat_layout
+from src.investor_parser.core.storage.html_store import HTMLStore, StoredPage, COMPRESSIONS, ZSTD_AVAILABLE
+from src.investor_parser.core.storage.page_archive import PageArchive, PAGE_STORES, open_page_store
+from src.investor_parser.core.storage.manifest import PageManifest, ManifestEntry, find_missing_pages, read_url_file
+from src.investor_parser.core.storage.write_behind import WriteBehind
+from src.investor_parser.core.storage.migration import MigrationJournal, TRANSFER_METHODS, transfer_files, migrate_legacy_pages
+
+__all__ = ['HTMLStore', 'StoredPage', 'COMPRESSIONS', 'ZSTD_AVAILABLE', 'page_name', 'resolve_page_path', 'store_root', 'iter_shard_files', 'migrate_flat_layout', 'PageArchive', 'PAGE_STORES', 'open_page_store', 'PageManifest', 'ManifestEntry', 'find_missing_pages', 'read_url_file', 'WriteBehind', 'MigrationJournal', 'TRANSFER_METHODS', 'transfer_files', 'migrate_legacy_pages']
@@ -0,0 +1,774 @@
+#!/usr/bin/env python
+
+import io
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from src.investor_parser.core.page_format import get_graphql_filename
+from src.investor_parser.core.storage.layout import (
+    OBJECT_SHARD_LEVELS, WALK_WORKERS, page_name, shard_dirs, resolve_page_path, iter_shard_files, migrate_flat_layout
+)
+
+# Import zstandard - we'll fall back to gzip if it is not installed
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Locks the index journal across processes; not available on Windows, where only threads are coordinated
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ("zstd", "gzip", "none")
+DEFAULT_COMPRESSION = "zstd" if ZSTD_AVAILABLE else "gzip"
+
+# Suffix of the stored object for each compression
+OBJECT_SUFFIXES = {"zstd": ".html.zst", "gzip": ".html.gz", "none": ".html"}
+
+OBJECTS_DIRNAME = "objects"
+INDEX_FILENAME = "index.json"
+INDEX_JOURNAL_FILENAME = "index.jsonl"
+INDEX_LOCK_FILENAME = ".index.lock"
+
+# The journal is folded into index.json once it holds this many times more lines than pages
+COMPACT_RATIO = 2.0
+COMPACT_MIN_LINES = 1000
+
+# Threads reading pages ahead of the consumer in iter_pages()
+READ_WORKERS = 4
+
+@dataclass
+class StoredPage:
+    """
+    Index entry of a page in the HTML store.
+    """
+    name: str
+    digest: str  # sha256 of the UTF-8 body
+    size: int  # bytes before compression
+    stored_size: int  # bytes of the compressed object
+    compression: str  # zstd, gzip, none
+    stored_at: str
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StoredPage':
+        """Create from dictionary."""
+        return cls(**data)
+
+def sync_directory(directory: str) -> None:
+    """
+    Make the renames into a directory durable.
+
+    Args:
+        directory: Directory whose entries changed
+    """
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class _DigestWriter(io.RawIOBase):
+    """
+    Byte sink that hashes and counts everything written through it.
+    """
+
+    def __init__(self, sink: BinaryIO):
+        """
+        Initialize the writer.
+
+        Args:
+            sink: Stream the bytes are passed on to, e.g. a compressor
+        """
+        self.sink = sink
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        self.size += len(data)
+        self.sink.write(data)
+        return len(data)
+
+class HTMLStore:
+    """
+    Compressed, content-addressed store for scraped profile pages.
+
+    Every body is written once under objects/<ab>/<sha256><suffix>,
+    compressed with zstd (if installed) or gzip; pages with an identical
+    body share the object. index.json maps page names to their object.
+    Each stored page appends one line to index.jsonl instead of rewriting
+    it, under a lock file shared by all processes writing to the store,
+    and lines written by other processes are read when a page is not
+    found. The journal is folded into index.json, which is replaced
+    atomically, by save_index(), close() or once it grows large.
+
+    Pages keep their familiar names ("investors-jane-doe.html") and a
+    logical path in the sharded layout (see resolve_page_path()), which is
+    what the URL queue records and where GraphQL sidecar files are kept.
+    Plain .html files left by older runs, flat or sharded, are still
+    readable until migrate_layout() moves them.
+    """
+
+    def __init__(self, root: str = "data/html", compression: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory of the store
+            compression: "zstd", "gzip" or "none" for new pages (default: zstd if installed, else gzip)
+
+        Raises:
+            ValueError: If the compression is unknown or zstd is not installed
+        """
+        compression = compression or DEFAULT_COMPRESSION
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression needs the zstandard package")
+
+        self.root = root
+        self.compression = compression
+        self.objects_dir = os.path.join(root, OBJECTS_DIRNAME)
+        self.index_path = os.path.join(root, INDEX_FILENAME)
+        self.journal_path = os.path.join(root, INDEX_JOURNAL_FILENAME)
+        self.lock_path = os.path.join(root, INDEX_LOCK_FILENAME)
+        self._lock = threading.RLock()
+
+        # Entries written with save_index=False, kept until the next save_index()
+        self._pending: Dict[str, StoredPage] = {}
+
+        # Part of the journal applied so far: file identity, bytes and lines
+        self._journal_id: Optional[Tuple[int, int]] = None
+        self._journal_offset = 0
+        self._journal_lines = 0
+        self._lock_depth = 0  # nesting of _index_lock() in the thread holding it
+
+        # Counters exposed through get_statistics()
+        self.written = 0
+        self.deduplicated = 0
+
+        # Plain files by page name, listed on first use
+        self._loose: Optional[Dict[str, str]] = None
+
+        # Directories are created on the first write, so legacy directories can be read as they are
+        self._pages: Dict[str, StoredPage] = self._load_index()
+        self._read_journal()
+
+    def _load_index(self) -> Dict[str, StoredPage]:
+        """
+        Read the page index snapshot.
+
+        Returns:
+            Dictionary of page name to index entry, empty if there is none
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read HTML store index {self.index_path}: {str(e)}")
+            return {}
+        return {name: StoredPage.from_dict(entry) for name, entry in data.get("pages", {}).items()}
+
+    def _read_journal(self) -> None:
+        """
+        Apply the journal lines written since the last read, by this or other processes.
+
+        A partial last line, from a write in progress or a crash, is left
+        for the next read.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.journal_path)
+            except FileNotFoundError:
+                return
+            journal_id = (stat.st_dev, stat.st_ino)
+            if journal_id != self._journal_id:
+                if self._journal_id is not None:
+                    # Another process folded the journal into index.json
+                    self._pages = self._load_index()
+                    self._pages.update(self._pending)
+                self._journal_id = journal_id
+                self._journal_offset = 0
+                self._journal_lines = 0
+            if stat.st_size <= self._journal_offset:
+                return
+
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    page = StoredPage.from_dict(json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable line of {self.journal_path}: {str(e)}")
+                    continue
+                self._pages[page.name] = page
+                self._journal_lines += 1
+            self._journal_offset += complete
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        """Hold the index lock of the store across threads and processes; re-entrant."""
+        with self._lock:
+            if fcntl is None or self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            os.makedirs(self.root, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+            finally:
+                # Closing the file releases the lock
+                os.close(fd)
+
+    def _append_index(self, pages: List[StoredPage], sync: bool = False) -> None:
+        """
+        Append index entries to the journal with a single write.
+
+        Args:
+            pages: Entries to append
+            sync: Return only once the entries are on disk
+        """
+        data = "".join(json.dumps(page.to_dict()) + "\n" for page in pages).encode("utf-8")
+        with self._index_lock():
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    # Start on a fresh line after a partial one left by a crash
+                    data = b"\n" + data
+                os.write(fd, data)
+                if sync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            if sync and not size:
+                sync_directory(self.root)
+            self._read_journal()
+
+            if self._journal_lines >= COMPACT_MIN_LINES and self._journal_lines > COMPACT_RATIO * len(self._pages):
+                self.save_index(sync)
+
+    def save_index(self, sync: bool = False) -> None:
+        """
+        Fold the journal and pending entries into index.json and start a new journal.
+
+        Entries other processes appended meanwhile are read first, so none
+        are lost. Readers never see a partial file.
+
+        Args:
+            sync: Return only once the index is on disk
+        """
+        with self._index_lock():
+            self._read_journal()
+            if not self._pending and not self._journal_lines and os.path.exists(self.index_path):
+                return
+            data = {"version": 1, "pages": {name: page.to_dict() for name, page in self._pages.items()}}
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".index-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, self.index_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            # A new, empty journal; readers of the old one notice the changed file and reload index.json
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".index-", suffix=".tmp")
+            os.close(fd)
+            os.replace(tmp_path, self.journal_path)
+            if sync:
+                sync_directory(self.root)
+            stat = os.stat(self.journal_path)
+            self._journal_id = (stat.st_dev, stat.st_ino)
+            self._journal_offset = 0
+            self._journal_lines = 0
+            self._pending = {}
+
+    def close(self) -> None:
+        """Fold the journal into index.json."""
+        if self._pending or self._journal_lines:
+            self.save_index(sync=True)
+
+    def path(self, name: str) -> str:
+        """
+        Get the logical path of a page.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            Sharded path of the page under the store directory
+        """
+        return resolve_page_path(name, self.root)
+
+    def _object_path(self, digest: str, compression: str) -> str:
+        """
+        Get the path of a stored object.
+
+        Args:
+            digest: sha256 of the page body
+            compression: Compression of the object
+
+        Returns:
+            Object path
+        """
+        return os.path.join(self.objects_dir, shard_dirs(digest, OBJECT_SHARD_LEVELS),
+                            f"{digest}{OBJECT_SUFFIXES[compression]}")
+
+    def _find_object(self, digest: str) -> Optional[Tuple[str, str]]:
+        """
+        Find an existing object for a body, in any compression.
+
+        Args:
+            digest: sha256 of the page body
+
+        Returns:
+            Tuple of (path, compression), or None
+        """
+        for compression in (self.compression,) + tuple(c for c in COMPRESSIONS if c != self.compression):
+            path = self._object_path(digest, compression)
+            if os.path.exists(path):
+                return path, compression
+        return None
+
+    def _compressor(self, raw: BinaryIO) -> BinaryIO:
+        """
+        Wrap a file in a compressing stream.
+
+        Args:
+            raw: File opened for binary writing
+
+        Returns:
+            Writable stream; closing it does not close the file
+        """
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+        return raw
+
+    @contextmanager
+    def writer(self, name: str, save_index: bool = True, sync: bool = False) -> Iterator[TextIO]:
+        """
+        Stream a page into the store.
+
+        The body is compressed and hashed while it is written. When the
+        block exits, the object is moved into place unless an identical one
+        exists, and the page is added to the index. Nothing is stored if
+        the block raises.
+
+        Args:
+            name: Page name or path
+            save_index: Append the page to the index journal right away; pass False for bulk imports and call save_index()
+            sync: Return only once the object and its index entry are on disk
+
+        Yields:
+            Text stream to write the HTML to
+        """
+        name = page_name(name)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".page-", suffix=".tmp")
+        raw = os.fdopen(fd, "wb")
+        try:
+            compressor = self._compressor(raw)
+            digest_writer = _DigestWriter(compressor)
+            text = io.TextIOWrapper(io.BufferedWriter(digest_writer), encoding="utf-8")
+            try:
+                yield text
+                text.flush()
+                if sync:
+                    # The compressed trailer has to be written before syncing
+                    if compressor is not raw:
+                        compressor.close()
+                    raw.flush()
+                    os.fsync(raw.fileno())
+            finally:
+                # Close in order so nothing is flushed into a closed file later
+                text.close()
+                if compressor is not raw and not compressor.closed:
+                    compressor.close()
+                raw.close()
+            digest = digest_writer.hash.hexdigest()
+
+            with self._lock:
+                existing = self._find_object(digest)
+                if existing is not None:
+                    os.remove(tmp_path)
+                    object_path, compression = existing
+                    self.deduplicated += 1
+                else:
+                    object_path, compression = self._object_path(digest, self.compression), self.compression
+                    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                    os.replace(tmp_path, object_path)
+                    if sync:
+                        sync_directory(os.path.dirname(object_path))
+
+                page = StoredPage(
+                    name=name,
+                    digest=digest,
+                    size=digest_writer.size,
+                    stored_size=os.path.getsize(object_path),
+                    compression=compression,
+                    stored_at=datetime.now().isoformat()
+                )
+                self._pages[name] = page
+                self.written += 1
+                if save_index:
+                    self._append_index([page], sync)
+                else:
+                    self._pending[name] = page
+        finally:
+            raw.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put(self, name: str, html: str, save_index: bool = True, sync: bool = False) -> str:
+        """
+        Store a page.
+
+        Args:
+            name: Page name or path
+            html: HTML content
+            save_index: Append the page to the index journal right away
+            sync: Return only once the page is on disk
+
+        Returns:
+            Logical path of the page
+        """
+        with self.writer(name, save_index, sync) as f:
+            f.write(html)
+        return self.path(name)
+
+    def import_file(self, source_path: str, name: Optional[str] = None, save_index: bool = True) -> str:
+        """
+        Stream a plain HTML file into the store.
+
+        Args:
+            source_path: HTML file to import
+            name: Page name (default: the file name)
+            save_index: Append the page to the index journal right away
+
+        Returns:
+            Logical path of the page
+        """
+        name = name or page_name(source_path)
+        with open(source_path, "r", encoding="utf-8") as src, self.writer(name, save_index) as dst:
+            for chunk in iter(lambda: src.read(1 << 16), ""):
+                dst.write(chunk)
+        return self.path(name)
+
+    def put_payloads(self, name: str, payloads: List[Dict[str, Any]], sync: bool = False) -> str:
+        """
+        Store the GraphQL responses captured with a page, in a file next to it.
+
+        Args:
+            name: Page name or path
+            payloads: GraphQL response bodies
+            sync: Return only once the file is on disk
+
+        Returns:
+            Path of the GraphQL file
+        """
+        payload_path = get_graphql_filename(self.path(name))
+        os.makedirs(os.path.dirname(payload_path), exist_ok=True)
+        with open(payload_path, "w", encoding="utf-8") as f:
+            json.dump(payloads, f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        return payload_path
+
+    def get_payloads(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the GraphQL responses captured with a page.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            List of GraphQL response bodies, or None if there are none
+        """
+        for path in (self.path(name), os.path.join(self.root, page_name(name))):
+            payload_path = get_graphql_filename(path)
+            try:
+                with open(payload_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load GraphQL payloads from {payload_path}: {str(e)}")
+                return None
+        return None
+
+    def _loose_path(self, name: str) -> Optional[str]:
+        """
+        Get the plain file an older run left for a page, if any.
+
+        Args:
+            name: Page name
+
+        Returns:
+            File path, sharded before flat, or None
+        """
+        for path in (self.path(name), os.path.join(self.root, page_name(name))):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def loose_files(self) -> Dict[str, str]:
+        """
+        Get the plain .html files in the store directory.
+
+        The directory and its shards are listed once per store instance,
+        the shards in parallel.
+
+        Returns:
+            Dictionary of page name to file path; sharded files win over flat ones
+        """
+        with self._lock:
+            if self._loose is None:
+                loose = {}
+                try:
+                    with os.scandir(self.root) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(".html") and entry.is_file():
+                                loose[entry.name] = entry.path
+                except FileNotFoundError:
+                    pass
+                for path in iter_shard_files(self.root, ".html"):
+                    loose[os.path.basename(path)] = path
+                self._loose = loose
+            return self._loose
+
+    def rescan_loose_files(self) -> None:
+        """Forget the listing of plain files, so files placed by other means are seen."""
+        with self._lock:
+            self._loose = None
+
+    def exists(self, name: str) -> bool:
+        """
+        Check if a page is stored.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            True if the page can be read
+        """
+        name = page_name(name)
+        if name not in self._pages:
+            self._read_journal()
+        return name in self._pages or self._loose_path(name) is not None
+
+    def open(self, name: str) -> TextIO:
+        """
+        Open a page for streaming reads.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            Text stream of the HTML; the caller closes it
+
+        Raises:
+            FileNotFoundError: If the page is not stored
+        """
+        name = page_name(name)
+        page = self._pages.get(name)
+        if page is None:
+            self._read_journal()
+            page = self._pages.get(name)
+        if page is None:
+            loose_path = self._loose_path(name)
+            if loose_path is None:
+                raise FileNotFoundError(f"Page not in the HTML store: {name}")
+            return open(loose_path, "r", encoding="utf-8")
+
+        raw = open(self._object_path(page.digest, page.compression), "rb")
+        if page.compression == "zstd":
+            return io.TextIOWrapper(io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw)), encoding="utf-8")
+        if page.compression == "gzip":
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="rb"), encoding="utf-8")
+        return io.TextIOWrapper(raw, encoding="utf-8")
+
+    def get(self, name: str) -> str:
+        """
+        Read a whole page.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            HTML content
+
+        Raises:
+            FileNotFoundError: If the page is not stored
+        """
+        with self.open(name) as f:
+            return f.read()
+
+    def names(self) -> List[str]:
+        """
+        Get the names of all stored pages, including plain files from older runs.
+
+        Returns:
+            Sorted list of page names
+        """
+        with self._lock:
+            self._read_journal()
+            return sorted(set(self._pages) | set(self.loose_files()))
+
+    def iter_pages(self, workers: int = READ_WORKERS) -> Iterator[Tuple[str, str]]:
+        """
+        Read every stored page, in name order.
+
+        A thread pool reads and decompresses a bounded number of pages
+        ahead of the consumer, so only a few pages are held in memory.
+        Pages that cannot be read are logged and skipped.
+
+        Args:
+            workers: Threads reading pages; 1 reads them one at a time
+
+        Yields:
+            Tuples of (logical path, HTML content)
+        """
+        names = self.names()
+        if workers <= 1:
+            for name in names:
+                try:
+                    yield self.path(name), self.get(name)
+                except (OSError, EOFError, ValueError) as e:
+                    logger.error(f"Could not read {name} from the HTML store: {str(e)}")
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            ahead = deque()
+            names_left = iter(names)
+            while True:
+                while len(ahead) < workers * 2:
+                    name = next(names_left, None)
+                    if name is None:
+                        break
+                    ahead.append((name, pool.submit(self.get, name)))
+                if not ahead:
+                    return
+                name, future = ahead.popleft()
+                try:
+                    html = future.result()
+                except (OSError, EOFError, ValueError) as e:
+                    logger.error(f"Could not read {name} from the HTML store: {str(e)}")
+                    continue
+                yield self.path(name), html
+
+    def import_loose_files(self, remove: bool = True) -> int:
+        """
+        Move plain .html files from older runs into the store.
+
+        Args:
+            remove: Delete each plain file once it is stored
+
+        Returns:
+            Number of files imported
+        """
+        imported = 0
+        with self._lock:
+            loose = [(name, path) for name, path in self.loose_files().items() if name not in self._pages]
+            for name, loose_path in loose:
+                try:
+                    with open(loose_path, "r", encoding="utf-8") as src, self.writer(name, save_index=False) as dst:
+                        for chunk in iter(lambda: src.read(1 << 16), ""):
+                            dst.write(chunk)
+                except Exception as e:
+                    logger.error(f"Error importing {loose_path}: {str(e)}")
+                    continue
+                if remove:
+                    os.remove(loose_path)
+                imported += 1
+            if imported:
+                self.save_index()
+            self._loose = None
+        logger.info(f"Imported {imported} plain HTML files into {self.root}")
+        return imported
+
+    def migrate_layout(self, workers: int = WALK_WORKERS) -> Dict[str, int]:
+        """
+        Move plain pages and GraphQL sidecars of the older flat layout into shards.
+
+        Args:
+            workers: Threads moving files
+
+        Returns:
+            Dictionary with the number of files moved and skipped
+        """
+        with self._lock:
+            stats = migrate_flat_layout(self.root, workers)
+            self._loose = None
+        return stats
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the store.
+
+        Returns:
+            Dictionary with page and object counts, sizes and counters
+        """
+        with self._lock:
+            self._read_journal()
+            pages = list(self._pages.values())
+        objects = {(page.digest, page.compression): page.stored_size for page in pages}
+        raw_bytes = sum(page.size for page in pages)
+        stored_bytes = sum(objects.values())
+        return {
+            'pages': len(pages),
+            'objects': len(objects),
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'ratio': round(stored_bytes / raw_bytes, 3) if raw_bytes else None,
+            'compression': self.compression,
+            'written': self.written,
+            'deduplicated': self.deduplicated
+        }
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Directory layout of the page stores.
+
+Every file kept per page (plain HTML, GraphQL responses) lives two
+hash-prefix levels below the store directory, e.g.
+data/html/3f/a2/investors-jane-doe.html, so no directory grows past a few
+hundred entries however large the corpus gets. Compressed objects are
+deduplicated and fewer, so they stay one level deep by their content
+digest, e.g. data/html/objects/9c/<sha256>.html.gz.
+"""
+
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from src.investor_parser.core.page_format import get_graphql_filename
+
+logger = logging.getLogger(__name__)
+
+# Two levels of two hex digits: 65,536 leaf directories
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+# Objects only need 256 directories
+OBJECT_SHARD_LEVELS = 1
+
+# Threads listing shards or moving files; directory operations wait on the filesystem, not the GIL
+WALK_WORKERS = 8
+
+GRAPHQL_SUFFIX = ".graphql.json"
+
+def page_name(name_or_path: str) -> str:
+    """
+    Get the store key of a page.
+
+    Args:
+        name_or_path: Page file name or any path ending in it
+
+    Returns:
+        File name, e.g. "investors-jane-doe.html"
+    """
+    return os.path.basename(name_or_path)
+
+def shard_dirs(key: str, levels: int = SHARD_LEVELS) -> str:
+    """
+    Get the shard directories of a hex key.
+
+    Args:
+        key: Hex digest
+        levels: Number of shard levels
+
+    Returns:
+        Relative directory, e.g. "3f/a2"
+    """
+    return os.path.join(*(key[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH] for level in range(levels)))
+
+def page_shard(name: str) -> str:
+    """
+    Get the shard directories of a page.
+
+    Args:
+        name: Page name or path
+
+    Returns:
+        Relative directory derived from the hash of the page name
+    """
+    return shard_dirs(hashlib.sha256(page_name(name).encode("utf-8")).hexdigest())
+
+def resolve_page_path(name: str, root: str = "data/html") -> str:
+    """
+    Get the path of a page in a store directory.
+
+    This is where the page's plain file and GraphQL responses are kept and
+    the path the URL queue and the manifest record for it.
+
+    Args:
+        name: Page name or path
+        root: Store directory
+
+    Returns:
+        Path of the page, e.g. data/html/3f/a2/investors-jane-doe.html
+    """
+    return os.path.join(root, page_shard(name), page_name(name))
+
+def is_shard_dir(dirname: str) -> bool:
+    """
+    Check if a directory name is a shard level.
+
+    Args:
+        dirname: Directory name
+
+    Returns:
+        True for names of SHARD_WIDTH hex digits
+    """
+    return len(dirname) == SHARD_WIDTH and all(c in "0123456789abcdef" for c in dirname)
+
+def store_root(path: str) -> str:
+    """
+    Get the store directory of a page path, flat or sharded.
+
+    Args:
+        path: Path of a page
+
+    Returns:
+        Directory of the store the page belongs to
+    """
+    directory = os.path.dirname(path)
+    parts = directory.split(os.sep)
+    if len(parts) >= SHARD_LEVELS and all(is_shard_dir(part) for part in parts[-SHARD_LEVELS:]):
+        directory = os.sep.join(parts[:-SHARD_LEVELS])
+    return directory
+
+def _list_shard(path: str, depth: int, suffix: str) -> List[str]:
+    """
+    List the files below one shard directory.
+
+    Args:
+        path: Shard directory
+        depth: Shard levels below it
+        suffix: File name suffix to match
+
+    Returns:
+        File paths, sorted
+    """
+    files = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if depth and entry.is_dir() and is_shard_dir(entry.name):
+                    files.extend(_list_shard(entry.path, depth - 1, suffix))
+                elif not depth and entry.name.endswith(suffix) and entry.is_file():
+                    files.append(entry.path)
+    except FileNotFoundError:
+        pass
+    return sorted(files)
+
+def iter_shard_files(root: str, suffix: str = ".html", workers: int = WALK_WORKERS) -> Iterator[str]:
+    """
+    Walk the shards of a store directory in parallel.
+
+    Top-level shards are listed by a thread pool and their files are
+    yielded as soon as each one is done, in shard order.
+
+    Args:
+        root: Store directory
+        suffix: File name suffix to match
+        workers: Threads listing shards
+
+    Yields:
+        Paths of the files in the shards
+    """
+    try:
+        with os.scandir(root) as entries:
+            top = sorted(entry.path for entry in entries if entry.is_dir() and is_shard_dir(entry.name))
+    except FileNotFoundError:
+        return
+    if not top:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for files in pool.map(lambda path: _list_shard(path, SHARD_LEVELS - 1, suffix), top):
+            yield from files
+
+def _move(source: str, target: str) -> bool:
+    """
+    Move a file into its shard.
+
+    Args:
+        source: Current path
+        target: Sharded path
+
+    Returns:
+        True if the file was moved
+    """
+    if os.path.exists(target):
+        logger.warning(f"Not moving {source}: {target} already exists")
+        return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(source, target)
+    return True
+
+def plan_flat_moves(root: str) -> List[Tuple[str, str]]:
+    """
+    Find the files of a store directory that are not sharded yet.
+
+    Args:
+        root: Store directory
+
+    Returns:
+        List of (source, target) moves
+    """
+    moves = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(GRAPHQL_SUFFIX):
+                    page = entry.name[:-len(GRAPHQL_SUFFIX)] + ".html"
+                    moves.append((entry.path, get_graphql_filename(resolve_page_path(page, root))))
+                elif entry.name.endswith(".html"):
+                    moves.append((entry.path, resolve_page_path(entry.name, root)))
+    except FileNotFoundError:
+        return []
+    return moves
+
+def migrate_flat_layout(root: str, workers: int = WALK_WORKERS) -> Dict[str, int]:
+    """
+    Move the files of a flat store directory into shards.
+
+    Each file is renamed on its own, so an interrupted migration is
+    finished by running it again; both layouts are readable meanwhile.
+
+    Args:
+        root: Store directory
+        workers: Threads moving files
+
+    Returns:
+        Dictionary with the number of files moved and skipped
+    """
+    moves = plan_flat_moves(root)
+    stats = {"moved": 0, "skipped": 0, "failed": 0}
+    if not moves:
+        return stats
+
+    def move(plan: Tuple[str, str]) -> str:
+        try:
+            return "moved" if _move(*plan) else "skipped"
+        except OSError as e:
+            logger.error(f"Error moving {plan[0]} to {plan[1]}: {str(e)}")
+            return "failed"
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for outcome in pool.map(move, moves):
+            stats[outcome] += 1
+    logger.info(f"Sharded {root}: {stats}")
+    return stats
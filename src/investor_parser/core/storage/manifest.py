@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.investor_parser.core.page_format import page_slug, page_filename
+from src.investor_parser.core.storage.html_store import HTMLStore
+from src.investor_parser.core.storage.page_archive import open_page_store
+
+logger = logging.getLogger(__name__)
+
+# The journal is compacted once it holds this many times more lines than pages
+COMPACT_RATIO = 2.0
+COMPACT_MIN_LINES = 1000
+
+@dataclass
+class ManifestEntry:
+    """
+    What is known about the saved page of one profile.
+    """
+    slug: str
+    url: str
+    path: str  # logical path in the page store
+    size: int  # bytes of the UTF-8 HTML
+    digest: Optional[str] = None  # sha256 of the UTF-8 HTML
+    fetched_at: Optional[str] = None
+    route: Optional[str] = None  # static, browser
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ManifestEntry':
+        """Create from dictionary."""
+        return cls(**data)
+
+def read_url_file(url_file: str) -> List[str]:
+    """
+    Read the profile URLs of a URL file.
+
+    Lines are either a URL or "name,url"; blank lines and # comments are skipped.
+
+    Args:
+        url_file: Path to the URL file
+
+    Returns:
+        List of URLs in file order
+    """
+    urls = []
+    with open(url_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split(",", 1)
+            urls.append(parts[-1].strip())
+    return urls
+
+class PageManifest:
+    """
+    Persistent index of every saved profile page, keyed by slug.
+
+    Each save appends one JSON line to the journal with a single write, so
+    a crash can at most lose a torn last line, which is ignored on load.
+    Later lines override earlier ones; once the journal holds mostly
+    superseded lines it is rewritten with one line per page and swapped in
+    atomically.
+
+    Missing and stale pages are found by looking up URL slugs instead of
+    listing the page directories.
+    """
+
+    def __init__(self, path: str = "data/html/manifest.jsonl"):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: Path to the JSONL journal
+        """
+        self.path = path
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._lines = 0
+        self._torn = False  # the journal ends in a partial line
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        """Replay the journal."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                self._torn = not line.endswith("\n")
+                if not line.strip():
+                    continue
+                try:
+                    entry = ManifestEntry.from_dict(json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable line {number} of {self.path}: {str(e)}")
+                    continue
+                self._entries[entry.slug] = entry
+                self._lines += 1
+
+    def record(self, entry: ManifestEntry) -> None:
+        """
+        Add or replace the entry of a page.
+
+        Args:
+            entry: Entry to record
+        """
+        line = json.dumps(entry.to_dict()) + "\n"
+        with self._lock:
+            if self._torn:
+                # Start on a fresh line after a partial one left by a crash
+                line = "\n" + line
+                self._torn = False
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+            self._entries[entry.slug] = entry
+            self._lines += 1
+
+            if self._lines >= COMPACT_MIN_LINES and self._lines > COMPACT_RATIO * len(self._entries):
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per page."""
+        with self._lock:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    for entry in self._entries.values():
+                        f.write(json.dumps(entry.to_dict()) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            logger.info(f"Compacted {self.path} from {self._lines} to {len(self._entries)} lines")
+            self._lines = len(self._entries)
+
+    def get(self, slug: str) -> Optional[ManifestEntry]:
+        """
+        Get the entry of a page.
+
+        Args:
+            slug: Page slug
+
+        Returns:
+            Entry, or None if no page was saved for the slug
+        """
+        return self._entries.get(slug)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find_missing(self, urls: Sequence[str]) -> List[str]:
+        """
+        Get the URLs whose page was never saved.
+
+        Args:
+            urls: Profile URLs
+
+        Returns:
+            URLs without an entry, in the given order
+        """
+        return [url for url in urls if page_slug(url) not in self._entries]
+
+    def find_stale(self, urls: Sequence[str], max_age_days: float) -> List[str]:
+        """
+        Get the URLs whose page was saved longer ago than a maximum age.
+
+        Pages with an unknown fetch time are not considered stale.
+
+        Args:
+            urls: Profile URLs
+            max_age_days: Maximum page age in days
+
+        Returns:
+            URLs with an old entry, in the given order
+        """
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        stale = []
+        for url in urls:
+            entry = self._entries.get(page_slug(url))
+            if entry is not None and entry.fetched_at and entry.fetched_at < cutoff:
+                stale.append(url)
+        return stale
+
+    def rebuild(self, urls: Sequence[str], stores: Sequence[Any]) -> int:
+        """
+        Add entries for pages saved before the manifest existed.
+
+        Args:
+            urls: Profile URLs
+            stores: Page stores to look for the pages in, in order of preference
+
+        Returns:
+            Number of entries added
+        """
+        added = 0
+        with self._lock:
+            for url in urls:
+                slug = page_slug(url)
+                if not slug or slug in self._entries:
+                    continue
+                name = page_filename(slug)
+                store = next((store for store in stores if store.exists(name)), None)
+                if store is None:
+                    continue
+                try:
+                    size = len(store.get(name).encode("utf-8"))
+                except (OSError, EOFError, ValueError) as e:
+                    logger.error(f"Could not read {name} while rebuilding the manifest: {str(e)}")
+                    continue
+                self.record(ManifestEntry(slug=slug, url=url, path=store.path(name), size=size))
+                added += 1
+        logger.info(f"Added {added} pages saved before the manifest to {self.path}")
+        return added
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the manifest.
+
+        Returns:
+            Dictionary with page counts by route, total size and journal length
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        routes: Dict[str, int] = {}
+        for entry in entries:
+            routes[entry.route or "unknown"] = routes.get(entry.route or "unknown", 0) + 1
+        return {
+            'pages': len(entries),
+            'bytes': sum(entry.size for entry in entries),
+            'routes': routes,
+            'journal_lines': self._lines
+        }
+
+def find_missing_pages(url_file: str, manifest: Optional[PageManifest] = None,
+                       stores: Optional[Sequence[Any]] = None, max_age_days: Optional[float] = None) -> List[str]:
+    """
+    Find the URLs of a URL file that need to be (re)scraped.
+
+    Pages saved before the manifest existed are added to it from the
+    page stores first, so they are not reported as missing.
+
+    Args:
+        url_file: Path to the URL file
+        manifest: Page manifest (default: data/html/manifest.jsonl)
+        stores: Page stores to take older pages from (default: data/html, then legacy output/html)
+        max_age_days: Also report pages older than this many days
+
+    Returns:
+        URLs with a missing or stale page, in file order
+    """
+    if not os.path.exists(url_file):
+        logger.error(f"URL file not found: {url_file}")
+        return []
+
+    manifest = manifest or PageManifest()
+    urls = read_url_file(url_file)
+    if manifest.find_missing(urls):
+        if stores is None:
+            stores = [open_page_store()]
+            if os.path.exists("output/html"):
+                stores.append(HTMLStore("output/html"))
+        manifest.rebuild(urls, stores)
+
+    missing = manifest.find_missing(urls)
+    logger.info(f"Found {len(missing)} missing HTML files that need to be rescraped")
+    if max_age_days is None:
+        return missing
+
+    stale = manifest.find_stale(urls, max_age_days)
+    logger.info(f"Found {len(stale)} HTML files older than {max_age_days:g} days")
+    needed = set(missing) | set(stale)
+    return [url for url in urls if url in needed]
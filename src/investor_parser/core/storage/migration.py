@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+"""
+Migration of legacy page directories into the page store.
+
+Plain pages of a legacy directory such as output/html are not read and
+rewritten: they are hardlinked (or renamed) into the shards of the store
+directory, where the store reads them as plain files. Only when the two
+directories are on different filesystems are the files copied, by a pool
+of threads.
+
+Every finished file is appended to a JSONL journal, so an interrupted
+migration picks up where it stopped when it is run again.
+"""
+
+import os
+import json
+import errno
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.investor_parser.core.page_format import get_graphql_filename
+from src.investor_parser.core.storage.layout import WALK_WORKERS, resolve_page_path
+from src.investor_parser.core.storage.html_store import HTMLStore
+
+logger = logging.getLogger(__name__)
+
+# link keeps the legacy files, rename moves them, copy always copies
+TRANSFER_METHODS = ("link", "rename", "copy")
+DEFAULT_METHOD = "link"
+
+# Journal of finished transfers, kept in the store directory
+JOURNAL_FILENAME = "migration.jsonl"
+
+# Errors meaning a link or rename cannot work between these paths, so the file is copied
+_COPY_ERRORS = (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP)
+
+class MigrationJournal:
+    """
+    Append-only record of the files a migration has finished.
+
+    Each line is one JSON object with the source, the target and the
+    method used. A torn last line left by a crash is ignored on load; the
+    file it stood for is simply transferred again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Path to the JSONL journal
+        """
+        self.path = path
+        self._done: Dict[str, str] = {}
+        self._torn = False  # the journal ends in a partial line
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Replay the journal."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                self._torn = not line.endswith("\n")
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._done[entry["source"]] = entry["target"]
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable line {number} of {self.path}: {str(e)}")
+
+    def done(self, source: str, target: str) -> bool:
+        """
+        Check if a transfer was finished by an earlier run.
+
+        Args:
+            source: Source path
+            target: Target path
+
+        Returns:
+            True if the journal records it and the target is still there
+        """
+        return self._done.get(source) == target and os.path.exists(target)
+
+    def record(self, source: str, target: str, method: str) -> None:
+        """
+        Record a finished transfer.
+
+        Args:
+            source: Source path
+            target: Target path
+            method: Method used: link, rename, copy or stream
+        """
+        line = json.dumps({"source": source, "target": target, "method": method}) + "\n"
+        with self._lock:
+            if self._torn:
+                # Start on a fresh line after a partial one left by a crash
+                line = "\n" + line
+                self._torn = False
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+            self._done[source] = target
+
+def _copy(source: str, target: str) -> None:
+    """
+    Copy a file so the target never holds a partial copy.
+
+    Args:
+        source: Source path
+        target: Target path
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".migrate-", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def transfer_file(source: str, target: str, method: str = DEFAULT_METHOD) -> str:
+    """
+    Put a file at its target path without copying it if possible.
+
+    Links and renames only touch directory entries. Between filesystems,
+    or where hardlinks are not supported, the file is copied instead, and
+    with the rename method the source is then removed.
+
+    Args:
+        source: Source path
+        target: Target path; must not exist
+        method: link, rename or copy
+
+    Returns:
+        Method actually used
+
+    Raises:
+        OSError: If the file could not be transferred
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if method != "copy":
+        try:
+            if method == "rename":
+                os.rename(source, target)
+            else:
+                os.link(source, target)
+            return method
+        except OSError as e:
+            if e.errno not in _COPY_ERRORS:
+                raise
+            logger.debug(f"Cannot {method} {source} to {target} ({e.strerror}), copying it")
+
+    _copy(source, target)
+    if method == "rename":
+        os.remove(source)
+    return "copy"
+
+def transfer_files(transfers: List[Tuple[str, str]], method: str = DEFAULT_METHOD,
+                   journal: Optional[MigrationJournal] = None, workers: int = WALK_WORKERS) -> Dict[str, int]:
+    """
+    Transfer files in parallel, skipping the ones already done.
+
+    Args:
+        transfers: List of (source, target) paths
+        method: link, rename or copy
+        journal: Journal to skip finished transfers by and to record new ones in
+        workers: Threads transferring files; copies run in parallel
+
+    Returns:
+        Dictionary with the number of files per method used, skipped and failed
+    """
+    if method not in TRANSFER_METHODS:
+        raise ValueError(f"Unknown transfer method: {method}")
+
+    def transfer(plan: Tuple[str, str]) -> str:
+        source, target = plan
+        if journal is not None and journal.done(source, target):
+            return "skipped"
+        if os.path.exists(target):
+            if journal is not None and os.path.exists(source) and os.path.samefile(source, target):
+                # Linked by a run that stopped before journaling it
+                journal.record(source, target, "link")
+                return "link"
+            return "skipped"
+        try:
+            used = transfer_file(source, target, method)
+        except OSError as e:
+            logger.error(f"Error migrating {source} to {target}: {str(e)}")
+            return "failed"
+        if journal is not None:
+            journal.record(source, target, used)
+        return used
+
+    stats = {name: 0 for name in TRANSFER_METHODS + ("skipped", "failed")}
+    if not transfers:
+        return stats
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for outcome in pool.map(transfer, transfers):
+            stats[outcome] += 1
+    return stats
+
+def migrate_legacy_pages(legacy_root: str, store: Any, method: str = DEFAULT_METHOD,
+                         journal_path: Optional[str] = None, workers: int = WALK_WORKERS) -> Dict[str, int]:
+    """
+    Move the pages of a legacy directory into a page store.
+
+    Plain pages and their GraphQL responses are transferred into the
+    shards of the store directory with transfer_files(). Pages kept
+    compressed in a legacy store index are streamed through the store.
+    Pages the store already has are left alone. A PageArchive imports the
+    transferred plain pages afterwards, since it only reads its segment.
+
+    Args:
+        legacy_root: Legacy page directory, e.g. output/html
+        store: HTMLStore or PageArchive to migrate into
+        method: link, rename or copy
+        journal_path: Path to the migration journal; by default in the store directory
+        workers: Threads transferring files
+
+    Returns:
+        Dictionary with the number of files per method used, streamed, skipped and failed
+    """
+    legacy_store = HTMLStore(legacy_root)
+    loose = legacy_store.loose_files()
+    journal = MigrationJournal(journal_path or os.path.join(store.root, JOURNAL_FILENAME))
+
+    transfers = []
+    streamed = []
+    skipped = 0
+    for name in legacy_store.names():
+        target = resolve_page_path(name, store.root)
+        if journal.done(loose.get(name, ""), target):
+            skipped += 1
+            continue
+        if store.exists(name) and not os.path.exists(target):
+            # Stored under another form, e.g. compressed or in the archive
+            skipped += 1
+            continue
+        source = loose.get(name)
+        if source is None:
+            streamed.append(name)
+            continue
+        transfers.append((source, target))
+        graphql_file = get_graphql_filename(source)
+        if os.path.exists(graphql_file):
+            transfers.append((graphql_file, get_graphql_filename(target)))
+
+    if transfers or streamed:
+        logger.info(f"Migrating {len(transfers)} files and {len(streamed)} compressed pages "
+                    f"from {legacy_root} to {store.root}")
+    stats = transfer_files(transfers, method, journal, workers)
+    stats["skipped"] += skipped
+    stats["streamed"] = 0
+
+    for name in streamed:
+        try:
+            with legacy_store.open(name) as src, store.writer(name, save_index=False) as dst:
+                shutil.copyfileobj(src, dst)
+            journal.record(legacy_store.path(name), store.path(name), "stream")
+            stats["streamed"] += 1
+        except Exception as e:
+            logger.error(f"Error migrating {legacy_store.path(name)}: {str(e)}")
+            stats["failed"] += 1
+    if stats["streamed"]:
+        store.save_index()
+
+    if isinstance(store, HTMLStore):
+        store.rescan_loose_files()
+    elif transfers:
+        store.import_loose_files()
+    logger.info(f"Migrated {legacy_root} into {store.root}: {stats}")
+    return stats
@@ -0,0 +1,646 @@
+#!/usr/bin/env python
+
+import io
+import os
+import gzip
+import json
+import mmap
+import zlib
+import struct
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from src.investor_parser.core.storage.html_store import (
+    HTMLStore, COMPRESSIONS, DEFAULT_COMPRESSION, ZSTD_AVAILABLE, page_name, sync_directory
+)
+from src.investor_parser.core.page_format import get_graphql_filename
+from src.investor_parser.core.storage.layout import GRAPHQL_SUFFIX, WALK_WORKERS, resolve_page_path
+
+if ZSTD_AVAILABLE:
+    import zstandard
+
+logger = logging.getLogger(__name__)
+
+# objects: one compressed file per distinct page (HTMLStore)
+# archive: every page appended to one segment file (PageArchive)
+PAGE_STORES = ("objects", "archive")
+
+ARCHIVE_FILENAME = "pages.archive"
+
+# Appended records after which the index is written again; later ones are recovered by the tail scan
+INDEX_EVERY = 1000
+
+# Every record: magic, compression code, name length, body length, CRC32 of
+# the stored body; followed by the name and the (compressed) body
+RECORD_MAGIC = b"PGA1"
+RECORD_HEADER = struct.Struct("<4sBHII")
+COMPRESSION_CODES = {"none": 0, "gzip": 1, "zstd": 2}
+CODE_COMPRESSIONS = {code: name for name, code in COMPRESSION_CODES.items()}
+
+class PageArchive:
+    """
+    Append-only archive holding every scraped page in a single segment file.
+
+    Pages are appended as length-prefixed records; a page saved again is
+    appended again and the index points at the newest copy. The GraphQL
+    responses captured with a page are a record of their own, named like
+    the page's .graphql.json file, so no file is kept per page. The index
+    (<archive>.idx) maps page names to record offsets. It is written
+    atomically every INDEX_EVERY records and on close, and records the end
+    of the segment it covers, so records appended after it (e.g. by a run
+    that crashed) are recovered by scanning the tail, and a torn last
+    record is cut off.
+
+    Sequential reads walk the file in order; random reads by name go
+    through a memory map. Only one process should write at a time.
+
+    Offers the same interface as HTMLStore, so scripts can use either.
+    """
+
+    def __init__(self, root: str = "data/html", compression: Optional[str] = None):
+        """
+        Initialize the archive.
+
+        Args:
+            root: Directory of the archive; pages keep their logical paths under it
+            compression: "zstd", "gzip" or "none" for new pages (default: zstd if installed, else gzip)
+
+        Raises:
+            ValueError: If the compression is unknown or zstd is not installed
+        """
+        compression = compression or DEFAULT_COMPRESSION
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression needs the zstandard package")
+
+        self.root = root
+        self.compression = compression
+        self.archive_path = os.path.join(root, ARCHIVE_FILENAME)
+        self.index_path = f"{self.archive_path}.idx"
+        self._lock = threading.RLock()
+
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+        # Counters exposed through get_statistics()
+        self.written = 0
+        self.recovered = 0
+
+        # Records appended since the index was last written
+        self._unindexed = 0
+
+        # Page name to (offset, record length, page size)
+        self._pages: Dict[str, Tuple[int, int, int]] = {}
+        self._end = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Read the index and recover records appended after it was written."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._pages = {name: tuple(entry) for name, entry in data.get("pages", {}).items()}
+            self._end = data.get("end", 0)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read archive index {self.index_path}, rebuilding it: {str(e)}")
+            self._pages, self._end = {}, 0
+
+        size = os.path.getsize(self.archive_path) if os.path.exists(self.archive_path) else 0
+        if size < self._end:
+            logger.error(f"Archive {self.archive_path} is shorter than its index, rebuilding the index")
+            self._pages, self._end = {}, 0
+        if size > self._end:
+            before = len(self._pages)
+            self._scan(self._end)
+            self.recovered = len(self._pages) - before
+            if self.recovered:
+                logger.info(f"Recovered {self.recovered} pages appended after the archive index was written")
+
+    def _read_header(self, f: BinaryIO) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Read the header of the record at the current position.
+
+        Args:
+            f: Archive file
+
+        Returns:
+            Tuple of (compression code, name length, body length, crc32), or None at the end or on a torn record
+        """
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        magic, code, name_length, body_length, crc = RECORD_HEADER.unpack(header)
+        if magic != RECORD_MAGIC or code not in CODE_COMPRESSIONS:
+            return None
+        return code, name_length, body_length, crc
+
+    def _scan(self, start: int) -> None:
+        """
+        Index the records from an offset to the end of the segment.
+
+        Stops at the first incomplete or corrupt record; later appends overwrite it.
+
+        Args:
+            start: Offset of the first record to index
+        """
+        with open(self.archive_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            while True:
+                header = self._read_header(f)
+                if header is None:
+                    break
+                _, name_length, body_length, crc = header
+                name = f.read(name_length)
+                body = f.read(body_length)
+                if len(name) < name_length or len(body) < body_length or zlib.crc32(body) != crc:
+                    break
+                length = RECORD_HEADER.size + name_length + body_length
+                self._pages[name.decode("utf-8")] = (offset, length, len(self._decode(header[0], body)))
+                offset += length
+        if offset < os.path.getsize(self.archive_path):
+            logger.warning(f"Ignoring a torn record at offset {offset} of {self.archive_path}")
+        self._end = offset
+
+    def save_index(self, sync: bool = False) -> None:
+        """
+        Flush appended pages and write the index so readers never see a partial file.
+
+        The segment is always synced first, so the index never covers
+        records that are not on disk.
+
+        Args:
+            sync: Return only once the index is on disk too
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            os.makedirs(self.root, exist_ok=True)
+            data = {"version": 1, "end": self._end, "pages": {name: list(entry) for name, entry in self._pages.items()}}
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".archive-index-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, self.index_path)
+                if sync:
+                    sync_directory(self.root)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._unindexed = 0
+
+    def path(self, name: str) -> str:
+        """
+        Get the logical path of a page.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            Sharded path of the page under the archive directory
+        """
+        return resolve_page_path(name, self.root)
+
+    def _encode(self, body: bytes) -> bytes:
+        """
+        Compress a page body with the archive's compression.
+
+        Args:
+            body: UTF-8 page body
+
+        Returns:
+            Stored bytes
+        """
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(body)
+        if self.compression == "gzip":
+            return gzip.compress(body, compresslevel=6, mtime=0)
+        return body
+
+    def _decode(self, code: int, data: bytes) -> bytes:
+        """
+        Decompress a stored page body.
+
+        Args:
+            code: Compression code of the record
+            data: Stored bytes
+
+        Returns:
+            UTF-8 page body
+        """
+        compression = CODE_COMPRESSIONS[code]
+        if compression == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        if compression == "gzip":
+            return gzip.decompress(data)
+        return data
+
+    def put(self, name: str, html: str, save_index: bool = True, sync: bool = False) -> str:
+        """
+        Append a page to the archive.
+
+        Args:
+            name: Page name or path
+            html: HTML content
+            save_index: Write the index every INDEX_EVERY records; pass False for bulk imports and call save_index()
+            sync: Return only once the record is on disk
+
+        Returns:
+            Logical path of the page
+        """
+        name = page_name(name)
+        self._append(name, html.encode("utf-8"), save_index, sync)
+        return self.path(name)
+
+    def put_payloads(self, name: str, payloads: List[Dict[str, Any]], save_index: bool = True,
+                     sync: bool = False) -> str:
+        """
+        Append the GraphQL responses captured with a page to the archive.
+
+        Args:
+            name: Page name or path
+            payloads: GraphQL response bodies
+            save_index: Write the index every INDEX_EVERY records
+            sync: Return only once the record is on disk
+
+        Returns:
+            Logical path of the GraphQL responses
+        """
+        key = get_graphql_filename(page_name(name))
+        self._append(key, json.dumps(payloads).encode("utf-8"), save_index, sync)
+        return self.path(key)
+
+    def _append(self, name: str, body: bytes, save_index: bool, sync: bool) -> None:
+        """
+        Append a record to the segment.
+
+        Args:
+            name: Record name
+            body: UTF-8 body
+            save_index: Write the index every INDEX_EVERY records
+            sync: Return only once the record is on disk
+        """
+        stored = self._encode(body)
+        encoded_name = name.encode("utf-8")
+        record = RECORD_HEADER.pack(
+            RECORD_MAGIC, COMPRESSION_CODES[self.compression], len(encoded_name), len(stored), zlib.crc32(stored)
+        ) + encoded_name + stored
+
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.root, exist_ok=True)
+                self._file = open(self.archive_path, "ab")
+                # Cut off a torn record left by a crashed run
+                if self._file.tell() > self._end:
+                    self._file.truncate(self._end)
+                    self._file.seek(0, os.SEEK_END)
+            # Appends always go to the end of the file, wherever the position was
+            self._file.write(record)
+            self._end = self._file.tell()
+            self._pages[name] = (self._end - len(record), len(record), len(body))
+            self.written += 1
+            self._unindexed += 1
+            if save_index and self._unindexed >= INDEX_EVERY:
+                # Syncs the segment too
+                self.save_index(sync)
+            elif sync:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    @contextmanager
+    def writer(self, name: str, save_index: bool = True, sync: bool = False) -> Iterator[TextIO]:
+        """
+        Write a page through a stream.
+
+        The page is buffered and appended as one record when the block
+        exits; nothing is appended if the block raises.
+
+        Args:
+            name: Page name or path
+            save_index: Write the index every INDEX_EVERY records
+            sync: Return only once the record is on disk
+
+        Yields:
+            Text stream to write the HTML to
+        """
+        buffer = io.StringIO()
+        yield buffer
+        self.put(name, buffer.getvalue(), save_index, sync)
+
+    def import_file(self, source_path: str, name: Optional[str] = None, save_index: bool = True) -> str:
+        """
+        Append a plain HTML file to the archive.
+
+        Args:
+            source_path: HTML file to import
+            name: Page name (default: the file name)
+            save_index: Write the index every INDEX_EVERY records
+
+        Returns:
+            Logical path of the page
+        """
+        with open(source_path, "r", encoding="utf-8") as f:
+            return self.put(name or page_name(source_path), f.read(), save_index)
+
+    def exists(self, name: str) -> bool:
+        """
+        Check if a page is stored.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            True if the page can be read
+        """
+        return page_name(name) in self._pages
+
+    def _view(self) -> mmap.mmap:
+        """
+        Get a memory map covering every indexed record.
+
+        Returns:
+            Read-only memory map of the segment file
+        """
+        if self._file is not None:
+            self._file.flush()
+        if self._mmap is None or len(self._mmap) < self._end:
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.archive_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def get(self, name: str) -> str:
+        """
+        Read a page through the memory map.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            HTML content
+
+        Raises:
+            FileNotFoundError: If the page is not stored
+            ValueError: If the record is corrupt
+        """
+        return self._read(page_name(name)).decode("utf-8")
+
+    def get_payloads(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the GraphQL responses captured with a page.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            List of GraphQL response bodies, or None if there are none
+        """
+        key = get_graphql_filename(page_name(name))
+        if key not in self._pages:
+            return None
+        try:
+            return json.loads(self._read(key))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load GraphQL payloads of {name} from {self.archive_path}: {str(e)}")
+            return None
+
+    def _read(self, name: str) -> bytes:
+        """
+        Read a record through the memory map.
+
+        Args:
+            name: Record name
+
+        Returns:
+            UTF-8 body
+
+        Raises:
+            FileNotFoundError: If there is no such record
+            ValueError: If the record is corrupt
+        """
+        with self._lock:
+            entry = self._pages.get(name)
+            if entry is None:
+                raise FileNotFoundError(f"Page not in the archive: {name}")
+            offset, length, _ = entry
+            view = self._view()
+            magic, code, name_length, body_length, crc = RECORD_HEADER.unpack_from(view, offset)
+            start = offset + RECORD_HEADER.size + name_length
+            stored = view[start:start + body_length]
+        if magic != RECORD_MAGIC or zlib.crc32(stored) != crc:
+            raise ValueError(f"Corrupt archive record for {name} at offset {offset}")
+        return self._decode(code, stored)
+
+    def open(self, name: str) -> TextIO:
+        """
+        Open a page for reading.
+
+        Args:
+            name: Page name or path
+
+        Returns:
+            Text stream of the HTML
+
+        Raises:
+            FileNotFoundError: If the page is not stored
+        """
+        return io.StringIO(self.get(name))
+
+    def names(self) -> List[str]:
+        """
+        Get the names of all stored pages.
+
+        Returns:
+            Sorted list of page names
+        """
+        return sorted(name for name in self._pages if not name.endswith(GRAPHQL_SUFFIX))
+
+    def iter_pages(self, workers: int = 1) -> Iterator[Tuple[str, str]]:
+        """
+        Read every stored page in one sequential pass over the segment.
+
+        Older copies of pages saved more than once and GraphQL responses are skipped.
+
+        Args:
+            workers: Unused; one sequential pass is already the fastest way through a single file
+
+        Yields:
+            Tuples of (logical path, HTML content)
+        """
+        if not os.path.exists(self.archive_path):
+            return
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+
+        with open(self.archive_path, "rb", buffering=1 << 20) as f:
+            offset = 0
+            while offset < self._end:
+                header = self._read_header(f)
+                if header is None:
+                    logger.error(f"Corrupt archive record at offset {offset} of {self.archive_path}")
+                    return
+                code, name_length, body_length, crc = header
+                name = f.read(name_length).decode("utf-8")
+                stored = f.read(body_length)
+                entry = self._pages.get(name)
+                if entry is not None and entry[0] == offset and not name.endswith(GRAPHQL_SUFFIX):
+                    if zlib.crc32(stored) == crc:
+                        yield self.path(name), self._decode(code, stored).decode("utf-8")
+                    else:
+                        logger.error(f"Corrupt archive record for {name} at offset {offset}")
+                offset += RECORD_HEADER.size + name_length + body_length
+
+    def import_loose_files(self, remove: bool = True) -> int:
+        """
+        Move plain .html files from older runs, and their GraphQL files, into the archive.
+
+        Args:
+            remove: Delete each plain file once it is archived
+
+        Returns:
+            Number of files imported
+        """
+        imported = 0
+        with self._lock:
+            loose = HTMLStore(self.root).loose_files()
+            for name, loose_path in loose.items():
+                if name in self._pages:
+                    continue
+                payload_path = get_graphql_filename(loose_path)
+                try:
+                    self.import_file(loose_path, save_index=False)
+                    if os.path.exists(payload_path):
+                        with open(payload_path, "r", encoding="utf-8") as f:
+                            self.put_payloads(name, json.load(f), save_index=False)
+                except Exception as e:
+                    logger.error(f"Error importing {loose_path}: {str(e)}")
+                    continue
+                if remove:
+                    os.remove(loose_path)
+                    if os.path.exists(payload_path):
+                        os.remove(payload_path)
+                imported += 1
+            if imported:
+                self.save_index()
+        logger.info(f"Imported {imported} plain HTML files into {self.archive_path}")
+        return imported
+
+    def migrate_layout(self, workers: int = WALK_WORKERS) -> Dict[str, int]:
+        """
+        Move plain pages, GraphQL sidecars and objects left next to the archive into shards.
+
+        Args:
+            workers: Threads moving files
+
+        Returns:
+            Dictionary with the number of files moved and skipped
+        """
+        return HTMLStore(self.root).migrate_layout(workers)
+
+    def compact(self) -> int:
+        """
+        Rewrite the segment with only the newest copy of every page.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        with self._lock:
+            self.close()
+            if not os.path.exists(self.archive_path):
+                return 0
+            before = os.path.getsize(self.archive_path)
+
+            pages: Dict[str, Tuple[int, int, int]] = {}
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".archive-", suffix=".tmp")
+            try:
+                with open(self.archive_path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                    for name, (offset, length, size) in sorted(self._pages.items(), key=lambda item: item[1][0]):
+                        src.seek(offset)
+                        pages[name] = (dst.tell(), length, size)
+                        dst.write(src.read(length))
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.replace(tmp_path, self.archive_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self._pages = pages
+            self._end = os.path.getsize(self.archive_path)
+            self.save_index()
+        reclaimed = before - self._end
+        logger.info(f"Compacted {self.archive_path}, reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    def close(self) -> None:
+        """Flush pending appends and release the file and memory map."""
+        with self._lock:
+            if self._file is not None:
+                self.save_index(sync=True)
+                self._file.close()
+                self._file = None
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the archive.
+
+        Returns:
+            Dictionary with page count, sizes and counters
+        """
+        with self._lock:
+            entries = list(self._pages.values())
+            payloads = sum(1 for name in self._pages if name.endswith(GRAPHQL_SUFFIX))
+            end = self._end
+        raw_bytes = sum(entry[2] for entry in entries)
+        live_bytes = sum(entry[1] for entry in entries)
+        return {
+            'pages': len(entries) - payloads,
+            'payloads': payloads,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': end,
+            'stale_bytes': end - live_bytes,
+            'ratio': round(end / raw_bytes, 3) if raw_bytes else None,
+            'compression': self.compression,
+            'written': self.written,
+            'recovered': self.recovered
+        }
+
+def open_page_store(kind: Optional[str] = None, root: str = "data/html", compression: Optional[str] = None) -> Any:
+    """
+    Open the page store scripts read and write pages through.
+
+    Args:
+        kind: "objects" or "archive"; by default the archive if one exists in root, else objects
+        root: Directory of the store
+        compression: Compression of new pages
+
+    Returns:
+        HTMLStore or PageArchive
+
+    Raises:
+        ValueError: If the kind or compression is unknown
+    """
+    if kind is None:
+        kind = "archive" if os.path.exists(os.path.join(root, ARCHIVE_FILENAME)) else "objects"
+    if kind == "archive":
+        return PageArchive(root, compression)
+    if kind == "objects":
+        return HTMLStore(root, compression)
+    raise ValueError(f"Unknown page store: {kind}")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class WriteBehind:
+    """
+    Background writer threads fed through a bounded queue.
+
+    Fetch threads hand their pages over with submit() and go on fetching
+    while the writers save them. Each job's callback runs in the writer
+    thread once the job has returned, so whatever it acknowledges is
+    already on disk. When the writers fall behind, the queue fills up and
+    submit() blocks, which slows the fetchers down to the disk's pace
+    instead of piling up pages in memory.
+
+    With no writer threads, jobs run inline in submit().
+    """
+
+    def __init__(self, writers: int = 1, max_pending: int = 16, name: str = "page-writer"):
+        """
+        Initialize and start the writers.
+
+        Args:
+            writers: Number of writer threads, 0 to run jobs inline
+            max_pending: Jobs that can wait for a writer before submit() blocks
+            name: Prefix of the writer thread names
+        """
+        self.writers = max(0, writers)
+        self._jobs: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._lock = threading.Lock()
+
+        # Counters exposed through get_statistics()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.blocked = 0  # submits that had to wait for a free slot
+        self.blocked_seconds = 0.0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(self.writers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _execute(self, job: Callable[[], Any], on_done: Optional[Callable[[Any], None]]) -> None:
+        """
+        Run a job and its callback.
+
+        A job that raises counts as failed and its callback gets None.
+
+        Args:
+            job: Write to perform
+            on_done: Called with the job's result
+        """
+        try:
+            result = job()
+        except Exception as e:
+            logger.exception(f"Write-behind job failed: {str(e)}")
+            result = None
+        with self._lock:
+            if result is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if on_done is not None:
+            try:
+                on_done(result)
+            except Exception as e:
+                logger.exception(f"Write-behind callback failed: {str(e)}")
+
+    def _run(self) -> None:
+        """Writer thread: run jobs until the stop marker."""
+        while True:
+            entry = self._jobs.get()
+            try:
+                if entry is None:
+                    break
+                self._execute(*entry)
+            finally:
+                self._jobs.task_done()
+
+    def submit(self, job: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Queue a write, blocking while the queue is full.
+
+        Args:
+            job: Write to perform; returns a result, or None if it failed
+            on_done: Called in the writer thread with the job's result once it is written
+        """
+        with self._lock:
+            self.submitted += 1
+        if not self._threads:
+            self._execute(job, on_done)
+            return
+
+        try:
+            self._jobs.put_nowait((job, on_done))
+        except queue.Full:
+            started = time.monotonic()
+            self._jobs.put((job, on_done))
+            waited = time.monotonic() - started
+            with self._lock:
+                self.blocked += 1
+                self.blocked_seconds += waited
+            logger.debug(f"Waited {waited:.2f} seconds for a free write slot")
+
+    def join(self) -> None:
+        """Wait until every queued write and its callback have run."""
+        self._jobs.join()
+
+    def close(self) -> None:
+        """Finish the queued writes and stop the writers."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about the writes.
+
+        Returns:
+            Dictionary with job counts and the time submitters spent waiting
+        """
+        with self._lock:
+            return {
+                'writers': self.writers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'pending': self._jobs.qsize(),
+                'blocked': self.blocked,
+                'blocked_seconds': round(self.blocked_seconds, 2)
+            }
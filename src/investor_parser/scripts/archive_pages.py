@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Convert saved profile pages between a directory and the single-file page archive.
+
+Commands:
+    import   Append every page of a directory (plain .html files and the
+             compressed HTML store) to the archive, together with the
+             GraphQL responses saved with it
+    export   Write every archived page and its GraphQL responses back out,
+             as plain files or into a compressed HTML store
+    compact  Drop old copies of pages that were saved more than once
+    stats    Show archive statistics
+
+Usage:
+    python -m src.investor_parser.scripts.archive_pages import [--source data/html]
+    python -m src.investor_parser.scripts.archive_pages export --target exported/html [--format plain]
+    python -m src.investor_parser.scripts.archive_pages compact
+
+Once data/html/pages.archive exists, the scraper and the parsing scripts
+use it instead of the per-page files.
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+
+from src.investor_parser.core.storage import HTMLStore, PageArchive, COMPRESSIONS, resolve_page_path
+from src.investor_parser.core.page_format import get_graphql_filename
+
+# Set up logging
+os.makedirs("logs", exist_ok=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.FileHandler("logs/archive_pages.log"),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Pages appended between two index writes, so an interrupted import resumes close to where it stopped
+INDEX_EVERY = 500
+
+def import_pages(source: str, archive: PageArchive, overwrite: bool = False) -> int:
+    """
+    Append the pages of a directory to the archive.
+
+    Pages already in the archive are skipped, so an interrupted import can be rerun.
+
+    Args:
+        source: Directory with plain .html files and/or a compressed HTML store
+        archive: Archive to append to
+        overwrite: Append pages the archive already holds again
+
+    Returns:
+        Number of pages imported
+    """
+    source_store = HTMLStore(source)
+    names = source_store.names()
+    logger.info(f"Found {len(names)} pages in {source}")
+
+    imported = 0
+    for name in names:
+        if archive.exists(name) and not overwrite:
+            continue
+        try:
+            archive.put(name, source_store.get(name), save_index=False)
+            payloads = source_store.get_payloads(name)
+            if payloads:
+                archive.put_payloads(name, payloads, save_index=False)
+        except Exception as e:
+            logger.error(f"Error importing {source_store.path(name)}: {str(e)}")
+            continue
+        imported += 1
+        if imported % INDEX_EVERY == 0:
+            archive.save_index()
+            logger.info(f"Imported {imported} pages")
+
+    archive.save_index()
+    logger.info(f"Imported {imported} pages into {archive.archive_path}")
+    return imported
+
+def export_pages(archive: PageArchive, target: str, output_format: str = "plain",
+                 compression: str = None) -> int:
+    """
+    Write every archived page to a directory.
+
+    Args:
+        archive: Archive to read
+        target: Destination directory
+        output_format: "plain" for one .html file per page in the sharded layout, "objects" for a compressed HTML store
+        compression: Compression of the HTML store when output_format is "objects"
+
+    Returns:
+        Number of pages exported
+    """
+    os.makedirs(target, exist_ok=True)
+    target_store = HTMLStore(target, compression) if output_format == "objects" else None
+
+    exported = 0
+    for path, html in archive.iter_pages():
+        name = os.path.basename(path)
+        payloads = archive.get_payloads(name)
+        if target_store is not None:
+            target_store.put(name, html, save_index=False)
+            if payloads:
+                target_store.put_payloads(name, payloads)
+        else:
+            output_path = resolve_page_path(name, target)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            if payloads:
+                with open(get_graphql_filename(output_path), "w", encoding="utf-8") as f:
+                    json.dump(payloads, f)
+        exported += 1
+
+    if target_store is not None:
+        target_store.save_index()
+    logger.info(f"Exported {exported} pages to {target}")
+    return exported
+
+def main():
+    """
+    Main function for the page archive tool.
+    """
+    parser = argparse.ArgumentParser(description="Convert saved pages to and from the page archive")
+    parser.add_argument("--archive-dir", default="data/html", help="Directory of the page archive")
+    parser.add_argument("--compression", choices=list(COMPRESSIONS),
+                        help="Compression of written pages (default: zstd if installed, else gzip)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Append the pages of a directory to the archive")
+    import_parser.add_argument("--source", default="data/html", help="Directory with the pages to import")
+    import_parser.add_argument("--overwrite", action="store_true", help="Import pages the archive already holds")
+
+    export_parser = subparsers.add_parser("export", help="Write archived pages to a directory")
+    export_parser.add_argument("--target", required=True, help="Directory to write the pages to")
+    export_parser.add_argument("--format", dest="output_format", choices=["plain", "objects"], default="plain",
+                               help="Plain .html files or a compressed HTML store (default: plain)")
+
+    subparsers.add_parser("compact", help="Drop old copies of pages saved more than once")
+    subparsers.add_parser("stats", help="Show archive statistics")
+    args = parser.parse_args()
+
+    try:
+        archive = PageArchive(args.archive_dir, args.compression)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    try:
+        if args.command == "import":
+            import_pages(args.source, archive, args.overwrite)
+        elif args.command == "export":
+            export_pages(archive, args.target, args.output_format, args.compression)
+        elif args.command == "compact":
+            archive.compact()
+        logger.info(f"Archive statistics: {archive.get_statistics()}")
+    finally:
+        archive.close()
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,10 @@ This script reads all HTML files from the data/html directory,
 extracts investor data, and saves the results to data/output/investor_data.json.
 """
 import os
-import glob
 import json
 import logging
 from investor_parser.core.parser import InvestorProfileParser
+from investor_parser.core.storage import open_page_store
 
 # Configure logging
 logging.basicConfig(
@@ -27,22 +27,18 @@ def main():
     os.makedirs('data/output', exist_ok=True)
     os.makedirs('logs', exist_ok=True)
     
-    # Get all HTML files in the html directory
-    html_files = glob.glob('data/html/*.html')
-    logger.info(f"Found {len(html_files)} HTML files to process")
+    # Get all pages in the page store
+    html_store = open_page_store()
+    logger.info(f"Found {len(html_store.names())} HTML files to process")
     
-    # Process each HTML file
+    # Process each page, reading one at a time
     investors_data = []
-    for html_file in html_files:
+    for html_file, html_content in html_store.iter_pages():
         logger.info(f"Processing {html_file}")
         
         try:
-            # Read the HTML file
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
             # Parse the investor profile
-            parser = InvestorProfileParser(html_content, html_file)
+            parser = InvestorProfileParser(html_content, html_file, html_store.get_payloads(html_file))
             data = parser.parse()
             
             # Add the data to the list
@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+"""
+Benchmark per-page browser setup against a local test page.
+
+Serves a profile-like page from a local HTTP server and loads it repeatedly
+through the BrowserScraper's browser pool, timing each phase. Two parts of
+the setup can be compared:
+
+- stealth: the legacy per-page scripts ("page") against the context-level
+  init script bundle ("context")
+- interception: the legacy catch-all routes ("legacy"), which send every
+  request to Python, against the narrow regex routes ("narrow")
+
+With --warm-contexts N the "narrow" setup takes its contexts from the
+scraper's context pool, which prepares them while the previous page loads,
+and the warm and cold acquire latencies are printed at the end. With
+--browser-cache the contexts share storage state and a static asset cache
+in a temporary directory; otherwise every load starts empty.
+
+Usage:
+    python -m src.investor_parser.scripts.benchmark_browser [--pages N] [--stealth MODES] [--interception MODES]
+                                                            [--warm-contexts N] [--browser-cache]
+
+Options:
+    --pages N              Number of page loads per setup (default: 20)
+    --stealth MODES        Comma-separated stealth setups to compare (default: page,context)
+    --interception MODES   Comma-separated interception setups to compare (default: narrow)
+    --resource-policy NAME Resource policy used for the routes (default: no-media)
+    --warm-contexts N      Prepared contexts kept ready for the narrow setup (default: 0)
+    --browser-cache        Reuse storage state and static assets between loads
+    --page FILE            Serve this HTML file instead of the built-in test page
+    --browser NAME         Browser to use (default: chromium)
+"""
+
+import os
+import sys
+import time
+import json
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.investor_parser.core.scraper import BrowserScraper, PacingPolicy, RESOURCE_POLICIES
+from src.investor_parser.core.scraper.browser_scraper import CONTEXT_HEADERS, FINGERPRINT_PATCH_JS, STEALTH_PATCH_JS
+from src.investor_parser.core.scraper.resource_policy import ResourceStats
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+STEALTH_MODES = ("off", "page", "context")
+INTERCEPTION_MODES = ("off", "legacy", "narrow")
+
+# Glob patterns the bot-check routes used before they became one regex
+LEGACY_DETECTION_GLOBS = (
+    "*datadome*", "*botdetect*", "*cloudflare*", "*captcha*", "*recaptcha*",
+    "*fingerprint*", "*distil*", "*imperva*", "*perimeterx*"
+)
+
+# Sub-resources referenced by the built-in test page
+TEST_ASSETS = {
+    **{f"img/photo{i}.png": b"\x89PNG\r\n\x1a\n" for i in range(30)},
+    **{f"css/style{i}.css": b"body { margin: 0; }" for i in range(3)},
+    **{f"js/app{i}.js": b"window.loaded = (window.loaded || 0) + 1;" for i in range(5)},
+}
+
+# Small stand-in for a profile page: Apollo state, header and investments table
+TEST_PAGE = """<!DOCTYPE html>
+<html><head><title>Benchmark profile</title>%(head)s</head>
+<body>
+<div class="identity-block"><h1 class="f3 f1-ns mv1">Test Investor</h1></div>
+<table><thead><tr><th>Investments</th></tr></thead><tbody>
+%(rows)s
+</tbody></table>
+<script>window.__APOLLO_STATE__ = %(state)s;</script>
+%(body)s
+</body></html>
+"""
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+def write_test_page(directory: str, page_file: str = None) -> str:
+    """
+    Write the page to serve into the server directory.
+
+    Args:
+        directory: Directory served by the local HTTP server
+        page_file: Optional HTML file to serve instead of the built-in page
+
+    Returns:
+        Name of the file to request
+    """
+    if page_file:
+        with open(page_file, "r", encoding="utf-8") as f:
+            html = f.read()
+    else:
+        rows = "\n".join(f"<tr><td>Company {i}</td></tr>" for i in range(50))
+        state = json.dumps({"PublicInvestorProfile:1": {"position": "Partner"}})
+        head = "".join(f'<link rel="stylesheet" href="{path}">' for path in TEST_ASSETS if path.endswith(".css"))
+        body = "".join(
+            f'<img src="{path}">' if path.endswith(".png") else f'<script src="{path}"></script>'
+            for path in TEST_ASSETS if not path.endswith(".css")
+        )
+        html = TEST_PAGE % {"rows": rows, "state": state, "head": head, "body": body}
+        
+        for path, content in TEST_ASSETS.items():
+            os.makedirs(os.path.join(directory, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(directory, path), "wb") as f:
+                f.write(content)
+
+    with open(os.path.join(directory, "profile.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+    return "profile.html"
+
+def start_server(directory: str) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start a local HTTP server in a background thread.
+
+    Args:
+        directory: Directory to serve
+
+    Returns:
+        Tuple of (server, base URL)
+    """
+    handler = partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def count_routes(counter: Dict[str, int]) -> None:
+    """
+    Wrap Page.route and BrowserContext.route so every request handed to a
+    Python route handler is counted.
+
+    Contexts may be prepared before the page they serve is loaded, so the
+    classes are patched rather than single instances.
+
+    Args:
+        counter: Dictionary whose "routed" entry is incremented
+    """
+    from playwright.async_api import BrowserContext, Page
+
+    def wrap(original_route: Callable) -> Callable:
+        async def route(self: Any, url: Any, handler: Callable, **kwargs) -> None:
+            async def counted(playwright_route: Any) -> None:
+                counter["routed"] += 1
+                result = handler(playwright_route)
+                if asyncio.iscoroutine(result):
+                    await result
+            await original_route(self, url, counted, **kwargs)
+        return route
+
+    Page.route = wrap(Page.route)
+    BrowserContext.route = wrap(BrowserContext.route)
+
+async def open_context(scraper: BrowserScraper, interception: str) -> Any:
+    """
+    Open a context for one page load.
+
+    The narrow setup uses the scraper's own preparation, which installs the
+    context-level routes. The other setups get a bare context with only the
+    stealth bundle, so their page routes are the only ones.
+
+    Args:
+        scraper: Scraper whose browser pool is used
+        interception: "off", "legacy" or "narrow"
+
+    Returns:
+        Browser context, to be handed back with scraper.release_context
+    """
+    if interception == "narrow":
+        return await scraper.new_context()
+
+    context_options = scraper.get_context_options()
+    context = await scraper.get_browser_pool().new_context(**context_options)
+    context.set_default_timeout(scraper.timeout)
+    if scraper.stealth_mode:
+        await context.add_init_script(script=scraper.get_stealth_script(context_options))
+        await context.set_extra_http_headers(CONTEXT_HEADERS)
+    return context
+
+async def apply_legacy_interception(scraper: BrowserScraper, page: Any, stats: ResourceStats) -> None:
+    """
+    Install the catch-all routes used before interception was narrowed.
+
+    Args:
+        scraper: Scraper providing the route handlers and resource policy
+        page: Playwright page instance
+        stats: Per-page resource counters
+    """
+    await page.route("**/*", scraper._add_realistic_headers)
+    for pattern in LEGACY_DETECTION_GLOBS:
+        await page.route(pattern, scraper._handle_detection_script)
+
+    async def handle(route: Any) -> None:
+        request = route.request
+        if scraper.resource_policy.should_block(request.resource_type, request.url):
+            stats.record_blocked(request.resource_type)
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await page.route("**/*", handle)
+
+async def load_page(
+    scraper: BrowserScraper,
+    url: str,
+    stealth: str,
+    interception: str,
+    counter: Dict[str, int]
+) -> Dict[str, float]:
+    """
+    Load the test page once and time each phase.
+
+    Args:
+        scraper: Scraper whose browser pool is used
+        url: URL of the test page
+        stealth: "off", "page" or "context"
+        interception: "off", "legacy" or "narrow"
+        counter: Routed request counter installed by count_routes
+
+    Returns:
+        Dictionary of phase durations in seconds, plus the number of routed requests
+    """
+    started = time.perf_counter()
+    scraper.stealth_mode = stealth == "context"
+    counter["routed"] = 0
+    context = await open_context(scraper, interception)
+    timings = {}
+
+    try:
+        page = await context.new_page()
+        if stealth == "page":
+            # The per-page setup used before the context-level bundle
+            fingerprint = scraper.get_browser_fingerprint()
+            await page.evaluate(FINGERPRINT_PATCH_JS, fingerprint)
+            await page.evaluate(STEALTH_PATCH_JS, fingerprint)
+
+        stats = ResourceStats()
+        if interception == "legacy":
+            await apply_legacy_interception(scraper, page, stats)
+        elif interception == "narrow":
+            stats = scraper.get_resource_stats(context)
+            await scraper.intercept_bot_checks(page, url)
+        timings["setup"] = time.perf_counter() - started
+
+        navigate_started = time.perf_counter()
+        await page.goto(url, wait_until="load")
+        timings["navigate"] = time.perf_counter() - navigate_started
+
+        # 1 if the stealth patches survived navigation onto the page itself
+        timings["patched"] = float(not await page.evaluate("() => navigator.webdriver === true"))
+        timings["routed"] = float(counter["routed"])
+        timings["blocked"] = float(stats.blocked_requests)
+    finally:
+        await scraper.release_context(context)
+
+    timings["total"] = time.perf_counter() - started
+    return timings
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Reduce the per-page samples to medians in milliseconds.
+
+    Args:
+        samples: Phase timings of each page load
+
+    Returns:
+        Dictionary of median phase durations in milliseconds, the patched
+        share and the mean number of routed and blocked requests per page
+    """
+    summary = {}
+    for phase in ("setup", "navigate", "total"):
+        summary[f"{phase}_ms"] = round(statistics.median(s[phase] for s in samples) * 1000, 1)
+    for key in ("patched", "routed", "blocked"):
+        summary[key] = round(sum(s[key] for s in samples) / len(samples), 2)
+    return summary
+
+async def run(
+    args: argparse.Namespace,
+    url: str,
+    cache_dir: str
+) -> Tuple[Dict[Tuple[str, str], Dict[str, float]], Dict[str, Any]]:
+    """
+    Run every requested combination of setups against the test page.
+
+    Args:
+        args: Parsed command line arguments
+        url: URL of the test page
+        cache_dir: Directory for the browser caches when --browser-cache is given
+
+    Returns:
+        Tuple of (summaries by (stealth, interception), context pool statistics)
+    """
+    counter = {"routed": 0}
+    count_routes(counter)
+    results = {}
+    pool_stats = {}
+
+    for stealth in args.stealth:
+        for interception in args.interception:
+            # A scraper per setup, so prepared contexts never carry another setup's scripts
+            scraper = BrowserScraper(
+                headless=True,
+                browser_type=args.browser,
+                pacing=PacingPolicy(scale=0),
+                resource_policy=args.resource_policy,
+                screenshot_policy="off",
+                warm_contexts=args.warm_contexts,
+                storage_state=os.path.join(cache_dir, "storage_state.json") if args.browser_cache else None,
+                asset_cache=os.path.join(cache_dir, "http_cache") if args.browser_cache else None
+            )
+            scraper.stealth_mode = stealth == "context"
+            try:
+                # Start the browser before timing anything
+                await scraper.get_browser_pool().start()
+
+                samples = [
+                    await load_page(scraper, url, stealth, interception, counter)
+                    for _ in range(args.pages)
+                ]
+                results[(stealth, interception)] = summarize(samples)
+                if scraper.context_pool is not None:
+                    pool_stats[(stealth, interception)] = scraper.context_pool.get_statistics()
+                if scraper.asset_cache is not None:
+                    logger.info(f"Asset cache: {scraper.asset_cache.get_statistics()}")
+                logger.info(f"stealth={stealth} interception={interception}: {results[(stealth, interception)]}")
+            finally:
+                await scraper.shutdown()
+    return results, pool_stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-page browser setup against a local page")
+    parser.add_argument("--pages", type=int, default=20, help="Number of page loads per mode (default: 20)")
+    parser.add_argument("--stealth", default="page,context",
+                        help="Comma-separated stealth setups to compare: off, page, context (default: page,context)")
+    parser.add_argument("--interception", default="narrow",
+                        help="Comma-separated interception setups to compare: off, legacy, narrow (default: narrow)")
+    parser.add_argument("--resource-policy", choices=list(RESOURCE_POLICIES), default="no-media",
+                        help="Resource policy used for the routes (default: no-media)")
+    parser.add_argument("--warm-contexts", type=int, default=0,
+                        help="Prepared contexts kept ready for the narrow setup (default: 0)")
+    parser.add_argument("--browser-cache", action="store_true",
+                        help="Reuse storage state and static assets between loads")
+    parser.add_argument("--page", help="HTML file to serve instead of the built-in test page")
+    parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], default="chromium",
+                        help="Browser to use (default: chromium)")
+    args = parser.parse_args()
+
+    for option, choices in (("stealth", STEALTH_MODES), ("interception", INTERCEPTION_MODES)):
+        modes = [mode.strip() for mode in getattr(args, option).split(",") if mode.strip()]
+        unknown = [mode for mode in modes if mode not in choices]
+        if unknown:
+            logger.error(f"Unknown {option} modes: {', '.join(unknown)} (choose from {', '.join(choices)})")
+            sys.exit(1)
+        setattr(args, option, modes)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = write_test_page(directory, args.page)
+        server, base_url = start_server(directory)
+        try:
+            results, pool_stats = asyncio.run(run(args, f"{base_url}/{filename}", os.path.join(directory, ".cache")))
+        finally:
+            server.shutdown()
+
+    print("\nMedian per-page timings (routed/blocked are per-page means):")
+    print(f"{'stealth':<10}{'interception':<14}{'setup ms':>10}{'navigate ms':>13}{'total ms':>10}"
+          f"{'routed':>8}{'blocked':>9}{'patched':>9}")
+    for (stealth, interception), summary in results.items():
+        print(f"{stealth:<10}{interception:<14}{summary['setup_ms']:>10}{summary['navigate_ms']:>13}"
+              f"{summary['total_ms']:>10}{summary['routed']:>8}{summary['blocked']:>9}{summary['patched']:>9}")
+
+    if pool_stats:
+        print("\nContext acquire latency (mean/max ms):")
+        for (stealth, interception), stats in pool_stats.items():
+            warm, cold = stats['warm_acquires'], stats['cold_acquires']
+            print(f"{stealth:<10}{interception:<14}warm {warm['count']} x {warm['mean_ms']}/{warm['max_ms']}  "
+                  f"cold {cold['count']} x {cold['mean_ms']}/{cold['max_ms']}  "
+                  f"target size {stats['target_size']}")
+
+if __name__ == "__main__":
+    main()
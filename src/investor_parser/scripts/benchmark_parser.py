@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Benchmark locating the Apollo state and parsing profile pages.
+
+Every page is timed three ways, repeated a number of times:
+
+- soup: the former lookup, which parsed the whole page with BeautifulSoup
+  to search its script tags for the Apollo state
+- string: find_apollo_state() on the raw HTML, as the parser does now
+- parse: a full InvestorProfileParser(...).parse(), including the HTML
+  fallback for pages that need it
+
+The median time per page of each is printed, with the number of pages
+whose parse still built the soup.
+
+Usage:
+    python -m src.investor_parser.scripts.benchmark_parser [--pages PATH ...] [--repeat N]
+
+Options:
+    --pages PATH   HTML files and page store directories to time (default: data/debug_page.html)
+    --repeat N     Timed runs per page (default: 20)
+    --limit N      Limit number of pages
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.investor_parser.core.page_format import find_apollo_state
+from src.investor_parser.core.parser import InvestorProfileParser, load_graphql_payloads
+from src.investor_parser.core.storage import HTMLStore
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+def iter_pages(paths: List[str]) -> Iterator[Tuple[str, str, Optional[List[Dict[str, Any]]]]]:
+    """
+    Read the pages to time.
+
+    Args:
+        paths: HTML files and directories of HTML files, flat, sharded or compressed
+
+    Yields:
+        Tuples of (path, HTML content, GraphQL responses or None)
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            html_store = HTMLStore(path)
+            for html_file, html_content in html_store.iter_pages():
+                yield html_file, html_content, html_store.get_payloads(html_file)
+        elif os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                yield path, f.read(), load_graphql_payloads(path)
+        else:
+            logger.warning(f"Skipping missing path {path}")
+
+def soup_lookup(html_content: str) -> Any:
+    """
+    Locate the Apollo state the way the parser did before the string search.
+
+    Args:
+        html_content: HTML of the page
+
+    Returns:
+        Apollo state, or None
+    """
+    for script in BeautifulSoup(html_content, 'lxml').find_all('script'):
+        if script.string and '__APOLLO_STATE__' in script.string:
+            found = find_apollo_state(script.string)
+            if found:
+                return found[0]
+    return None
+
+def median_ms(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Time a function.
+
+    Args:
+        function: Function to call
+        repeat: Number of timed calls
+
+    Returns:
+        Median duration in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark locating the Apollo state and parsing profile pages")
+    parser.add_argument("--pages", nargs="*", default=["data/debug_page.html"],
+                        help="HTML files and directories to time (default: data/debug_page.html)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per page (default: 20)")
+    parser.add_argument("--limit", type=int, help="Limit number of pages")
+    args = parser.parse_args()
+
+    results: Dict[str, List[float]] = {"soup": [], "string": [], "parse": []}
+    soup_built = 0
+    pages = 0
+    for html_file, html_content, payloads in iter_pages(args.pages):
+        if args.limit is not None and pages >= args.limit:
+            break
+
+        # The faster lookup has to find the same state
+        fast = find_apollo_state(html_content)
+        if (fast[0] if fast else None) != soup_lookup(html_content):
+            logger.warning(f"{html_file}: the string search and the soup find different Apollo states")
+
+        results["soup"].append(median_ms(lambda: soup_lookup(html_content), args.repeat))
+        results["string"].append(median_ms(lambda: find_apollo_state(html_content), args.repeat))
+        results["parse"].append(median_ms(
+            lambda: InvestorProfileParser(html_content, html_file, payloads).parse(), args.repeat))
+
+        profile_parser = InvestorProfileParser(html_content, html_file, payloads)
+        profile_parser.parse()
+        soup_built += profile_parser._soup is not None
+        pages += 1
+
+    if not pages:
+        logger.error("No pages to time")
+        sys.exit(1)
+
+    print(f"\nMedian ms per page over {pages} pages, {args.repeat} runs each:")
+    print(f"{'lookup':<10}{'median':>10}{'max':>10}")
+    for name, timings in results.items():
+        print(f"{name:<10}{statistics.median(timings):>10.3f}{max(timings):>10.3f}")
+    string_ms = max(statistics.median(results["string"]), 1e-6)
+    print(f"\nString search is {statistics.median(results['soup']) / string_ms:.0f}x faster than the soup lookup")
+    print(f"The HTML fallback built the soup for {soup_built} of {pages} pages")
+
+if __name__ == "__main__":
+    main()
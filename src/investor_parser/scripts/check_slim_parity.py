@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Check that the parser reads the same data from slim pages as from full ones.
+
+Every page of the corpus is parsed as saved and after slim_page(), both
+with the regular parse and with the HTML fallback alone, and the results
+are compared. Reports the pages that differ and the size of the slim pages.
+
+Usage:
+    python -m src.investor_parser.scripts.check_slim_parity
+    python -m src.investor_parser.scripts.check_slim_parity --pages data/debug_page.html saved/
+    python -m src.investor_parser.scripts.check_slim_parity --no-store --limit 100
+
+Exits with status 1 if any page parses differently.
+"""
+
+import os
+import sys
+import gzip
+import logging
+import argparse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.investor_parser.core.parser import InvestorProfileParser, load_graphql_payloads
+from src.investor_parser.core.page_slim import slim_page
+from src.investor_parser.core.storage import HTMLStore, open_page_store
+
+# Set up logging
+os.makedirs("logs", exist_ok=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.FileHandler("logs/slim_parity.log"),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Pages checked when none are given
+DEFAULT_PAGES = ["data/debug_page.html"]
+
+def iter_store(html_store: Any) -> Iterator[Tuple[str, str, Optional[List[Dict[str, Any]]]]]:
+    """
+    Read every page of a page store with the GraphQL responses kept for it.
+
+    Args:
+        html_store: HTMLStore or PageArchive
+
+    Yields:
+        Tuples of (path, HTML content, GraphQL responses or None)
+    """
+    for html_file, html_content in html_store.iter_pages():
+        yield html_file, html_content, html_store.get_payloads(html_file)
+
+def iter_corpus(paths: List[str], use_store: bool = True) -> Iterator[Tuple[str, str, Optional[List[Dict[str, Any]]]]]:
+    """
+    Read the pages to check.
+
+    Args:
+        paths: HTML files and directories of HTML files, flat, sharded or compressed
+        use_store: Also read every page of the data/html page store
+
+    Yields:
+        Tuples of (path, HTML content, GraphQL responses or None)
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_store(HTMLStore(path))
+        elif os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                yield path, f.read(), load_graphql_payloads(path)
+        else:
+            logger.warning(f"Skipping missing path {path}")
+
+    if use_store:
+        yield from iter_store(open_page_store())
+
+def compare_page(html_file: str, html_content: str, slim_content: str,
+                 payloads: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+    """
+    Parse a page in full and slim form and compare the results.
+
+    Args:
+        html_file: Path of the page
+        html_content: HTML content of the page
+        slim_content: Slim version of the page
+        payloads: GraphQL responses captured with the page
+
+    Returns:
+        Names of the fields that differ, prefixed with "html." for the HTML fallback
+    """
+    full = InvestorProfileParser(html_content, html_file, payloads)
+    slim = InvestorProfileParser(slim_content, html_file, payloads)
+
+    differences = []
+    for prefix, full_data, slim_data in (
+        ("", full.parse(), slim.parse()),
+        ("html.", full._parse_from_html(), slim._parse_from_html()),
+    ):
+        for field in sorted(set(full_data) | set(slim_data)):
+            if full_data.get(field) != slim_data.get(field):
+                differences.append(f"{prefix}{field}")
+    return differences
+
+def main():
+    """
+    Main function for the slim page parity check.
+    """
+    parser = argparse.ArgumentParser(description="Check that slim pages parse like full pages")
+    parser.add_argument("--pages", nargs="*", default=DEFAULT_PAGES,
+                        help="HTML files and directories to check (default: data/debug_page.html)")
+    parser.add_argument("--no-store", action="store_true", help="Do not check the pages saved in data/html")
+    parser.add_argument("--limit", type=int, help="Limit number of pages to check")
+    args = parser.parse_args()
+
+    stats: Dict[str, Any] = {"pages": 0, "mismatches": 0, "bytes": 0, "slim_bytes": 0,
+                             "gzip_bytes": 0, "slim_gzip_bytes": 0}
+    for html_file, html_content, payloads in iter_corpus(args.pages, not args.no_store):
+        if args.limit is not None and stats["pages"] >= args.limit:
+            break
+        try:
+            slim_content = slim_page(html_content)
+            differences = compare_page(html_file, html_content, slim_content, payloads)
+        except Exception as e:
+            logger.error(f"Error checking {html_file}: {str(e)}")
+            stats["mismatches"] += 1
+            continue
+
+        stats["pages"] += 1
+        if differences:
+            stats["mismatches"] += 1
+            logger.error(f"{html_file} parses differently when slim: {', '.join(differences)}")
+
+        body = html_content.encode("utf-8")
+        slim_body = slim_content.encode("utf-8")
+        stats["bytes"] += len(body)
+        stats["slim_bytes"] += len(slim_body)
+        stats["gzip_bytes"] += len(gzip.compress(body))
+        stats["slim_gzip_bytes"] += len(gzip.compress(slim_body))
+
+    if not stats["pages"]:
+        logger.error("No pages to check")
+        sys.exit(1)
+
+    logger.info(f"Checked {stats['pages']} pages, {stats['mismatches']} parse differently when slim")
+    logger.info(f"Bytes per page: {stats['bytes'] // stats['pages']} full, "
+                f"{stats['slim_bytes'] // stats['pages']} slim "
+                f"({stats['bytes'] / max(stats['slim_bytes'], 1):.1f}x smaller)")
+    logger.info(f"Gzipped bytes per page: {stats['gzip_bytes'] // stats['pages']} full, "
+                f"{stats['slim_gzip_bytes'] // stats['pages']} slim "
+                f"({stats['gzip_bytes'] / max(stats['slim_gzip_bytes'], 1):.1f}x smaller)")
+    if stats["mismatches"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,21 @@ Migrate data from legacy 'output/' directory to new 'data/' directory.
 
 This script is used to consolidate all data storage to the 'data/' folder.
 It performs the following actions:
-1. Moves HTML files from output/html/ to data/html/
-2. Moves investor_urls.txt from output/ to data/
-3. Moves investor_data.json from output/ to data/output/
-4. Updates queue state files to use new paths
+1. Links HTML files from output/html/ into the data/html/ page store
+2. Compresses plain HTML files already in data/html/ into the store
+3. Moves the remaining flat files of data/html/ into hash-prefix shards
+4. Moves investor_urls.txt from output/ to data/
+5. Moves investor_data.json from output/ to data/output/
+6. Updates queue state files to use new paths
 
 Usage:
     python -m src.investor_parser.scripts.migrate_data
+    python -m src.investor_parser.scripts.migrate_data --method rename
+
+Pages are hardlinked by default, so output/ stays intact without taking
+more disk space; between filesystems they are copied by parallel threads.
+Finished files are recorded in data/html/migration.jsonl, so an
+interrupted migration resumes where it stopped.
 
 After running this script, the old output/ directory can be safely deleted
 if all data was successfully migrated.
@@ -18,11 +26,16 @@ if all data was successfully migrated.
 
 import os
 import shutil
-import glob
-import json
 import logging
+import argparse
 from pathlib import Path
 
+from src.investor_parser.core.storage import (
+    open_page_store, page_name, resolve_page_path, migrate_legacy_pages, TRANSFER_METHODS
+)
+from src.investor_parser.core.storage.layout import WALK_WORKERS
+from src.investor_parser.core.queue import rewrite_output_paths
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,40 +52,43 @@ os.makedirs("data/html", exist_ok=True)
 os.makedirs("data/output", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
-def migrate_html_files():
+def migrate_html_files(method: str = "link", workers: int = WALK_WORKERS):
     """
-    Migrate HTML files from output/html/ to data/html/.
+    Migrate HTML files from output/html/ into the data/html/ page store.
+    
+    Args:
+        method: link, rename or copy
+        workers: Threads transferring files
     """
     if not os.path.exists("output/html"):
         logger.info("No output/html directory found, skipping HTML migration")
         return 0
     
-    html_files = glob.glob("output/html/*.html")
-    if not html_files:
+    stats = migrate_legacy_pages("output/html", open_page_store(), method, workers=workers)
+    migrated_count = sum(stats[key] for key in TRANSFER_METHODS + ("streamed",))
+    if not migrated_count and not stats["skipped"]:
         logger.info("No HTML files found in output/html/")
         return 0
     
-    logger.info(f"Found {len(html_files)} HTML files to migrate")
-    
-    migrated_count = 0
-    for html_file in html_files:
-        filename = os.path.basename(html_file)
-        dest_path = os.path.join("data/html", filename)
-        
-        if os.path.exists(dest_path):
-            logger.info(f"File already exists in data/html/: {filename}, skipping")
-            continue
-        
-        try:
-            shutil.copy2(html_file, dest_path)
-            logger.info(f"Migrated {html_file} -> {dest_path}")
-            migrated_count += 1
-        except Exception as e:
-            logger.error(f"Error migrating {html_file}: {str(e)}")
-    
     logger.info(f"Successfully migrated {migrated_count} HTML files")
     return migrated_count
 
+def compress_html_files():
+    """
+    Move plain HTML files in data/html/ into the page store.
+    """
+    html_store = open_page_store()
+    imported = html_store.import_loose_files()
+    logger.info(f"HTML store statistics: {html_store.get_statistics()}")
+    return imported
+
+def shard_html_files():
+    """
+    Move GraphQL responses and plain pages of the flat layout in data/html/ into shards.
+    """
+    stats = open_page_store().migrate_layout()
+    return stats["moved"]
+
 def migrate_investor_urls():
     """
     Migrate investor_urls.txt from output/ to data/.
@@ -158,41 +174,30 @@ def update_queue_state():
     Update queue state file to use new paths.
     """
     state_file = "data/queue_state.json"
+    source_file = state_file
     
     if not os.path.exists(state_file):
         # Check if there's a legacy state file
         legacy_state_file = "output/queue_state.json"
         if os.path.exists(legacy_state_file):
-            try:
-                shutil.copy2(legacy_state_file, state_file)
-                logger.info(f"Migrated {legacy_state_file} -> {state_file}")
-            except Exception as e:
-                logger.error(f"Error migrating {legacy_state_file}: {str(e)}")
-                return False
+            source_file = legacy_state_file
         else:
             logger.info(f"No queue state file found, skipping update")
             return True
     
-    # Update output paths in the queue state
+    def rewrite(output_path):
+        if "output/html" in output_path:
+            return resolve_page_path(page_name(output_path))
+        return None
+    
+    # Update output paths while copying or rewriting the queue state in one pass
     try:
-        with open(state_file, "r") as f:
-            data = json.load(f)
-        
-        # Update paths in items
-        updated = 0
-        for item in data.get("items", []):
-            if item.get("output_path") and "output/html" in item["output_path"]:
-                old_path = item["output_path"]
-                new_path = old_path.replace("output/html", "data/html")
-                item["output_path"] = new_path
-                updated += 1
+        updated = rewrite_output_paths(source_file, rewrite, state_file)
+        if source_file != state_file:
+            logger.info(f"Migrated {source_file} -> {state_file}")
         
         if updated > 0:
             logger.info(f"Updated {updated} paths in queue state")
-            
-            # Save updated state
-            with open(state_file, "w") as f:
-                json.dump(data, f, indent=2)
         else:
             logger.info("No paths needed to be updated in queue state")
         
@@ -205,10 +210,23 @@ def main():
     """
     Main function to migrate all data.
     """
+    parser = argparse.ArgumentParser(description="Migrate data from output/ to data/")
+    parser.add_argument("--method", choices=list(TRANSFER_METHODS), default="link",
+                        help="Link HTML files (default), move them, or copy them into data/html")
+    parser.add_argument("--workers", type=int, default=WALK_WORKERS,
+                        help=f"Threads transferring HTML files (default: {WALK_WORKERS})")
+    args = parser.parse_args()
+    
     logger.info("Starting data migration from output/ to data/")
     
     # Migrate HTML files
-    html_count = migrate_html_files()
+    html_count = migrate_html_files(args.method, args.workers)
+    
+    # Compress plain HTML files
+    compressed_count = compress_html_files()
+    
+    # Shard the remaining flat files
+    sharded_count = shard_html_files()
     
     # Migrate investor URLs
     urls_migrated = migrate_investor_urls()
@@ -222,6 +240,8 @@ def main():
     # Summary
     logger.info("\nMigration summary:")
     logger.info(f"- HTML files: {html_count} migrated")
+    logger.info(f"- Plain HTML files: {compressed_count} compressed")
+    logger.info(f"- Flat files: {sharded_count} moved into shards")
     logger.info(f"- Investor URLs: {'Success' if urls_migrated else 'Failed'}")
     logger.info(f"- Investor data: {'Success' if data_migrated else 'Failed'}")
     logger.info(f"- Queue state: {'Success' if state_updated else 'Failed'}")
@@ -2,7 +2,6 @@
 
 import os
 import json
-import glob
 import logging
 import shutil
 from pathlib import Path
@@ -17,6 +16,8 @@ except ImportError:
     sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))))
     from custom_parser import InvestorProfileParser
 
+from src.investor_parser.core.storage import HTMLStore, open_page_store, migrate_legacy_pages
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,22 +35,13 @@ os.makedirs("logs", exist_ok=True)
 
 def migrate_legacy_files():
     """Migrate files from legacy output/ directory to data/ directory."""
-    # Migrate HTML files
+    # Link HTML files the data/html store doesn't have yet, resuming an interrupted migration
     if os.path.exists("output/html"):
         logger.info("Checking for HTML files in legacy output/html directory")
-        html_files = glob.glob("output/html/*.html")
-        if html_files:
-            logger.info(f"Found {len(html_files)} HTML files to migrate from output/html to data/html")
-            os.makedirs("data/html", exist_ok=True)
-            
-            for html_file in html_files:
-                filename = os.path.basename(html_file)
-                dest_path = os.path.join("data/html", filename)
-                
-                # Only copy if the file doesn't exist in the data/html directory
-                if not os.path.exists(dest_path):
-                    logger.info(f"Migrating {html_file} -> {dest_path}")
-                    shutil.copy2(html_file, dest_path)
+        migrate_legacy_pages("output/html", open_page_store())
+    
+    # Move pages and GraphQL responses of the flat layout into shards
+    open_page_store().migrate_layout()
     
     # Migrate investor data files
     if os.path.exists("output/investor_data.json") and not os.path.exists("data/output/investor_data.json"):
@@ -68,27 +60,23 @@ def main():
     migrate_legacy_files()
     
     # Find all HTML files
-    html_files = glob.glob("data/html/*.html")
-    if not html_files:
+    html_store = open_page_store()
+    if not html_store.names():
         # Try the old path as fallback
-        old_path_files = glob.glob("output/html/*.html")
-        if old_path_files:
-            html_files = old_path_files
+        legacy_store = HTMLStore("output/html")
+        if legacy_store.names():
+            html_store = legacy_store
             logger.info(f"Using HTML files from legacy path: output/html/")
     
-    logger.info(f"Found {len(html_files)} HTML files to process")
+    logger.info(f"Found {len(html_store.names())} HTML files to process")
     
-    # Process each HTML file
+    # Process each HTML file, reading one page at a time
     results = []
-    for html_file in html_files:
+    for html_file, html_content in html_store.iter_pages():
         logger.info(f"Processing {html_file}")
         try:
-            # Read HTML content
-            with open(html_file, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            
-            # Parse investor profile
-            parser = InvestorProfileParser(html_content, html_file)
+            # Parse investor profile, with the GraphQL responses the store keeps for it
+            parser = InvestorProfileParser(html_content, html_file, html_store.get_payloads(html_file))
             investor_data = parser.parse()
             
             # Add to results
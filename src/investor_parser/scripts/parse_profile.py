@@ -16,12 +16,17 @@ import json
 
 # Try to import from src structure (if installed as package)
 try:
-    from src.investor_parser.core.parser import InvestorProfileParser
+    from src.investor_parser.core.parser import InvestorProfileParser, load_graphql_payloads
 except ImportError:
     # Fallback to local import
     sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))))
     from custom_parser import InvestorProfileParser
 
+    def load_graphql_payloads(html_file):
+        return None
+
+from src.investor_parser.core.storage import open_page_store, store_root
+
 def main():
     # Create output and logs directories if they don't exist
     os.makedirs('data/output', exist_ok=True)
@@ -30,16 +35,19 @@ def main():
     # Default to Rick Thompson's profile if no arg provided
     html_file = sys.argv[1] if len(sys.argv) > 1 else "data/html/investors-rick-thompson.html"
     
-    if not os.path.exists(html_file):
-        print(f"File not found: {html_file}")
-        sys.exit(1)
-    
-    # Read the HTML file
-    with open(html_file, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    # Plain files are read as they are, anything else from the HTML store
+    if os.path.isfile(html_file):
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+    else:
+        html_store = open_page_store(root=store_root(html_file) or "data/html")
+        if not html_store.exists(html_file):
+            print(f"File not found: {html_file}")
+            sys.exit(1)
+        html_content = html_store.get(html_file)
     
     # Parse the investor profile
-    parser = InvestorProfileParser(html_content, html_file)
+    parser = InvestorProfileParser(html_content, html_file, load_graphql_payloads(html_file))
     data = parser.parse()
     
     # Display the extracted information
@@ -5,10 +5,10 @@ import logging
 import argparse
 import subprocess
 import sys
-import re
-import glob
 from pathlib import Path
 
+from src.investor_parser.core.storage import find_missing_pages
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -67,54 +67,6 @@ def run_scraper(url_file: str, limit: int = None, use_proxy: bool = True, min_de
         logger.exception(f"Error running scraper: {str(e)}")
         return False
 
-def check_missing_html_files(url_file: str) -> list:
-    """
-    Check for missing HTML files based on URLs in the url_file.
-    
-    Args:
-        url_file: Path to file with URLs to check
-        
-    Returns:
-        List of URLs that need to be rescrapped
-    """
-    if not os.path.exists(url_file):
-        logger.error(f"URL file not found: {url_file}")
-        return []
-    
-    # Get all existing HTML files
-    existing_files = set()
-    for html_file in glob.glob("data/html/*.html"):
-        existing_files.add(os.path.basename(html_file))
-    
-    # Also check legacy path if it exists
-    if os.path.exists("output/html"):
-        for html_file in glob.glob("output/html/*.html"):
-            existing_files.add(os.path.basename(html_file))
-    
-    # Find missing files
-    missing_urls = []
-    
-    try:
-        with open(url_file, "r", encoding="utf-8") as f:
-            for line in f:
-                url = line.strip()
-                if not url or url.startswith("#"):
-                    continue
-                
-                # Extract the investor name from the URL
-                match = re.search(r"/investors/([^/]+)", url)
-                if match:
-                    investor_name = match.group(1)
-                    html_filename = f"investors-{investor_name}.html"
-                    
-                    if html_filename not in existing_files:
-                        missing_urls.append(url)
-    except Exception as e:
-        logger.error(f"Error checking missing files: {str(e)}")
-    
-    logger.info(f"Found {len(missing_urls)} missing HTML files that need to be rescrapped")
-    return missing_urls
-
 def run_scraper_for_missing_files(url_file: str, missing_urls: list, use_proxy: bool = True, min_delay: float = None, max_delay: float = None) -> bool:
     """
     Run the scraper specifically for missing HTML files.
@@ -227,7 +179,7 @@ def main():
     
     # Check for missing files
     if args.check_missing or not args.skip_scrape:
-        missing_urls = check_missing_html_files(args.url_file)
+        missing_urls = find_missing_pages(args.url_file)
         if missing_urls and not args.skip_scrape:
             run_scraper_for_missing_files(
                 args.url_file, 
@@ -3,30 +3,31 @@
 Check for missing HTML files based on URLs in investor_urls.txt and rescrape them.
 
 This script is used to:
-1. Compare URLs in the investor_urls.txt file with existing HTML files
-2. Identify any URLs that don't have corresponding HTML files
+1. Look up the URLs in the investor_urls.txt file in the page manifest
+2. Identify any URLs that don't have a saved page, or whose page is too old
 3. Rescrape those missing URLs
 
 Usage:
-    python -m src.investor_parser.scripts.rescrape_missing [--no-proxy] [--limit N]
+    python -m src.investor_parser.scripts.rescrape_missing [--no-proxy] [--limit N] [--max-age-days D]
 
 Options:
-    --no-proxy   Disable proxy usage
-    --limit N    Limit the number of URLs to rescrape
+    --no-proxy          Disable proxy usage
+    --limit N           Limit the number of URLs to rescrape
+    --max-age-days D    Also rescrape pages saved more than D days ago
 
 This is useful when HTML files have been deleted or corrupted and need to be
 regenerated without running the full scraper.
 """
 
 import os
-import re
-import glob
 import logging
 import argparse
 import subprocess
 import sys
 from pathlib import Path
 
+from src.investor_parser.core.storage import find_missing_pages
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,54 +43,6 @@ logger = logging.getLogger(__name__)
 os.makedirs("data/html", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
-def check_missing_html_files(url_file: str) -> list:
-    """
-    Check for missing HTML files based on URLs in the url_file.
-    
-    Args:
-        url_file: Path to file with URLs to check
-        
-    Returns:
-        List of URLs that need to be rescrapped
-    """
-    if not os.path.exists(url_file):
-        logger.error(f"URL file not found: {url_file}")
-        return []
-    
-    # Get all existing HTML files
-    existing_files = set()
-    for html_file in glob.glob("data/html/*.html"):
-        existing_files.add(os.path.basename(html_file))
-    
-    # Also check legacy path if it exists
-    if os.path.exists("output/html"):
-        for html_file in glob.glob("output/html/*.html"):
-            existing_files.add(os.path.basename(html_file))
-    
-    # Find missing files
-    missing_urls = []
-    
-    try:
-        with open(url_file, "r", encoding="utf-8") as f:
-            for line in f:
-                url = line.strip()
-                if not url or url.startswith("#"):
-                    continue
-                
-                # Extract the investor name from the URL
-                match = re.search(r"/investors/([^/]+)", url)
-                if match:
-                    investor_name = match.group(1)
-                    html_filename = f"investors-{investor_name}.html"
-                    
-                    if html_filename not in existing_files:
-                        missing_urls.append(url)
-    except Exception as e:
-        logger.error(f"Error checking missing files: {str(e)}")
-    
-    logger.info(f"Found {len(missing_urls)} missing HTML files that need to be rescrapped")
-    return missing_urls
-
 def rescrape_missing_files(missing_urls: list, use_proxy: bool = True, limit: int = None) -> bool:
     """
     Rescrape missing HTML files.
@@ -153,6 +106,8 @@ def main():
                         help="Disable proxy usage")
     parser.add_argument("--limit", type=int, 
                         help="Limit number of URLs to rescrape")
+    parser.add_argument("--max-age-days", type=float,
+                        help="Also rescrape pages saved more than this many days ago")
     args = parser.parse_args()
     
     # Check if URL file exists, try legacy path if not
@@ -166,7 +121,7 @@ def main():
             sys.exit(1)
     
     # Check for missing HTML files
-    missing_urls = check_missing_html_files(args.url_file)
+    missing_urls = find_missing_pages(args.url_file, max_age_days=args.max_age_days)
     
     if not missing_urls:
         logger.info("No missing HTML files found, all URLs have corresponding HTML files")
@@ -1,15 +1,31 @@
 #!/usr/bin/env python
 
 import os
+import queue
+import hashlib
 import logging
 import argparse
 import time
 import random
-from urllib.parse import urlparse, urlunparse
+import multiprocessing
+import threading
 from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from src.investor_parser.core.scraper import ProxyManager, BasicScraper, BrowserScraper
+from src.investor_parser.core.scraper import (
+    ProxyManager, BasicScraper, BrowserScraper, CircuitBreaker, CircuitOpenError, OutcomeRecorder,
+    RESOURCE_POLICIES, SCREENSHOT_MODES
+)
+from src.investor_parser.core.scraper.browser_scraper import PLAYWRIGHT_AVAILABLE, CAPTURE_MODES
 from src.investor_parser.core.queue.url_queue import URLQueue
+from src.investor_parser.core.storage import (
+    HTMLStore, PageArchive, PageManifest, ManifestEntry, WriteBehind, COMPRESSIONS, PAGE_STORES, open_page_store,
+    resolve_page_path
+)
+from src.investor_parser.core.page_format import page_slug, page_filename
+from src.investor_parser.core.page_slim import slim_page
 
 # Set up logging
 logging.basicConfig(
@@ -26,6 +42,19 @@ logger = logging.getLogger(__name__)
 os.makedirs("data/html", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
+def get_page_slug(url: str, name: str) -> str:
+    """
+    Get the slug a profile page is saved and tracked under.
+    
+    Args:
+        url: The URL of the investor profile
+        name: The investor name or identifier
+        
+    Returns:
+        Slug from the URL, or a sanitized name if the URL has no path
+    """
+    return page_slug(url) or name.lower().replace(' ', '-')
+
 def get_output_filename(url: str, name: str) -> str:
     """
     Generate an output filename for the HTML content.
@@ -37,53 +66,161 @@ def get_output_filename(url: str, name: str) -> str:
     Returns:
         Path to save the HTML content
     """
-    # Extract the slug from the URL
-    parsed_url = urlparse(url)
-    path_parts = parsed_url.path.strip('/').split('/')
+    return resolve_page_path(page_filename(get_page_slug(url, name)))
+
+def create_browser_scraper(proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None,
+                           circuit_breaker: CircuitBreaker = None, resource_policy: str = None,
+                           capture_mode: str = None, screenshots: str = None,
+                           warm_contexts: int = None, browser_cache: bool = True) -> BrowserScraper:
+    """
+    Create a browser scraper with custom delays if specified.
     
-    if path_parts and path_parts[-1].startswith('investors-'):
-        # Use the slug from the URL
-        filename = f"{path_parts[-1]}.html"
-    else:
-        # Fallback to a sanitized name
-        safe_name = name.lower().replace(' ', '-')
-        filename = f"investors-{safe_name}.html"
+    Args:
+        proxy_manager: Proxy manager instance
+        min_delay: Minimum delay between actions in seconds
+        max_delay: Maximum delay between actions in seconds
+        circuit_breaker: Circuit breaker shared by both scrapers
+        resource_policy: Name of the resource blocking policy, or None for the default
+        capture_mode: "dom" or "apollo", or None for the default
+        screenshots: Screenshot mode, or None for the default
+        warm_contexts: Maximum number of prepared browser contexts, or None for the default
+        browser_cache: Reuse storage state and static assets between profiles
+        
+    Returns:
+        BrowserScraper instance
+    """
+    browser_scraper_kwargs = {"proxy_manager": proxy_manager, "circuit_breaker": circuit_breaker}
+    if resource_policy is not None:
+        browser_scraper_kwargs["resource_policy"] = resource_policy
+    if capture_mode is not None:
+        browser_scraper_kwargs["capture_mode"] = capture_mode
+    if screenshots is not None:
+        browser_scraper_kwargs["screenshot_policy"] = screenshots
+    if warm_contexts is not None:
+        browser_scraper_kwargs["warm_contexts"] = warm_contexts
+    if not browser_cache:
+        browser_scraper_kwargs["storage_state"] = None
+        browser_scraper_kwargs["asset_cache"] = None
+    if min_delay is not None and max_delay is not None:
+        browser_scraper_kwargs["min_delay"] = min_delay
+        browser_scraper_kwargs["max_delay"] = max_delay
     
-    return os.path.join("data/html", filename)
+    return BrowserScraper(**browser_scraper_kwargs)
 
-def process_url(url: str, name: str, proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None) -> str:
+@dataclass
+class FetchedPage:
     """
-    Process a single URL:
-    1. Try basic scraper first
-    2. If dynamic content detected, use browser automation
-    3. Save HTML content
+    A fetched page together with how it was fetched.
+    """
+    html: str
+    graphql_payloads: List[Dict[str, Any]] = field(default_factory=list)
+    route: str = "static"  # static, browser
+    record_count: Optional[int] = None
+    static_checked: bool = False  # the static fetch was tried for this page
+    static_failed: bool = False  # the static fetch was tried but returned no page
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+def fetch_static(url: str, proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None,
+                 circuit_breaker: CircuitBreaker = None) -> Tuple[Optional[str], bool]:
+    """
+    Fetch a URL with the basic scraper.
     
     Args:
-        url: URL to process
-        name: Investor name or identifier
+        url: Standardized URL to fetch
         proxy_manager: Proxy manager instance
         min_delay: Minimum delay between requests in seconds
         max_delay: Maximum delay between requests in seconds
+        circuit_breaker: Circuit breaker shared by both scrapers
         
     Returns:
-        Path to saved HTML file or None if failed
+        Tuple of (HTML content or None if failed, needs browser automation flag)
+        
+    Raises:
+        CircuitOpenError: If the circuit breaker opened while fetching the URL
     """
-    logger.info(f"Processing URL: {url} ({name})")
-    
-    # Standardize the URL
-    if not url.startswith(('http://', 'https://')):
-        url = f"https://{url}"
-    
     # Create basic scraper with custom delays if specified
-    basic_scraper_kwargs = {"proxy_manager": proxy_manager}
+    basic_scraper_kwargs = {"proxy_manager": proxy_manager, "circuit_breaker": circuit_breaker}
     if min_delay is not None and max_delay is not None:
         basic_scraper_kwargs["min_delay"] = min_delay
         basic_scraper_kwargs["max_delay"] = max_delay
     
     basic_scraper = BasicScraper(**basic_scraper_kwargs)
+    return basic_scraper.fetch(url)
+
+def fetch_browser(url: str, proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None,
+                  circuit_breaker: CircuitBreaker = None, browser_scraper: BrowserScraper = None,
+                  static_checked: bool = False, static_failed: bool = False) -> Optional[FetchedPage]:
+    """
+    Fetch a URL with browser automation.
+    
+    Args:
+        url: Standardized URL to fetch
+        proxy_manager: Proxy manager instance
+        min_delay: Minimum delay between actions in seconds
+        max_delay: Maximum delay between actions in seconds
+        circuit_breaker: Circuit breaker shared by both scrapers
+        browser_scraper: Long-lived browser scraper to reuse; a temporary one is created otherwise
+        static_checked: True if the static fetch was already tried for this page
+        static_failed: True if that static fetch returned no page
+        
+    Returns:
+        FetchedPage or None if failed
+        
+    Raises:
+        CircuitOpenError: If the circuit breaker opened while fetching the URL
+    """
+    if browser_scraper is not None:
+        # Fetch using the shared browser
+        result = browser_scraper.fetch_page(url)
+    else:
+        with create_browser_scraper(proxy_manager, min_delay, max_delay, circuit_breaker) as temp_scraper:
+            result = temp_scraper.fetch_page(url)
+    
+    if result is None:
+        logger.error(f"Browser automation failed for {url}")
+        return None
+    
+    return FetchedPage(
+        html=result.html,
+        graphql_payloads=result.graphql_payloads,
+        route="browser",
+        record_count=result.record_count,
+        static_checked=static_checked,
+        static_failed=static_failed
+    )
+
+def fetch_url(url: str, proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None,
+              circuit_breaker: CircuitBreaker = None, browser_scraper: BrowserScraper = None,
+              route: str = "static") -> Optional[FetchedPage]:
+    """
+    Fetch a single URL:
+    1. Try basic scraper first, unless the URL is known to need the browser
+    2. If dynamic content detected, use browser automation
+    
+    Args:
+        url: Standardized URL to fetch
+        proxy_manager: Proxy manager instance
+        min_delay: Minimum delay between requests in seconds
+        max_delay: Maximum delay between requests in seconds
+        circuit_breaker: Circuit breaker shared by both scrapers
+        browser_scraper: Long-lived browser scraper to reuse; a temporary one is created otherwise
+        route: "static" to try the basic scraper first, "browser" to go straight to the browser
+        
+    Returns:
+        FetchedPage or None if failed
+        
+    Raises:
+        CircuitOpenError: If the circuit breaker opened while fetching the URL
+    """
+    if route == "browser":
+        logger.info(f"{url} needed the browser before, skipping the basic scraper")
+        return fetch_browser(url, proxy_manager, min_delay, max_delay, circuit_breaker, browser_scraper)
     
     # Try basic scraping first
-    html_content, needs_browser = basic_scraper.fetch(url)
+    html_content, needs_browser = fetch_static(url, proxy_manager, min_delay, max_delay, circuit_breaker)
     
     # If basic scraping failed or needs browser automation
     if html_content is None or needs_browser:
@@ -91,33 +228,560 @@ def process_url(url: str, name: str, proxy_manager: ProxyManager, min_delay: flo
             logger.warning(f"Basic scraping failed for {url}, trying browser automation")
         else:
             logger.info(f"Dynamic content detected, switching to browser automation")
-            
-        # Create browser scraper with custom delays if specified
-        browser_scraper_kwargs = {"proxy_manager": proxy_manager}
-        if min_delay is not None and max_delay is not None:
-            browser_scraper_kwargs["min_delay"] = min_delay
-            browser_scraper_kwargs["max_delay"] = max_delay
-        
-        browser_scraper = BrowserScraper(**browser_scraper_kwargs)
-        
-        # Fetch using browser automation
-        html_content = browser_scraper.fetch(url)
-        
-        if html_content is None:
-            logger.error(f"Browser automation failed for {url}")
-            return None
+        return fetch_browser(url, proxy_manager, min_delay, max_delay, circuit_breaker, browser_scraper,
+                             static_checked=True, static_failed=html_content is None)
+    
+    return FetchedPage(html=html_content, route="static", static_checked=True)
+
+def save_page(url: str, name: str, html_content: str, graphql_payloads: List[Dict[str, Any]],
+              html_store: Union[HTMLStore, PageArchive] = None, manifest: PageManifest = None,
+              route: Optional[str] = None, slim: bool = False, sync: bool = False) -> Optional[str]:
+    """
+    Save a fetched page and its captured GraphQL responses.
     
-    # Save HTML content
+    Args:
+        url: Standardized URL of the page
+        name: Investor name or identifier
+        html_content: HTML content of the page
+        graphql_payloads: GraphQL responses captured while loading the page
+        html_store: Page store the HTML is written to (default: the one in data/html)
+        manifest: Page manifest to record the page in (default: data/html/manifest.jsonl)
+        route: How the page was fetched, "static" or "browser"
+        slim: Save only the parts of the page the parser reads
+        sync: Return only once the page and its GraphQL responses are on disk
+        
+    Returns:
+        Path of the saved page in the HTML store or None if failed
+    """
     output_path = get_output_filename(url, name)
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        if slim:
+            html_content = slim_page(html_content)
+        html_store = html_store or open_page_store()
+        output_path = html_store.put(output_path, html_content, sync=sync)
         logger.info(f"Saved HTML content to {output_path}")
+        
+        body = html_content.encode('utf-8')
+        (manifest or PageManifest()).record(ManifestEntry(
+            slug=get_page_slug(url, name),
+            url=url,
+            path=output_path,
+            size=len(body),
+            digest=hashlib.sha256(body).hexdigest(),
+            fetched_at=datetime.now().isoformat(),
+            route=route
+        ))
+        
+        # Save the captured GraphQL responses with the HTML
+        if graphql_payloads:
+            payload_path = html_store.put_payloads(output_path, graphql_payloads, sync=sync)
+            logger.info(f"Saved {len(graphql_payloads)} GraphQL responses to {payload_path}")
         return output_path
     except Exception as e:
         logger.error(f"Error saving HTML content: {str(e)}")
         return None
 
+def standardize_url(url: str) -> str:
+    """
+    Add the scheme to a URL that has none.
+    
+    Args:
+        url: URL from the queue
+        
+    Returns:
+        URL starting with http:// or https://
+    """
+    if not url.startswith(('http://', 'https://')):
+        url = f"https://{url}"
+    return url
+
+def process_url(url: str, name: str, proxy_manager: ProxyManager, min_delay: float = None, max_delay: float = None,
+                circuit_breaker: CircuitBreaker = None, browser_scraper: BrowserScraper = None,
+                route: str = "static", html_store: Union[HTMLStore, PageArchive] = None,
+                manifest: PageManifest = None, slim: bool = False) -> str:
+    """
+    Process a single URL:
+    1. Fetch it with the basic scraper or, if needed, browser automation
+    2. Save HTML content
+    
+    Args:
+        url: URL to process
+        name: Investor name or identifier
+        proxy_manager: Proxy manager instance
+        min_delay: Minimum delay between requests in seconds
+        max_delay: Maximum delay between requests in seconds
+        circuit_breaker: Circuit breaker shared by both scrapers
+        browser_scraper: Long-lived browser scraper to reuse; a temporary one is created otherwise
+        route: "static" to try the basic scraper first, "browser" to go straight to the browser
+        html_store: Page store the HTML is written to (default: the one in data/html)
+        manifest: Page manifest to record the page in (default: data/html/manifest.jsonl)
+        slim: Save only the parts of the page the parser reads
+        
+    Returns:
+        Path to saved HTML file or None if failed
+        
+    Raises:
+        CircuitOpenError: If the circuit breaker opened while processing the URL
+    """
+    logger.info(f"Processing URL: {url} ({name})")
+    
+    # Standardize the URL
+    url = standardize_url(url)
+    
+    fetched = fetch_url(url, proxy_manager, min_delay, max_delay, circuit_breaker, browser_scraper, route)
+    if fetched is None:
+        return None
+    
+    return save_page(url, name, fetched.html, fetched.graphql_payloads, html_store, manifest, fetched.route, slim)
+
+def available_cores() -> int:
+    """
+    Get the number of CPU cores this process may run on.
+    
+    Returns:
+        Number of usable cores, at least 1
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+def browser_worker(worker_id: int, tasks: Any, results: Any, args: argparse.Namespace) -> None:
+    """
+    Worker process: fetch URLs from the task queue with its own scrapers and browser pool.
+    
+    Every task is answered with a "result" message; the coordinator owns the
+    URL queue and writes the output. The worker has no circuit breaker of
+    its own: the outcomes its scrapers record are sent with each result to
+    the coordinator's breaker. A final "stats" message is sent before the
+    worker exits.
+    
+    Args:
+        worker_id: Number of the worker, used in messages and logs
+        tasks: Queue of (index, url, name, route) tuples, None to stop
+        results: Queue the messages are sent to
+        args: Parsed command line arguments
+    """
+    proxy_manager = ProxyManager(use_proxies=not args.no_proxy)
+    outcomes = OutcomeRecorder()
+    browser_scraper = None
+    if PLAYWRIGHT_AVAILABLE:
+        browser_scraper = create_browser_scraper(
+            proxy_manager, args.min_delay, args.max_delay, outcomes, args.resource_policy,
+            args.capture_mode, args.screenshots, args.warm_contexts, not args.no_browser_cache
+        )
+    min_d = args.min_delay if args.min_delay is not None else 3
+    max_d = args.max_delay if args.max_delay is not None else 8
+    
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            
+            index, url, name, route = task
+            logger.info(f"Worker {worker_id} processing URL: {url} ({name})")
+            message = {"type": "result", "worker": worker_id, "index": index, "url": url, "name": name}
+            try:
+                fetched = fetch_url(url, proxy_manager, args.min_delay, args.max_delay, outcomes,
+                                    browser_scraper, route)
+                if fetched is None:
+                    message.update(status="failed", error_message="Failed to process URL")
+                else:
+                    # Slim the page here rather than in the coordinator, which writes for all workers
+                    if args.slim:
+                        fetched.html = slim_page(fetched.html)
+                    message.update(status="fetched", page=fetched.to_dict())
+            except Exception as e:
+                logger.exception(f"Worker {worker_id} error processing URL {url}: {str(e)}")
+                message.update(status="failed", error_message=str(e))
+            message["outcomes"] = outcomes.drain()
+            results.put(message)
+            
+            # Random delay between URLs, per worker as in single-process mode
+            time.sleep(random.uniform(min_d, max_d))
+    finally:
+        stats = {"type": "stats", "worker": worker_id}
+        if browser_scraper is not None:
+            stats["resources"] = browser_scraper.resource_totals.to_dict()
+            stats["browser"] = browser_scraper.get_browser_statistics()
+            browser_scraper.close()
+        results.put(stats)
+
+def run_workers(args: argparse.Namespace, url_queue: URLQueue, worker_count: int,
+                circuit_breaker: CircuitBreaker, html_store: Union[HTMLStore, PageArchive],
+                manifest: PageManifest) -> int:
+    """
+    Scrape the queue with a fleet of worker processes.
+    
+    Each worker drives its own browser pool, so page serialisation and the
+    Playwright driver are spread over several cores. This process stays the
+    coordinator: it hands out URLs, owns the URL queue and writes every page
+    through write-behind threads, marking a URL completed once its page is
+    on disk. It also owns the circuit breaker: the workers report what
+    their fetches recorded, and while the breaker is open no URLs are
+    handed out, then a single probe once it is half-open.
+    
+    Args:
+        args: Parsed command line arguments
+        url_queue: Queue of URLs to process
+        worker_count: Number of worker processes
+        circuit_breaker: Circuit breaker fed by every worker's fetches
+        html_store: Store the coordinator writes pages to
+        manifest: Page manifest the coordinator records pages in
+        
+    Returns:
+        Number of URLs processed successfully
+    """
+    # Playwright is not fork-safe, start the workers from scratch
+    mp_context = multiprocessing.get_context("spawn")
+    tasks = mp_context.Queue()
+    results = mp_context.Queue()
+    workers = [
+        mp_context.Process(target=browser_worker, args=(i, tasks, results, args), name=f"scrape-worker-{i}")
+        for i in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Started {worker_count} worker processes")
+    
+    outstanding: Dict[int, str] = {}
+    worker_stats: Dict[int, Dict[str, Any]] = {}
+    counts_lock = threading.Lock()
+    processed_count = 0
+    writing = 0
+    probe_index: Optional[int] = None  # URL sent as the half-open probe
+    writer = WriteBehind(args.writers, args.write_queue)
+    
+    def handle(message: Dict[str, Any]) -> None:
+        nonlocal writing, probe_index
+        if message["type"] == "stats":
+            worker_stats[message["worker"]] = message
+            return
+        
+        index = message["index"]
+        outstanding.pop(index, None)
+        for ok in message["outcomes"]:
+            if ok:
+                circuit_breaker.record_success()
+            else:
+                circuit_breaker.record_failure()
+        if index == probe_index:
+            if not message["outcomes"]:
+                # The probe never reached the site, let another URL probe
+                circuit_breaker.release_probe()
+            probe_index = None
+        if message["status"] == "fetched":
+            page = message["page"]
+            
+            def acknowledge(output_path: Optional[str]) -> None:
+                nonlocal processed_count, writing
+                url_queue.record_route(index, page["route"], page["record_count"], page["static_checked"],
+                                       page["static_failed"])
+                if output_path:
+                    url_queue.update_status(index, "completed", output_path=output_path)
+                else:
+                    url_queue.update_status(index, "failed", error_message="Failed to save HTML content")
+                with counts_lock:
+                    writing -= 1
+                    if output_path:
+                        processed_count += 1
+            
+            with counts_lock:
+                writing += 1
+            writer.submit(lambda: save_page(message["url"], message["name"], page["html"], page["graphql_payloads"],
+                                            html_store, manifest, page["route"], sync=True), acknowledge)
+        elif (message["outcomes"] and not any(message["outcomes"]) and
+                circuit_breaker.state != CircuitBreaker.CLOSED):
+            # Failed with the upstream down, put the item back without charging a retry
+            url_queue.update_status(index, "pending", error_message=message["error_message"])
+            logger.warning(f"Returned {message['url']} to pending, the circuit breaker is open")
+        else:
+            url_queue.update_status(index, "failed", error_message=message["error_message"])
+        
+        logger.info(f"Queue statistics: {url_queue.get_statistics()}")
+    
+    try:
+        while True:
+            # Keep one URL in hand and one waiting for every worker
+            paused = False
+            while len(outstanding) < worker_count * 2:
+                if args.limit and processed_count + writing + len(outstanding) >= args.limit:
+                    break
+                # Hold back URLs while the upstream is down, then send a single probe
+                probing = circuit_breaker.state == CircuitBreaker.HALF_OPEN
+                if not circuit_breaker.allow_request():
+                    paused = True
+                    break
+                result = url_queue.get_next_url()
+                if result is None:
+                    if probing:
+                        circuit_breaker.release_probe()
+                    break
+                item, index = result
+                url_queue.update_status(index, "in_progress")
+                outstanding[index] = item.url
+                if probing:
+                    probe_index = index
+                tasks.put((index, standardize_url(item.url), item.name, url_queue.preferred_route(index)))
+            
+            if not outstanding:
+                if paused:
+                    wait = max(circuit_breaker.time_until_retry(), 1.0)
+                    logger.warning(f"Circuit breaker open, pausing for {wait:.0f} seconds")
+                    time.sleep(wait)
+                    continue
+                if writing:
+                    # Pages that fail to save may be retried, look again once they are written
+                    writer.join()
+                    continue
+                if args.limit and processed_count >= args.limit:
+                    logger.info(f"Reached limit of {args.limit} URLs")
+                else:
+                    logger.info("No more URLs to process")
+                break
+            
+            try:
+                handle(results.get(timeout=5.0))
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    logger.error("All worker processes exited, stopping")
+                    break
+    finally:
+        # Items still out are not lost, they go back to pending
+        for index in list(outstanding):
+            url_queue.update_status(index, "pending")
+        
+        for _ in workers:
+            tasks.put(None)
+        
+        # Drain results and statistics until every worker has exited
+        deadline = time.monotonic() + 60.0
+        while len(worker_stats) < len(workers) and time.monotonic() < deadline:
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            if message["type"] == "stats" or message["index"] in outstanding:
+                handle(message)
+        
+        # Acknowledge the pages still being written before returning
+        writer.close()
+        logger.info(f"Page writer statistics: {writer.get_statistics()}")
+        
+        for worker in workers:
+            worker.join(timeout=10.0)
+            if worker.is_alive():
+                logger.warning(f"Worker {worker.name} did not exit, terminating it")
+                worker.terminate()
+    
+    for worker_id, stats in sorted(worker_stats.items()):
+        if "browser" in stats:
+            logger.info(f"Worker {worker_id} browser resource statistics: {stats['resources']}")
+            logger.info(f"Worker {worker_id} browser health statistics: {stats['browser']}")
+    
+    return processed_count
+
+def run_lanes(args: argparse.Namespace, url_queue: URLQueue, proxy_manager: ProxyManager,
+              circuit_breaker: CircuitBreaker, html_store: Union[HTMLStore, PageArchive],
+              manifest: PageManifest, browser_scraper: BrowserScraper = None) -> int:
+    """
+    Scrape the queue in this process with separate static and browser lanes.
+    
+    Static lanes fetch with the basic scraper, one browser lane owns the
+    browser. URLs that keep needing the browser are sent straight to the
+    browser lane; static fetches that turn out to need it are handed over,
+    so slow browser pages never hold up the static ones. Pages are saved
+    by write-behind threads and a URL is marked completed once its page is
+    on disk; lanes only wait for the disk when the write queue is full.
+    
+    Args:
+        args: Parsed command line arguments
+        url_queue: Queue of URLs to process
+        proxy_manager: Proxy manager instance
+        circuit_breaker: Circuit breaker shared by both lanes
+        html_store: Store the lanes write pages to
+        manifest: Page manifest the lanes record pages in
+        browser_scraper: Browser scraper for the browser lane, None to fetch everything statically
+        
+    Returns:
+        Number of URLs processed successfully
+    """
+    static_tasks: queue.Queue = queue.Queue()
+    browser_tasks: queue.Queue = queue.Queue()
+    capacity = args.static_workers + 2
+    condition = threading.Condition()
+    stopping = threading.Event()
+    in_flight = 0
+    writing = 0
+    processed_count = 0
+    writer = WriteBehind(args.writers, args.write_queue)
+    
+    min_d = args.min_delay if args.min_delay is not None else 3
+    max_d = args.max_delay if args.max_delay is not None else 8
+    
+    def finish(index: int, item: Any, fetched: Optional[FetchedPage]) -> None:
+        nonlocal writing
+        if fetched is None:
+            url_queue.update_status(index, "failed", error_message="Failed to process URL")
+            return
+        
+        def acknowledge(output_path: Optional[str]) -> None:
+            nonlocal processed_count, writing
+            url_queue.record_route(index, fetched.route, fetched.record_count, fetched.static_checked,
+                                   fetched.static_failed)
+            if output_path:
+                url_queue.update_status(index, "completed", output_path=output_path)
+            else:
+                url_queue.update_status(index, "failed", error_message="Failed to save HTML content")
+            with condition:
+                writing -= 1
+                if output_path:
+                    processed_count += 1
+                condition.notify_all()
+        
+        with condition:
+            writing += 1
+        # Blocks while the write queue is full
+        writer.submit(lambda: save_page(standardize_url(item.url), item.name, fetched.html, fetched.graphql_payloads,
+                                        html_store, manifest, fetched.route, args.slim, sync=True), acknowledge)
+    
+    def lane(route: str, tasks: queue.Queue) -> None:
+        nonlocal in_flight
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            
+            index, item, static_checked, static_failed = task
+            url = standardize_url(item.url)
+            handed_off = False
+            try:
+                if stopping.is_set():
+                    url_queue.update_status(index, "pending")
+                    continue
+                
+                logger.info(f"Processing URL on the {route} lane: {url} ({item.name})")
+                if route == "static":
+                    html_content, needs_browser = fetch_static(
+                        url, proxy_manager, args.min_delay, args.max_delay, circuit_breaker
+                    )
+                    if html_content is None or needs_browser:
+                        if browser_scraper is not None:
+                            logger.info(f"Handing {url} over to the browser lane")
+                            browser_tasks.put((index, item, True, html_content is None))
+                            handed_off = True
+                            continue
+                        fetched = fetch_browser(url, proxy_manager, args.min_delay, args.max_delay,
+                                                circuit_breaker, static_checked=True,
+                                                static_failed=html_content is None)
+                    else:
+                        fetched = FetchedPage(html=html_content, route="static", static_checked=True)
+                else:
+                    fetched = fetch_browser(url, proxy_manager, args.min_delay, args.max_delay,
+                                            circuit_breaker, browser_scraper, static_checked, static_failed)
+                finish(index, item, fetched)
+                
+            except CircuitOpenError as e:
+                # Put the item back without charging a retry
+                url_queue.update_status(index, "pending", error_message=str(e))
+                logger.warning(f"Returned {item.url} to pending: {str(e)}")
+                
+            except Exception as e:
+                url_queue.update_status(index, "failed", error_message=str(e))
+                logger.exception(f"Error processing URL {item.url}: {str(e)}")
+                
+            finally:
+                if not handed_off:
+                    with condition:
+                        in_flight -= 1
+                        condition.notify_all()
+            
+            logger.info(f"Queue statistics: {url_queue.get_statistics()}")
+            
+            # Random delay between URLs on this lane
+            if not stopping.is_set():
+                delay = random.uniform(min_d, max_d)
+                logger.info(f"Waiting {delay:.2f} seconds before the next URL on the {route} lane...")
+                time.sleep(delay)
+        
+        # The browser's event loop lives in this thread, close it here too
+        if route == "browser":
+            logger.info(f"Browser resource statistics: {browser_scraper.resource_totals.to_dict()}")
+            logger.info(f"Browser health statistics: {browser_scraper.get_browser_statistics()}")
+            browser_scraper.close()
+    
+    static_lanes = [
+        threading.Thread(target=lane, args=("static", static_tasks), name=f"static-lane-{i}", daemon=True)
+        for i in range(args.static_workers)
+    ]
+    browser_lane = None
+    if browser_scraper is not None:
+        browser_lane = threading.Thread(target=lane, args=("browser", browser_tasks), name="browser-lane", daemon=True)
+    for thread in static_lanes + ([browser_lane] if browser_lane else []):
+        thread.start()
+    
+    try:
+        while True:
+            with condition:
+                # Keep every lane busy without running ahead of the limit
+                while in_flight >= capacity or (args.limit and (in_flight or writing) and
+                                                processed_count + writing + in_flight >= args.limit):
+                    condition.wait()
+                if args.limit and processed_count >= args.limit:
+                    logger.info(f"Reached limit of {args.limit} URLs")
+                    break
+            
+            # Pause dispatch while the upstream is down
+            if not circuit_breaker.allow_request():
+                wait = max(circuit_breaker.time_until_retry(), 1.0)
+                logger.warning(f"Circuit breaker open, pausing for {wait:.0f} seconds")
+                time.sleep(wait)
+                continue
+            
+            result = url_queue.get_next_url()
+            if result is None:
+                with condition:
+                    # Pages that fail to save may be retried, so wait for the writes too
+                    if in_flight or writing:
+                        condition.wait()
+                        continue
+                # Every lane is idle; look once more for URLs they returned to pending
+                result = url_queue.get_next_url()
+                if result is None:
+                    logger.info("No more URLs to process")
+                    break
+            
+            item, index = result
+            url_queue.update_status(index, "in_progress")
+            route = url_queue.preferred_route(index) if browser_scraper is not None else "static"
+            with condition:
+                in_flight += 1
+            if route == "browser":
+                logger.info(f"{item.url} needed the browser before, skipping the static lane")
+                browser_tasks.put((index, item, False, False))
+            else:
+                static_tasks.put((index, item, False, False))
+    except BaseException:
+        # URLs that did not reach a lane yet go back to pending
+        stopping.set()
+        raise
+    finally:
+        # Static lanes may still hand URLs over, stop the browser lane after them
+        for _ in static_lanes:
+            static_tasks.put(None)
+        for thread in static_lanes:
+            thread.join()
+        if browser_lane is not None:
+            browser_tasks.put(None)
+            browser_lane.join()
+        # Acknowledge the pages still being written before returning
+        writer.close()
+        logger.info(f"Page writer statistics: {writer.get_statistics()}")
+    
+    return processed_count
+
 def main():
     """
     Main function for the scraper script.
@@ -128,6 +792,36 @@ def main():
     parser.add_argument("--limit", type=int, help="Limit number of URLs to process")
     parser.add_argument("--min-delay", type=float, help="Minimum delay between requests in seconds")
     parser.add_argument("--max-delay", type=float, help="Maximum delay between requests in seconds")
+    parser.add_argument("--breaker-threshold", type=float, default=0.5,
+                        help="Failure rate that pauses scraping during upstream outages (default: 0.5)")
+    parser.add_argument("--breaker-cooldown", type=float, default=120.0,
+                        help="Seconds to pause before probing the site again (default: 120)")
+    parser.add_argument("--resource-policy", choices=list(RESOURCE_POLICIES),
+                        help="Sub-resources to block in the browser (default: no-media)")
+    parser.add_argument("--capture-mode", choices=list(CAPTURE_MODES),
+                        help="Save the full page or only the Apollo cache and header (default: dom)")
+    parser.add_argument("--screenshots", choices=list(SCREENSHOT_MODES),
+                        help="When to take browser screenshots (default: on_failure)")
+    parser.add_argument("--warm-contexts", type=int,
+                        help="Browser contexts prepared ahead of the next URL, 0 to disable (default: 2)")
+    parser.add_argument("--no-browser-cache", action="store_true",
+                        help="Start every browser context empty instead of reusing cookies and static assets")
+    parser.add_argument("--workers", type=int, nargs="?", const=available_cores(),
+                        help="Scrape with this many worker processes, each with its own browser "
+                             "(default without a number: one per available core)")
+    parser.add_argument("--page-store", choices=list(PAGE_STORES),
+                        help="Save pages as compressed objects or append them to data/html/pages.archive "
+                             "(default: the archive if it exists, else objects)")
+    parser.add_argument("--compression", choices=list(COMPRESSIONS),
+                        help="Compression of saved pages (default: zstd if installed, else gzip)")
+    parser.add_argument("--slim", action="store_true",
+                        help="Save only the Apollo state, header, profile rows, network rows and investments table")
+    parser.add_argument("--static-workers", type=int, default=1,
+                        help="Threads fetching URLs with the basic scraper next to the browser lane (default: 1)")
+    parser.add_argument("--writers", type=int, default=2,
+                        help="Threads saving pages behind the fetchers, 0 to save in the fetching thread (default: 2)")
+    parser.add_argument("--write-queue", type=int, default=16,
+                        help="Fetched pages that can wait for a writer before fetching slows down (default: 16)")
     args = parser.parse_args()
     
     # Validate delay parameters if both are provided
@@ -139,6 +833,18 @@ def main():
         logger.error("--min-delay cannot be greater than --max-delay")
         return
     
+    if args.workers is not None and args.workers < 1:
+        logger.error("--workers must be at least 1")
+        return
+    
+    if args.static_workers < 1:
+        logger.error("--static-workers must be at least 1")
+        return
+    
+    if args.writers < 0 or args.write_queue < 1:
+        logger.error("--writers cannot be negative and --write-queue must be at least 1")
+        return
+    
     # Migrate URL file if needed
     if not os.path.exists(args.url_file) and os.path.exists("output/investor_urls.txt"):
         logger.info(f"Migrating URL file from output/investor_urls.txt to {args.url_file}")
@@ -150,6 +856,24 @@ def main():
     # Initialize components
     proxy_manager = ProxyManager(use_proxies=not args.no_proxy)
     url_queue = URLQueue()
+    try:
+        html_store = open_page_store(args.page_store, compression=args.compression)
+    except ValueError as e:
+        logger.error(str(e))
+        return
+    manifest = PageManifest()
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=args.breaker_threshold,
+        reset_timeout=args.breaker_cooldown
+    )
+    
+    # One browser for the whole run; it is only launched if a URL needs it
+    browser_scraper = None
+    if PLAYWRIGHT_AVAILABLE and args.workers is None:
+        browser_scraper = create_browser_scraper(
+            proxy_manager, args.min_delay, args.max_delay, circuit_breaker, args.resource_policy,
+            args.capture_mode, args.screenshots, args.warm_contexts, not args.no_browser_cache
+        )
     
     # Add URLs from file
     url_count = url_queue.add_urls_from_file(args.url_file)
@@ -159,63 +883,26 @@ def main():
     stats = url_queue.get_statistics()
     logger.info(f"Queue statistics: {stats}")
     
-    # Process URLs
-    processed_count = 0
-    while True:
-        # Check if we've reached the limit
-        if args.limit and processed_count >= args.limit:
-            logger.info(f"Reached limit of {args.limit} URLs")
-            break
-            
-        # Get next URL
-        result = url_queue.get_next_url()
-        if result is None:
-            logger.info("No more URLs to process")
-            break
-            
-        item, index = result
-        
-        # Update status to in_progress
-        url_queue.update_status(index, "in_progress")
-        
-        try:
-            # Process URL with custom delays if specified
-            output_path = process_url(
-                item.url, 
-                item.name, 
-                proxy_manager,
-                min_delay=args.min_delay,
-                max_delay=args.max_delay
-            )
-            
-            if output_path:
-                # Update status to completed
-                url_queue.update_status(index, "completed", output_path=output_path)
-                processed_count += 1
-            else:
-                # Update status to failed
-                url_queue.update_status(index, "failed", error_message="Failed to process URL")
-                
-        except Exception as e:
-            # Update status to failed
-            url_queue.update_status(index, "failed", error_message=str(e))
-            logger.exception(f"Error processing URL {item.url}: {str(e)}")
-            
-        # Get updated statistics
+    # Hand the URLs to worker processes; this process only coordinates and writes
+    if args.workers is not None:
+        processed_count = run_workers(args, url_queue, args.workers, circuit_breaker, html_store, manifest)
+        html_store.close()
         stats = url_queue.get_statistics()
-        logger.info(f"Queue statistics: {stats}")
-        
-        # Random delay between URLs (using custom delays if specified)
-        min_d = args.min_delay if args.min_delay is not None else 3
-        max_d = args.max_delay if args.max_delay is not None else 8
-        delay = random.uniform(min_d, max_d)
-        logger.info(f"Waiting {delay:.2f} seconds before next URL...")
-        time.sleep(delay)
+        logger.info(f"Final queue statistics: {stats}")
+        logger.info(f"Processed {processed_count} URLs")
+        logger.info(f"Page store statistics: {html_store.get_statistics()}")
+        return
+    
+    # Scrape in this process with a static and a browser lane
+    processed_count = run_lanes(args, url_queue, proxy_manager, circuit_breaker, html_store, manifest,
+                                browser_scraper)
+    html_store.close()
     
     # Final statistics
     stats = url_queue.get_statistics()
     logger.info(f"Final queue statistics: {stats}")
     logger.info(f"Processed {processed_count} URLs")
+    logger.info(f"Page store statistics: {html_store.get_statistics()}")
     
 if __name__ == "__main__":
     main() 
\ No newline at end of file
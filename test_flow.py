@@ -10,7 +10,14 @@ This script:
 5. Produces a summary report
 
 Usage:
-    python test_flow.py [--sample n] [--headless] [--browser {chromium,firefox,webkit}]
+    python test_flow.py [--sample n] [--headless] [--browser {chromium,firefox,webkit}] [--concurrency n]
+                        [--resource-policy {full,no-media,minimal}] [--warm-contexts n]
+                        [--har {off,record,replay}] [--har-dir DIR]
+
+With --har record every successfully scraped profile is saved as a HAR in
+--har-dir. --har replay runs the recorded profiles again from those files
+with no network access and no random delays, so changes to the expansion
+logic, readiness waits or resource policy can be timed repeatably.
 """
 
 import os
@@ -21,14 +28,19 @@ import argparse
 import json
 import random
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Set up path for imports
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 # Import scraping and parsing components
-from src.investor_parser.core.scraper import ProxyManager, BrowserScraper
+from src.investor_parser.core.scraper import (
+    ProxyManager, BrowserScraper, PacingPolicy, ScrapeResult, RESOURCE_POLICIES, SCREENSHOT_MODES
+)
+from src.investor_parser.core.scraper.browser_scraper import CAPTURE_MODES
+from src.investor_parser.core.scraper.har_archive import HAR_MODES, HarArchive
 from src.investor_parser.core.parser import InvestorProfileParser
+from src.investor_parser.core.storage import open_page_store, resolve_page_path
 
 # Set up logging
 logging.basicConfig(
@@ -101,7 +113,7 @@ def get_output_filename(url: str) -> str:
     investor_name = parts[-1] if parts else "unknown"
     
     # Create filename
-    return f"data/html/test-{investor_name}.html"
+    return resolve_page_path(f"test-{investor_name}.html")
 
 def process_url(url: str, browser_scraper: BrowserScraper) -> Dict[str, Any]:
     """
@@ -115,6 +127,37 @@ def process_url(url: str, browser_scraper: BrowserScraper) -> Dict[str, Any]:
         Dictionary with results
     """
     start_time = time.time()
+    
+    try:
+        logger.info(f"Processing URL: {url}")
+        # Scrape the URL
+        page = browser_scraper.fetch_page(url)
+    except Exception as e:
+        logger.exception(f"Error processing URL {url}: {e}")
+        return {
+            "url": url,
+            "output_file": get_output_filename(url),
+            "success": False,
+            "time_taken": time.time() - start_time,
+            "investment_count": 0,
+            "expanded": False,
+            "error": str(e)
+        }
+    
+    return process_html(url, page, start_time)
+
+def process_html(url: str, page: Optional[ScrapeResult], start_time: float) -> Dict[str, Any]:
+    """
+    Save and parse the HTML scraped for a URL.
+    
+    Args:
+        url: URL that was scraped
+        page: Scrape result, or None if scraping failed
+        start_time: Time the URL started processing
+        
+    Returns:
+        Dictionary with results
+    """
     output_file = get_output_filename(url)
     
     result = {
@@ -128,18 +171,13 @@ def process_url(url: str, browser_scraper: BrowserScraper) -> Dict[str, Any]:
     }
     
     try:
-        logger.info(f"Processing URL: {url}")
-        # Scrape the URL
-        html_content = browser_scraper.fetch(url)
-        
-        if html_content:
+        if page and page.html:
             # Save HTML content
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            open_page_store().put(output_file, page.html)
             logger.info(f"Saved HTML to {output_file}")
             
-            # Parse the investor profile
-            parser = InvestorProfileParser(html_content, output_file)
+            # Parse the investor profile, including the captured investments responses
+            parser = InvestorProfileParser(page.html, output_file, page.graphql_payloads)
             data = parser.parse()
             
             # Check investments
@@ -184,14 +222,39 @@ def main():
                         help="Run in headless mode")
     parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], 
                         default="firefox", help="Browser to use")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of pages to scrape concurrently (default: 1)")
+    parser.add_argument("--resource-policy", choices=list(RESOURCE_POLICIES), default="no-media",
+                        help="Sub-resources to block in the browser (default: no-media)")
+    parser.add_argument("--capture-mode", choices=list(CAPTURE_MODES), default="dom",
+                        help="Save the full page or only the Apollo cache and header (default: dom)")
+    parser.add_argument("--screenshots", choices=list(SCREENSHOT_MODES), default="always",
+                        help="When to take browser screenshots (default: always)")
+    parser.add_argument("--warm-contexts", type=int, default=2,
+                        help="Browser contexts prepared ahead of the next URL, 0 to disable (default: 2)")
+    parser.add_argument("--har", choices=list(HAR_MODES), default="off",
+                        help="Record profiles to HAR files or replay them offline (default: off)")
+    parser.add_argument("--har-dir", default="data/har",
+                        help="Directory of the HAR recordings (default: data/har)")
     args = parser.parse_args()
+    replay = args.har == "replay"
     
-    # Get URLs to process
-    urls = get_urls_from_file("data/investor_urls.txt", args.sample)
+    # Get URLs to process; a replay runs the recorded profiles
+    if replay:
+        urls = HarArchive(args.har_dir).recorded_urls()[:args.sample]
+        random.seed(0)
+        logger.info(f"Replaying {len(urls)} recorded profiles from {args.har_dir}")
+    else:
+        urls = get_urls_from_file("data/investor_urls.txt", args.sample)
     if not urls:
         logger.error("No URLs to process")
         return
     
+    # A replay skips the human-like delays and starts from empty contexts
+    browser_options = {}
+    if replay:
+        browser_options = {"pacing": PacingPolicy(scale=0), "storage_state": None}
+    
     # Initialize components
     proxy_manager = ProxyManager(use_proxies=False)
     browser_scraper = BrowserScraper(
@@ -200,20 +263,37 @@ def main():
         browser_type=args.browser,
         screenshot_dir="data/screenshots",
         stealth_mode=True,
-        random_mouse_movements=True
+        random_mouse_movements=True,
+        resource_policy=args.resource_policy,
+        capture_mode=args.capture_mode,
+        screenshot_policy=args.screenshots,
+        warm_contexts=args.warm_contexts,
+        har_mode=args.har,
+        har_dir=args.har_dir,
+        **browser_options
     )
     
     # Process URLs
     results = []
-    for url in urls:
-        result = process_url(url, browser_scraper)
-        results.append(result)
-        
-        # Add delay between URLs
-        if url != urls[-1]:
-            delay = random.uniform(5, 10)
-            logger.info(f"Waiting {delay:.2f} seconds before next URL...")
-            time.sleep(delay)
+    if args.concurrency > 1:
+        # Drive several pages at once and handle each as soon as it finishes
+        start_time = time.time()
+        for url, page in browser_scraper.fetch_many(urls, concurrency=args.concurrency):
+            results.append(process_html(url, page, start_time))
+    else:
+        for url in urls:
+            result = process_url(url, browser_scraper)
+            results.append(result)
+            
+            # Add delay between URLs
+            if url != urls[-1] and not replay:
+                delay = random.uniform(5, 10)
+                logger.info(f"Waiting {delay:.2f} seconds before next URL...")
+                time.sleep(delay)
+    
+    resource_totals = browser_scraper.resource_totals
+    logger.info(f"Browser statistics: {browser_scraper.get_browser_statistics()}")
+    browser_scraper.close()
     
     # Generate summary
     success_count = sum(1 for r in results if r["success"])
@@ -232,6 +312,8 @@ def main():
     print(f"Profiles with expanded investments: {expanded_count}/{len(results)}")
     print(f"Total investments found: {total_investments}")
     print(f"Average time per URL: {avg_time:.2f} seconds")
+    print(f"Requests blocked ({args.resource_policy}): {resource_totals.blocked_requests} "
+          f"(~{resource_totals.estimated_bytes_saved / 1024:.0f} KB saved)")
     print(f"Detailed results saved to: data/output/flow_test_results.json")
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+#!/usr/bin/env python
+"""
+Shared test setup: makes the src package importable from the repository root.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Tests for the circuit breaker states and how the basic scraper feeds it.
+"""
+
+import pytest
+import requests
+
+from src.investor_parser.core.scraper import basic_scraper, circuit_breaker
+from src.investor_parser.core.scraper.basic_scraper import BasicScraper
+from src.investor_parser.core.scraper.circuit_breaker import CircuitBreaker, CircuitOpenError, OutcomeRecorder
+
+class FakeClock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+def open_breaker() -> CircuitBreaker:
+    """Build a breaker and fail it open."""
+    breaker = CircuitBreaker(failure_threshold=0.5, window_size=4, min_calls=4, reset_timeout=60.0)
+    for _ in range(4):
+        breaker.record_failure()
+    return breaker
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = CircuitBreaker(failure_threshold=0.5, window_size=4, min_calls=4, reset_timeout=60.0)
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+def test_stays_closed_below_failure_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=0.5, window_size=4, min_calls=4, reset_timeout=60.0)
+    for ok in (True, True, True, False):
+        breaker.record_success() if ok else breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_opens_on_failure_rate(clock):
+    breaker = open_breaker()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.time_until_retry() == pytest.approx(60.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = open_breaker()
+    clock.now += 60.0
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.time_until_retry() == 0.0
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_probe_success_closes(clock):
+    breaker = open_breaker()
+    clock.now += 60.0
+    assert breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_statistics()["window"] == 0
+    assert breaker.allow_request()
+
+def test_probe_failure_reopens(clock):
+    breaker = open_breaker()
+    clock.now += 60.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.time_until_retry() == pytest.approx(60.0)
+
+def test_lost_probe_is_given_up_after_reset_timeout(clock):
+    breaker = open_breaker()
+    clock.now += 60.0
+    assert breaker.allow_request()
+    clock.now += 59.0
+    assert not breaker.allow_request()
+    clock.now += 1.0
+    assert breaker.allow_request()
+
+def test_released_probe_lets_another_request_probe(clock):
+    breaker = open_breaker()
+    clock.now += 60.0
+    assert breaker.allow_request()
+    breaker.release_probe()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_outcome_recorder_never_refuses_and_drains_in_order():
+    recorder = OutcomeRecorder()
+    for _ in range(10):
+        recorder.check()
+        recorder.record_failure()
+    recorder.record_success()
+
+    assert recorder.drain() == [False] * 10 + [True]
+    assert recorder.drain() == []
+
+class FakeResponse:
+    """Response of requests.get with a fixed status."""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ""
+
+    def raise_for_status(self) -> None:
+        raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+def fetch_probe(monkeypatch, clock, status_code: int) -> CircuitBreaker:
+    """Let the basic scraper send the half-open probe and get an HTTP error back."""
+    monkeypatch.setattr(basic_scraper.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(basic_scraper.requests, "get", lambda *args, **kwargs: FakeResponse(status_code))
+    breaker = open_breaker()
+    clock.now += 60.0
+    assert breaker.allow_request()
+
+    scraper = BasicScraper(retry_count=1, min_delay=0, max_delay=0, circuit_breaker=breaker)
+    assert scraper.fetch("https://signal.nfx.com/investors/jane-doe") == (None, False)
+    return breaker
+
+@pytest.mark.parametrize("status_code", [403, 404])
+def test_client_error_probe_closes(monkeypatch, clock, status_code):
+    breaker = fetch_probe(monkeypatch, clock, status_code)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_upstream_error_probe_reopens(monkeypatch, clock, status_code):
+    breaker = fetch_probe(monkeypatch, clock, status_code)
+
+    assert breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Tests for replaying and compacting the page manifest journal.
+"""
+
+from src.investor_parser.core.storage import manifest
+from src.investor_parser.core.storage.manifest import ManifestEntry, PageManifest
+
+def entry(slug: str, size: int = 100) -> ManifestEntry:
+    """Build a manifest entry."""
+    return ManifestEntry(slug=slug, url=f"https://example.com/p/{slug}", path=f"{slug}.html", size=size)
+
+def test_replay_keeps_the_latest_line_per_page(tmp_path):
+    path = str(tmp_path / "manifest.jsonl")
+    journal = PageManifest(path)
+    journal.record(entry("a", 1))
+    journal.record(entry("b"))
+    journal.record(entry("a", 2))
+
+    replayed = PageManifest(path)
+
+    assert len(replayed) == 2
+    assert replayed.get("a").size == 2
+
+def test_torn_last_line_is_ignored_and_not_glued_to(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    PageManifest(str(path)).record(entry("a"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"slug": "b", "url"')
+
+    replayed = PageManifest(str(path))
+    replayed.record(entry("c"))
+
+    assert replayed.get("b") is None
+    again = PageManifest(str(path))
+    assert again.get("a") is not None
+    assert again.get("c") is not None
+
+def test_compacts_once_mostly_superseded(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest, "COMPACT_MIN_LINES", 4)
+    path = tmp_path / "manifest.jsonl"
+    journal = PageManifest(str(path))
+    for size in range(4):
+        journal.record(entry("a", size))
+
+    assert path.read_text(encoding="utf-8").count("\n") == 1
+    replayed = PageManifest(str(path))
+    assert len(replayed) == 1
+    assert replayed.get("a").size == 3
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Tests for resuming a legacy page migration and for the link to copy fallback.
+"""
+
+import os
+import errno
+
+import pytest
+
+from src.investor_parser.core.storage import migration
+from src.investor_parser.core.storage.migration import MigrationJournal, transfer_file, transfer_files
+
+def write(path, text: str) -> str:
+    """Write a file and return its path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_journal_resumes_after_a_torn_line(tmp_path):
+    target = write(tmp_path / "store" / "a.html", "a")
+    path = str(tmp_path / "migration.jsonl")
+    MigrationJournal(path).record("legacy/a.html", target, "link")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"source": "legacy/b.html"')
+
+    journal = MigrationJournal(path)
+    journal.record("legacy/c.html", target, "copy")
+
+    reopened = MigrationJournal(path)
+    assert reopened.done("legacy/a.html", target)
+    assert not reopened.done("legacy/b.html", target)
+    assert reopened.done("legacy/c.html", target)
+
+def test_transfer_files_skips_what_the_journal_has(tmp_path):
+    sources = [write(tmp_path / "legacy" / f"{name}.html", name) for name in "ab"]
+    transfers = [(source, str(tmp_path / "store" / os.path.basename(source))) for source in sources]
+    journal = MigrationJournal(str(tmp_path / "migration.jsonl"))
+
+    first = transfer_files(transfers[:1], journal=journal)
+    second = transfer_files(transfers, journal=MigrationJournal(journal.path))
+
+    assert first["link"] == 1
+    assert second["skipped"] == 1
+    assert second["link"] == 1
+
+@pytest.mark.parametrize("method", ["link", "rename"])
+def test_falls_back_to_copy_across_filesystems(tmp_path, monkeypatch, method):
+    def cross_device(source, target):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(migration.os, "link", cross_device)
+    monkeypatch.setattr(migration.os, "rename", cross_device)
+    source = write(tmp_path / "legacy" / "a.html", "a")
+    target = str(tmp_path / "store" / "a.html")
+
+    used = transfer_file(source, target, method)
+
+    assert used == "copy"
+    assert open(target, encoding="utf-8").read() == "a"
+    assert os.path.exists(source) == (method == "link")
+
+def test_other_link_errors_are_raised(tmp_path, monkeypatch):
+    def denied(source, target):
+        raise OSError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(migration.os, "link", denied)
+    source = write(tmp_path / "legacy" / "a.html", "a")
+
+    with pytest.raises(OSError):
+        transfer_file(source, str(tmp_path / "store" / "a.html"))
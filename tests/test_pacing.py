@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Tests for the pacing of concurrent browser pages.
+"""
+
+import asyncio
+
+from src.investor_parser.core.scraper import browser_scraper, pacing
+from src.investor_parser.core.scraper.pacing import PacingPolicy
+
+DELAY = 0.05
+WAITS_PER_PAGE = 2
+
+class WaitRecorder:
+    """Count the pacing waits and how many of them run at the same time."""
+
+    def __init__(self):
+        self.waits = 0
+        self.active = 0
+        self.peak = 0
+
+def make_scraper(monkeypatch) -> browser_scraper.BrowserScraper:
+    """Build a scraper whose pages only wait, so no browser is needed."""
+    monkeypatch.setattr(browser_scraper, "PLAYWRIGHT_AVAILABLE", True)
+    scraper = browser_scraper.BrowserScraper(
+        pacing=PacingPolicy(min_delay=DELAY, max_delay=DELAY, jitter=0),
+        screenshot_policy="off",
+        watchdog=False,
+        storage_state=None,
+        asset_cache=None
+    )
+
+    async def scrape_page(url):
+        for _ in range(WAITS_PER_PAGE):
+            await scraper.random_delay()
+        return url
+
+    scraper.scrape_page = scrape_page
+    return scraper
+
+def record_waits(monkeypatch) -> WaitRecorder:
+    """Patch the pacing sleep to track overlapping waits."""
+    recorder = WaitRecorder()
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        if delay != DELAY:
+            return await real_sleep(delay, *args, **kwargs)
+        recorder.waits += 1
+        recorder.active += 1
+        recorder.peak = max(recorder.peak, recorder.active)
+        try:
+            return await real_sleep(delay, *args, **kwargs)
+        finally:
+            recorder.active -= 1
+
+    monkeypatch.setattr(pacing.asyncio, "sleep", sleep)
+    return recorder
+
+def test_pacing_waits_overlap_across_pages(monkeypatch):
+    urls = ["https://example.com/a", "https://example.com/b"]
+    recorder = record_waits(monkeypatch)
+    with make_scraper(monkeypatch) as scraper:
+        results = dict(scraper.fetch_many(urls, concurrency=len(urls)))
+
+    assert results == {url: url for url in urls}
+    assert recorder.waits == WAITS_PER_PAGE * len(urls)
+    # Both pages wait at the same time instead of one after the other
+    assert recorder.peak == len(urls)
+
+def test_pacing_waits_are_sequential_within_a_page(monkeypatch):
+    urls = ["https://example.com/a", "https://example.com/b"]
+    recorder = record_waits(monkeypatch)
+    with make_scraper(monkeypatch) as scraper:
+        results = dict(scraper.fetch_many(urls, concurrency=1))
+
+    assert len(results) == len(urls)
+    assert recorder.waits == WAITS_PER_PAGE * len(urls)
+    assert recorder.peak == 1
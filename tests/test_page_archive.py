@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Tests for crash recovery, index rebuild and compaction of the page archive.
+"""
+
+import os
+
+from src.investor_parser.core.storage.page_archive import PageArchive
+
+def page(text: str) -> str:
+    """Build a page body."""
+    return f"<html><body>{text}</body></html>"
+
+def test_recovers_pages_appended_after_the_index(tmp_path):
+    archive = PageArchive(str(tmp_path), compression="gzip")
+    archive.put("a.html", page("a"))
+    archive.save_index()
+    archive.put("b.html", page("b"))
+    archive._file.flush()
+    # Crash before the next index write: b is only in the segment
+
+    reopened = PageArchive(str(tmp_path))
+
+    assert reopened.recovered == 1
+    assert reopened.get("b.html") == page("b")
+
+def test_cuts_off_a_torn_last_record(tmp_path):
+    archive = PageArchive(str(tmp_path), compression="gzip")
+    archive.put("a.html", page("a"))
+    archive.close()
+    intact = os.path.getsize(archive.archive_path)
+    archive = PageArchive(str(tmp_path))
+    archive.put("b.html", page("b"), save_index=False)
+    archive._file.flush()
+    with open(archive.archive_path, "r+b") as f:
+        f.truncate(os.path.getsize(archive.archive_path) - 5)
+
+    reopened = PageArchive(str(tmp_path))
+
+    assert reopened.names() == ["a.html"]
+    assert reopened._end == intact
+    reopened.put("c.html", page("c"))
+    reopened.close()
+    assert PageArchive(str(tmp_path)).get("c.html") == page("c")
+
+def test_rebuilds_a_broken_index(tmp_path):
+    archive = PageArchive(str(tmp_path), compression="gzip")
+    archive.put("a.html", page("a"))
+    archive.put("b.html", page("b"))
+    archive.close()
+    with open(archive.index_path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    reopened = PageArchive(str(tmp_path))
+
+    assert reopened.names() == ["a.html", "b.html"]
+    assert reopened.get("a.html") == page("a")
+
+def test_compact_keeps_only_the_newest_copy(tmp_path):
+    archive = PageArchive(str(tmp_path), compression="none")
+    archive.put("a.html", page("old"))
+    archive.put("a.html", page("new"))
+    archive.put("b.html", page("b"))
+
+    reclaimed = archive.compact()
+
+    assert reclaimed > 0
+    assert archive.get_statistics()["stale_bytes"] == 0
+    reopened = PageArchive(str(tmp_path))
+    assert reopened.get("a.html") == page("new")
+    assert reopened.get("b.html") == page("b")
+
+def test_graphql_responses_are_records_of_their_own(tmp_path):
+    archive = PageArchive(str(tmp_path), compression="gzip")
+    archive.put("a.html", page("a"))
+    archive.put_payloads("a.html", [{"data": {"id": 1}}])
+    archive.close()
+
+    reopened = PageArchive(str(tmp_path))
+
+    assert reopened.names() == ["a.html"]
+    assert [html for _, html in reopened.iter_pages()] == [page("a")]
+    assert reopened.get_payloads("a.html") == [{"data": {"id": 1}}]
+    assert reopened.get_payloads("b.html") is None
+    assert not os.path.exists(os.path.join(str(tmp_path), "a.graphql.json"))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Tests that slim pages parse exactly like the full pages they were cut from.
+"""
+
+import os
+
+import pytest
+
+from src.investor_parser.core.page_slim import slim_page
+from src.investor_parser.core.parser import InvestorProfileParser, parse_investor_profile
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# A saved profile page, and the same page after its investments were expanded
+PAGES = ["profile_full.html", "profile_expanded.html"]
+
+def read_page(name: str) -> str:
+    """Read a fixture page."""
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+@pytest.mark.parametrize("name", PAGES)
+def test_slim_page_parses_like_full_page(name):
+    html_content = read_page(name)
+    slim_content = slim_page(html_content)
+
+    assert len(slim_content) < len(html_content)
+    assert parse_investor_profile(slim_content, name) == parse_investor_profile(html_content, name)
+
+@pytest.mark.parametrize("name", PAGES)
+def test_slim_page_keeps_html_fallback_data(name):
+    html_content = read_page(name)
+    slim_content = slim_page(html_content)
+
+    full = InvestorProfileParser(html_content, name)._parse_from_html()
+    slim = InvestorProfileParser(slim_content, name)._parse_from_html()
+    assert slim == full
+
+def test_expanded_page_reads_every_investment():
+    profile = parse_investor_profile(slim_page(read_page("profile_expanded.html")), "profile_expanded.html")
+
+    assert profile["investment_count"] == 3
+    assert [investment["company"] for investment in profile["investments"]] == ["Acme Freight", "Parcelo", "Rutas"]
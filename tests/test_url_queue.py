@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Tests for the fetch route bookkeeping of the URL queue.
+"""
+
+import os
+
+from src.investor_parser.core.queue.url_queue import URLQueue
+
+def make_queue(tmp_path) -> URLQueue:
+    """Build a queue with a single URL."""
+    url_queue = URLQueue(state_file=os.path.join(str(tmp_path), "queue_state.json"), browser_after=2)
+    url_queue.add_url("https://signal.nfx.com/investors/jane-doe", "jane-doe")
+    return url_queue
+
+def test_failed_static_fetch_does_not_extend_browser_streak(tmp_path):
+    url_queue = make_queue(tmp_path)
+    for _ in range(3):
+        url_queue.record_route(0, "browser", static_checked=True, static_failed=True)
+
+    assert url_queue.items[0].browser_streak == 0
+    assert url_queue.items[0].route_checked_at is None
+    assert url_queue.preferred_route(0) == "static"
+
+def test_static_page_without_data_extends_browser_streak(tmp_path):
+    url_queue = make_queue(tmp_path)
+    for _ in range(2):
+        url_queue.record_route(0, "browser", static_checked=True)
+
+    assert url_queue.items[0].browser_streak == 2
+    assert url_queue.preferred_route(0) == "browser"
+    assert url_queue.get_statistics()["browser_routed"] == 1
+
+    url_queue.record_route(0, "static", static_checked=True)
+    assert url_queue.items[0].browser_streak == 0
+
+def test_empty_queue_statistics_have_every_key(tmp_path):
+    url_queue = URLQueue(state_file=os.path.join(str(tmp_path), "queue_state.json"))
+    assert url_queue.get_statistics()["browser_routed"] == 0